@@ -24,17 +24,23 @@ DEFAULT_CONFIG = {
     "TEXT_CHUNKING": False,     # Text-Chunking aktivieren (False = ein LLM-Durchgang)
     "TEXT_CHUNK_SIZE": 1000,    # Chunk-Größe in Zeichen
     "TEXT_CHUNK_OVERLAP": 50,   # Überlappung zwischen Chunks in Zeichen
+    "CHUNK_WORKERS": 4,         # Anzahl paralleler Threads für die Chunk-Verarbeitung (1 = sequentiell)
 
     # === ENTITY EXTRACTION SETTINGS ===
     "MODE": "extract",               # Modus: extract oder generate
     "MAX_ENTITIES": 15,              # Maximale Anzahl extrahierter Entitäten
     "ALLOWED_ENTITY_TYPES": "auto",  # Automatische Filterung erlaubter Entitätstypen
     "ENABLE_ENTITY_INFERENCE": False, # Implizite Entitätserkennung aktivieren
+    "GENERATION_CONCURRENCY": 4,      # Parallele LLM-Anfragen bei generate_entities_many (mehrere Themen)
 
     # === RELATIONSHIP EXTRACTION AND INFERENCE ===
     "RELATION_EXTRACTION": True,         # Relationsextraktion aktivieren
     "ENABLE_RELATIONS_INFERENCE": False,  # Implizite Relationen aktivieren
+    "STRICT_TWO_PASS_INFERENCE": False,  # Explizite und implizite Relationen in zwei getrennten Aufrufen statt einem kombinierten abfragen
     "MAX_RELATIONS": 15,                  # Maximale Anzahl Beziehungen pro Prompt
+    "LLM_DEDUP_CONCURRENCY": 8,           # Parallele LLM-Anfragen bei der Beziehungs-Deduplizierung (1 = sequentiell)
+    "LLM_DEDUP_BATCH_SIZE": 10,           # Entitätenpaare pro LLM-Anfrage bei der Deduplizierung (1 = eine Anfrage je Paar)
+    "LLM_DEDUP_SKIP_DISTINCT": False,     # Paare mit klar verschiedenen Prädikaten ohne LLM-Aufruf übernehmen
 
     # === CORE DATA SOURCE SETTINGS ===
     "USE_WIKIPEDIA": True,          # Wikipedia-Verknüpfung aktivieren (immer True)
@@ -42,6 +48,7 @@ DEFAULT_CONFIG = {
     "USE_DBPEDIA": False,           # DBpedia-Verknüpfung aktivieren
     "DBPEDIA_USE_DE": False,        # Deutsche DBpedia nutzen (Standard: False = englische DBpedia)
     "ADDITIONAL_DETAILS": False,    # Zusätzliche Details aus allen Wissensquellen abrufen (mehr Infos aber langsamer)
+    "LINKING_CONCURRENCY": 4,       # Parallel verknüpfte Entitäten (Threads, 1 = sequentiell)
 
     # === DBpedia Lookup API Fallback ===
     "DBPEDIA_LOOKUP_API": True,       # Fallback via DBpedia Lookup API aktivieren
@@ -61,17 +68,21 @@ DEFAULT_CONFIG = {
     # === KNOWLEDGE GRAPH COMPLETION (KGC) ===
     "ENABLE_KGC": False,   # Knowledge-Graph-Completion aktivieren (Vervollständigung mit impliziten Relationen)
     "KGC_ROUNDS": 3,       # Anzahl der KGC-Runden
+    "KGC_MIN_NEW": 1,      # KGC vorzeitig beenden, wenn eine Runde weniger neue Tripel liefert
 
     # === STATISCHER GRAPH mit NetworkX-Layouts (PNG) ===
-    "GRAPH_LAYOUT_METHOD": "spring",          # Layout: "kamada_kawai" (ohne K-/Iter-Param) oder "spring" (Fruchterman-Reingold)
+    "GRAPH_LAYOUT_METHOD": "spring",          # Layout: "kamada_kawai" (ohne K-/Iter-Param), "spring" (Fruchterman-Reingold) oder "forceatlas2" (NetworkX >= 3.4)
     "GRAPH_LAYOUT_K": None,                   # (Spring-Layout) Ideale Kantenlänge (None=Standard)
     "GRAPH_LAYOUT_ITERATIONS": 50,            # (Spring-Layout) Anzahl der Iterationen
     "GRAPH_PHYSICS_PREVENT_OVERLAP": True,    # (Spring-Layout) Überlappungsprävention aktivieren
     "GRAPH_PHYSICS_PREVENT_OVERLAP_DISTANCE": 0.1,  # (Spring-Layout) Mindestabstand zwischen Knoten
     "GRAPH_PHYSICS_PREVENT_OVERLAP_ITERATIONS": 50, # (Spring-Layout) Iterationen zur Überlappungsprävention
     "GRAPH_PNG_SCALE": 0.30,                  # Skalierungsfaktor für statisches PNG-Layout (Standard 0.33)
+    "GRAPH_PNG_ENABLED": True,                # Statisches PNG erzeugen (False = nur HTML)
+    "GRAPH_PNG_DPI": 180,                     # Auflösung des PNG (z.B. 96 für deutlich schnelleres Rendern)
 
     # === INTERAKTIVER GRAPH mit PyVis (HTML) ===
+    "GRAPH_HTML_ENABLED": True,               # Interaktive HTML-Ansicht erzeugen (False = nur PNG)
     "GRAPH_HTML_INITIAL_SCALE": 10,           # Anfangs-Zoom (network.moveTo scale): >1 rauszoomen, <1 reinzoomen
 
     # === TRAINING DATA COLLECTION SETTINGS ===
@@ -94,6 +105,14 @@ DEFAULT_CONFIG = {
     "CACHE_DBPEDIA_ENABLED": True,              # Caching für DBpedia-SPARQL-Abfragen aktivieren
     "CACHE_WIKIDATA_ENABLED": True,             # (Optional) Caching für Wikidata-API aktivieren
     "CACHE_WIKIPEDIA_ENABLED": True,            # (Optional) Caching für Wikipedia-API-Anfragen aktivieren
+    "CACHE_LLM_DEDUP_ENABLED": False,           # Caching der LLM-Deduplizierung von Beziehungen aktivieren
+    "CACHE_GENERATION_ENABLED": False,          # Caching generierter Entitäten (Modus generate) je Thema/Prompt aktivieren
+    "CACHE_LINKING_ENABLED": False,             # Caching vollständiger Linking-Ergebnisse je Entität (Name, URL, Einstellungen) aktivieren
+    "CACHE_LLM_RESPONSES_ENABLED": False,       # Caching identischer LLM-Anfragen der Beziehungsinferenz (Modell, Nachrichten, Temperatur) aktivieren
+    "SEMANTIC_CACHE_ENABLED": False,            # Beziehungen nahezu gleicher Texte mit denselben Entitäten aus dem semantischen Cache übernehmen
+    "SEMANTIC_CACHE_THRESHOLD": 0.95,           # Mindest-Kosinus-Ähnlichkeit der Text-Embeddings für einen Treffer im semantischen Cache
+    "SEMANTIC_CACHE_MAX_ENTRIES": 1000,         # Maximale Anzahl Einträge im semantischen Cache (LRU-Verdrängung)
+    "EMBEDDING_MODEL": "text-embedding-3-small", # OpenAI-Embedding-Modell für den semantischen Cache
 
     # === LOGGING AND DEBUG SETTINGS ===
     "SHOW_STATUS": True,            # Statusmeldungen anzeigen
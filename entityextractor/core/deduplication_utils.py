@@ -1,18 +1,227 @@
 # Utility: LLM-basierte Deduplizierung von Beziehungen
 import json
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from openai import OpenAI
+try:
+    import orjson  # optional: schnellere JSON-Serialisierung
+except ImportError:
+    orjson = None
+
 from entityextractor.config.settings import get_config
 from entityextractor.utils.logging_utils import configure_logging
-from entityextractor.services.openai_service import save_relationship_training_data
-from entityextractor.prompts.deduplication_prompts import get_system_prompt_dedup_en, get_user_prompt_dedup_en, get_system_prompt_dedup_de, get_user_prompt_dedup_de
+from entityextractor.services.openai_service import save_relationship_training_data, get_openai_client
+from entityextractor.utils.cache_utils import get_cache_path, load_cache, save_cache
+from entityextractor.prompts.deduplication_prompts import (
+    get_system_prompt_dedup_en,
+    get_user_prompt_dedup_en,
+    get_user_prompt_dedup_batch_en,
+    get_system_prompt_dedup_de,
+    get_user_prompt_dedup_de,
+    get_user_prompt_dedup_batch_de,
+)
 from .relationship_inference import extract_json_relationships
+from .semantic_dedup_utils import _predicates_similar
+
+# Prozessweiter, begrenzter Cache für LLM-Dedup-Antworten pro Entitätenpaar und Prädikatmenge.
+# Der Dedup-Lauf nach der KGC sieht größtenteils dieselben Gruppen wie der erste Lauf.
+# Mit CACHE_LLM_DEDUP_ENABLED (opt-in) werden geprüfte Antworten zusätzlich unter CACHE_DIR/llm_dedup abgelegt.
+_DEDUP_CACHE = {}
+_DEDUP_CACHE_MAX = 4096
+
+
+def _merge_cleaned(cleaned, rels, subj, obj, deduped_result):
+    """
+    Ordnet die vom LLM behaltenen Prädikate den ursprünglichen Beziehungen zu
+    und hängt sie an deduped_result an.
+    """
+    # Index (Prädikat, inferred) -> erste passende Beziehung statt linearer Suche je Eintrag
+    by_key = {}
+    for r in rels:
+        by_key.setdefault((r["predicate"], r.get("inferred", "explicit")), r)
+    for c in cleaned:
+        match = by_key.get((c["predicate"], c.get("inferred", "explicit")))
+        if match:
+            deduped_result.append(match)
+        else:
+            deduped_result.append({"subject": subj, "object": obj, **c})
+
+def _dumps(obj):
+    """Kompaktes JSON für die Prompts; nutzt orjson, falls installiert (identische Ausgabe)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def _pair_key(rel):
+    """Richtungsunabhängiger Schlüssel eines Entitätenpaares als sortiertes Tupel."""
+    subj, obj = str(rel.get("subject") or ""), str(rel.get("object") or "")
+    return (subj, obj) if subj <= obj else (obj, subj)
+
+def _prompt_rels(rels):
+    return [{"predicate": r["predicate"], "inferred": r.get("inferred", "explicit")} for r in rels]
+
+def _cache_key(model, language, pair, prompt_rels):
+    return (model, language, pair, tuple(sorted((r["predicate"], r["inferred"]) for r in prompt_rels)))
+
+def _valid_cleaned(cleaned):
+    """
+    Prüft eine LLM-Dedup-Antwort: nicht-leere Liste von Dicts mit String-Prädikat.
+    Nur solche Antworten werden übernommen und zwischengespeichert.
+    """
+    return (isinstance(cleaned, list) and bool(cleaned)
+            and all(isinstance(c, dict) and isinstance(c.get("predicate"), str) for c in cleaned))
+
+def _recall(cache_key, cache_dir):
+    """
+    Liefert eine gespeicherte LLM-Dedup-Antwort: zuerst aus dem Prozess-Cache,
+    dann (falls cache_dir gesetzt) aus dem Datei-Cache. None, wenn nicht vorhanden
+    oder ungültig (dann wird das LLM erneut gefragt).
+    """
+    cleaned = _DEDUP_CACHE.get(cache_key)
+    if cleaned is None and cache_dir:
+        cleaned = load_cache(get_cache_path(cache_dir, "llm_dedup", json.dumps(cache_key, ensure_ascii=False)))
+        if _valid_cleaned(cleaned):
+            _remember_in_process(cache_key, cleaned)
+    return cleaned if _valid_cleaned(cleaned) else None
+
+def _remember_in_process(cache_key, cleaned):
+    """Legt eine Antwort im Prozess-Cache ab; bei Erreichen von _DEDUP_CACHE_MAX wird er vorher geleert."""
+    if len(_DEDUP_CACHE) >= _DEDUP_CACHE_MAX:
+        _DEDUP_CACHE.clear()
+    _DEDUP_CACHE[cache_key] = cleaned
+
+def _remember(cache_key, cleaned, cache_dir):
+    """Speichert eine LLM-Dedup-Antwort im Prozess-Cache und optional im Datei-Cache."""
+    _remember_in_process(cache_key, cleaned)
+    if cache_dir:
+        save_cache(get_cache_path(cache_dir, "llm_dedup", json.dumps(cache_key, ensure_ascii=False)), cleaned)
+
+def _predicates_distinct(rels, similarity_threshold):
+    """
+    Prüft lokal, ob alle Prädikate einer Gruppe klar verschieden sind:
+    keine Dubletten nach Normalisierung und kein Paar oberhalb der Fuzzy-Schwelle.
+    """
+    keys = [(r["predicate"].strip().casefold(), r.get("inferred", "explicit")) for r in rels]
+    if len(set(keys)) != len(keys):
+        return False
+    preds = [k[0] for k in keys]
+    for i, p1 in enumerate(preds):
+        for p2 in preds[i + 1:]:
+            if _predicates_similar(p1, p2, similarity_threshold):
+                return False
+    return True
+
+def _log_dedup(subj, obj, rels, cleaned):
+    # Kurzdarstellung: Eingabe-Prädikate vs. verbleibende Prädikate
+    # Prädikatlisten nur aufbauen, wenn INFO tatsächlich ausgegeben wird
+    if not logging.getLogger().isEnabledFor(logging.INFO):
+        return
+    logging.info(
+        "LLM-Dedup: (%s -> %s) | %d → %d Beziehungen. Eingabe: %s; Behalten: %s",
+        subj, obj, len(rels), len(cleaned),
+        [r["predicate"] for r in rels], [c["predicate"] for c in cleaned]
+    )
+
+def _dedup_group(pair, rels, client, model, language, cache_dir=None):
+    """
+    Dedupliziert die Beziehungen eines Entitätenpaares per LLM und gibt die
+    verbleibenden Beziehungen zurück. Bei Fehlern bleiben alle Beziehungen erhalten.
+    """
+    subj, obj = pair
+    deduped_result = []
+    # Alle Prädikate für dieses Paar in den Prompt
+    prompt_rels = _prompt_rels(rels)
+    cache_key = _cache_key(model, language, pair, prompt_rels)
+    cached = _recall(cache_key, cache_dir)
+    if cached is not None:
+        _merge_cleaned(cached, rels, subj, obj, deduped_result)
+        logging.info("LLM-Dedup (Cache): (%s -> %s) | %d → %d Beziehungen", subj, obj, len(rels), len(cached))
+        return deduped_result
+    prompt_rels_json = _dumps(prompt_rels)
+    # Zentrale Prompt-Definition verwenden
+    if language == "en":
+        system_prompt = get_system_prompt_dedup_en()
+        user_prompt = get_user_prompt_dedup_en(subj, obj, prompt_rels_json)
+    else:
+        system_prompt = get_system_prompt_dedup_de()
+        user_prompt = get_user_prompt_dedup_de(subj, obj, prompt_rels_json)
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.0,
+            max_tokens=300
+        )
+        raw_json = response.choices[0].message.content.strip()
+        # extract_json_relationships schneidet das JSON-Array ohne Regex aus und parst es (orjson, falls installiert)
+        cleaned = extract_json_relationships(raw_json)
+        if not _valid_cleaned(cleaned):
+            raise ValueError(f"unerwartetes Antwortformat: {raw_json[:200]}")
+        _merge_cleaned(cleaned, rels, subj, obj, deduped_result)
+        # Erst nach erfolgreicher Zuordnung zwischenspeichern
+        _remember(cache_key, cleaned, cache_dir)
+        _log_dedup(subj, obj, rels, cleaned)
+    except Exception as e:
+        logging.error("Fehler bei LLM-Deduplizierung für Paar (%s, %s): %s", subj, obj, e)
+        return list(rels)
+    return deduped_result
+
+def _dedup_batch(batch, client, model, language, cache_dir=None):
+    """
+    Dedupliziert mehrere Entitätenpaare mit einer einzigen LLM-Anfrage.
+    Das LLM liefert ein JSON-Objekt id -> bereinigte Beziehungen. Ist die Antwort
+    unvollständig oder nicht parsebar, wird jedes Paar einzeln über _dedup_group bearbeitet.
+    Gibt ein Dict pair -> verbleibende Beziehungen zurück.
+    """
+    if len(batch) == 1:
+        pair, rels = batch[0]
+        return {pair: _dedup_group(pair, rels, client, model, language, cache_dir)}
+    payload = []
+    for idx, (pair, rels) in enumerate(batch):
+        subj, obj = pair
+        payload.append({"id": str(idx), "subject": subj, "object": obj, "relationships": _prompt_rels(rels)})
+    groups_json = _dumps(payload)
+    if language == "en":
+        system_prompt = get_system_prompt_dedup_en()
+        user_prompt = get_user_prompt_dedup_batch_en(groups_json)
+    else:
+        system_prompt = get_system_prompt_dedup_de()
+        user_prompt = get_user_prompt_dedup_batch_de(groups_json)
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.0,
+            max_tokens=300 * len(batch),
+            response_format={"type": "json_object"}
+        )
+        answer = json.loads(response.choices[0].message.content)
+        cleaned_by_id = [answer[item["id"]] for item in payload]
+        if not all(_valid_cleaned(cleaned) for cleaned in cleaned_by_id):
+            raise ValueError("unerwartetes Antwortformat")
+    except Exception as e:
+        logging.warning("LLM-Dedup-Batch (%d Paare) fehlgeschlagen, Einzelanfragen: %s", len(batch), e)
+        return {pair: _dedup_group(pair, rels, client, model, language, cache_dir) for pair, rels in batch}
+    results = {}
+    for (pair, rels), item, cleaned in zip(batch, payload, cleaned_by_id):
+        subj, obj = item["subject"], item["object"]
+        deduped = []
+        _merge_cleaned(cleaned, rels, subj, obj, deduped)
+        _remember(_cache_key(model, language, pair, item["relationships"]), cleaned, cache_dir)
+        _log_dedup(subj, obj, rels, cleaned)
+        results[pair] = deduped
+    return results
 
 def deduplicate_relationships_llm(relationships, entities, user_config=None):
     """
     Bereinigt eine Liste von Beziehungen (Tripeln) per LLM, sodass pro (Entitätenpaar) nur wirklich unterschiedliche Prädikate übrigbleiben.
     Das LLM bekommt ALLE Triple mit identischem Entitätenpaar als Prompt und gibt eine bereinigte Liste zurück, in der semantisch gleiche/ähnliche Prädikate gruppiert und nur die beste Formulierung behalten wird.
+    Bis zu LLM_DEDUP_BATCH_SIZE Paare teilen sich eine Anfrage; die Anfragen laufen parallel (LLM_DEDUP_CONCURRENCY).
     """
     config = get_config(user_config)
     configure_logging(config)
@@ -25,63 +234,49 @@ def deduplicate_relationships_llm(relationships, entities, user_config=None):
         if not api_key:
             logging.error("Kein OpenAI API-Schlüssel angegeben")
             return relationships
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
     model = config.get("MODEL", "gpt-4.1-mini")
     language = config.get("LANGUAGE", "de")
+    # === LLM-Dedup caching (zusätzlich zum Prozess-Cache) ===
+    cache_dir = None
+    if config.get("CACHE_ENABLED") and config.get("CACHE_LLM_DEDUP_ENABLED"):
+        cache_dir = config.get("CACHE_DIR", "cache")
     # Gruppieren nach Entity-Paar unabhängig von Richtung (beide Richtungen im gleichen Prompt)
-    grouped = defaultdict(list)
+    # Ein Durchlauf; Gruppen und Beziehungen bleiben in Reihenfolge ihres ersten Auftretens
+    grouped = {}
     for rel in relationships:
-        key = frozenset([rel["subject"], rel["object"]])
-        grouped[key].append(rel)
-    deduped_result = []
-    for pair, rels in grouped.items():
-        # Handle self-relations: frozenset may have a single element
-        items = list(pair)
-        if len(items) == 1:
-            subj = obj = items[0]
-        else:
-            subj, obj = items
+        grouped.setdefault(_pair_key(rel), []).append(rel)
+    groups = list(grouped.items())
+    # Nur Paare mit mehreren Beziehungen benötigen das LLM; bereits bekannte Paare direkt aus dem Cache
+    results = {}
+    pending = []
+    skip_distinct = config.get("LLM_DEDUP_SKIP_DISTINCT", False)
+    for pair, rels in groups:
         if len(rels) == 1:
-            deduped_result.append(rels[0])
             continue
-        # Alle Prädikate für dieses Paar in den Prompt
-        prompt_rels = [
-            {"predicate": r["predicate"], "inferred": r.get("inferred", "explicit")} for r in rels
-        ]
-        prompt_rels_json = json.dumps(prompt_rels, ensure_ascii=False)
-        # Zentrale Prompt-Definition verwenden
-        if language == "en":
-            system_prompt = get_system_prompt_dedup_en()
-            user_prompt = get_user_prompt_dedup_en(subj, obj, prompt_rels_json)
+        if skip_distinct and _predicates_distinct(rels, 0.85):
+            results[pair] = rels
+            continue
+        if _recall(_cache_key(model, language, pair, _prompt_rels(rels)), cache_dir) is not None:
+            results[pair] = _dedup_group(pair, rels, client, model, language, cache_dir)
         else:
-            system_prompt = get_system_prompt_dedup_de()
-            user_prompt = get_user_prompt_dedup_de(subj, obj, prompt_rels_json)
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.0,
-                max_tokens=300
-            )
-            raw_json = response.choices[0].message.content.strip()
-            cleaned = extract_json_relationships(raw_json)
-            for c in cleaned:
-                match = next((r for r in rels if r["predicate"] == c["predicate"] and r.get("inferred", "explicit") == c.get("inferred", "explicit")), None)
-                if match:
-                    deduped_result.append(match)
-                else:
-                    deduped_result.append({"subject": subj, "object": obj, **c})
-            # Kurzdarstellung: Eingabe-Prädikate vs. verbleibende Prädikate
-            logging.info(
-                f"LLM-Dedup: ({subj} -> {obj}) | {len(rels)} → {len(cleaned)} Beziehungen. "
-                f"Eingabe: {[r['predicate'] for r in rels]}; "
-                f"Behalten: {[c['predicate'] for c in cleaned]}"
-            )
-        except Exception as e:
-            logging.error(f"Fehler bei LLM-Deduplizierung für Paar ({subj}, {obj}): {e}")
-            deduped_result.extend(rels)
-    logging.info(f"LLM-Deduplizierung abgeschlossen: Vorher: {len(relationships)}, Nachher: {len(deduped_result)}")
+            pending.append((pair, rels))
+    if pending:
+        batch_size = max(1, config.get("LLM_DEDUP_BATCH_SIZE", 10))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        max_workers = max(1, min(config.get("LLM_DEDUP_CONCURRENCY", 8), len(batches)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_result in executor.map(lambda batch: _dedup_batch(batch, client, model, language, cache_dir), batches):
+                results.update(batch_result)
+    # Ergebnisse in Reihenfolge des ersten Auftretens zusammenführen; das Ergebnis ist höchstens so lang wie die
+    # Eingabe, daher einmal vorab allokieren und per Slice-Zuweisung füllen
+    deduped_result = [None] * len(relationships)
+    n = 0
+    for pair, rels in groups:
+        kept = rels if len(rels) == 1 else results[pair]
+        # Liefert das LLM ausnahmsweise mehr Einträge, wächst die Liste hier automatisch
+        deduped_result[n:n + len(kept)] = kept
+        n += len(kept)
+    del deduped_result[n:]
+    logging.info("LLM-Deduplizierung abgeschlossen: Vorher: %d, Nachher: %d", len(relationships), len(deduped_result))
     return deduped_result
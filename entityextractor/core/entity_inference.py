@@ -6,9 +6,9 @@ Dieses Modul ergänzt implizite Entitäten durch einen zweiten Prompt, wenn ENAB
 import json
 import logging
 import time
-from openai import OpenAI
 from entityextractor.config.settings import get_config, DEFAULT_CONFIG
 from entityextractor.utils.logging_utils import configure_logging
+from entityextractor.services.openai_service import get_openai_client
 from entityextractor.prompts.entity_inference_prompts import (
     get_system_prompt_entity_inference_en,
     get_user_prompt_entity_inference_en,
@@ -103,7 +103,8 @@ def infer_entities(text, entities, user_config=None):
         system_prompt = f"{system_prompt.strip()}\n\n{edu_block}"
     # API-Aufruf
     logging.info(f"Rufe OpenAI API für implizite Entitäten auf (Modell {config.get('MODEL', DEFAULT_CONFIG['MODEL'])})...")
-    client = OpenAI(api_key=config.get("OPENAI_API_KEY"))
+    # Gemeinsamer Client (Verbindungspool wird über Aufrufe hinweg wiederverwendet)
+    client = get_openai_client(config.get("OPENAI_API_KEY"))
     response = client.chat.completions.create(
         model=config.get("MODEL", DEFAULT_CONFIG["MODEL"]),
         messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_msg}],
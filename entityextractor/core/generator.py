@@ -7,12 +7,17 @@ This module provides functions for generating entities related to a specific top
 import logging
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from openai import OpenAI
 from entityextractor.config.settings import get_config, DEFAULT_CONFIG
 from entityextractor.utils.logging_utils import configure_logging
-from entityextractor.utils.text_utils import clean_json_from_markdown
-from entityextractor.services.openai_service import save_training_data as save_extraction_training_data
+from entityextractor.utils.cache_utils import get_cache_path, load_cache, save_cache
+from entityextractor.services.openai_service import (
+    save_training_data as save_extraction_training_data,
+    get_openai_client,
+    append_training_example,
+)
 from entityextractor.core.entity_inference import infer_entities
 from entityextractor.prompts.generation_prompts import (
     get_system_prompt_generate_en,
@@ -23,6 +28,15 @@ from entityextractor.prompts.generation_prompts import (
 from entityextractor.prompts.compendium_prompts import get_educational_block_de, get_educational_block_en
 from entityextractor.utils.prompt_utils import apply_type_restrictions
 
+# Prompt-Bausteine je Sprache: (System-Prompt, User-Prompt, Bildungsblock); andere Sprachen -> Englisch
+_GENERATION_PROMPTS = {
+    "de": (get_system_prompt_generate_de, get_user_prompt_generate_de, get_educational_block_de),
+    "en": (get_system_prompt_generate_en, get_user_prompt_generate_en, get_educational_block_en),
+}
+
+def _generation_prompts(language):
+    return _GENERATION_PROMPTS.get(language, _GENERATION_PROMPTS["en"])
+
 def save_training_data(topic, entities, config=None):
     """
     Save training data for future fine-tuning in generation mode.
@@ -43,12 +57,9 @@ def save_training_data(topic, entities, config=None):
         language = config.get("LANGUAGE", "de")
         max_entities = config.get("MAX_ENTITIES", 10)
         # Use generation prompts for training data
-        if language == "en":
-            system_prompt = get_system_prompt_generate_en(max_entities, topic)
-            user_prompt = get_user_prompt_generate_en(max_entities, topic)
-        else:
-            system_prompt = get_system_prompt_generate_de(max_entities, topic)
-            user_prompt = get_user_prompt_generate_de(max_entities, topic)
+        get_system_prompt, get_user_prompt, _ = _generation_prompts(language)
+        system_prompt = get_system_prompt(max_entities, topic)
+        user_prompt = get_user_prompt(max_entities, topic)
         
         # Build semicolon-separated assistant content for training
         assistant_content = "\n".join(
@@ -62,19 +73,57 @@ def save_training_data(topic, entities, config=None):
             ]
         }
         
-        # Ensure each entity has an 'inferred' field
-        for ent in entities:
-            if "inferred" not in ent:
-                ent["inferred"] = "implicit"
-        
-        # Append to the JSONL file
-        with open(training_data_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(example, ensure_ascii=False) + "\n")
+        # Append to the JSONL file (shared buffered handle)
+        append_training_example(training_data_path, example)
             
         logging.info(f"Saved generation training example to {training_data_path}")
     except Exception as e:
         logging.error(f"Error saving generation training data: {e}")
 
+def _parse_entity_line(line):
+    """
+    Parse one semicolon-separated entity line (name; type; wikipedia_url; citation)
+    directly into the final entity dict (including the empty 'sources' field).
+    Returns None for lines with fewer than four fields.
+    """
+    parts = [p.strip() for p in line.split(';')]
+    if len(parts) < 4:
+        return None
+    name, typ, url, citation = parts[:4]
+    return {
+        'name': name,
+        'type': typ,
+        'wikipedia_url': url,
+        'citation': citation,
+        'inferred': 'implicit',
+        'sources': {}
+    }
+
+@lru_cache(maxsize=32)
+def _generation_system_prompt(language, allowed_entity_types, educational):
+    """
+    Build the (static) generation system prompt for the given settings once:
+    base prompt, type restriction and optional educational block.
+    """
+    get_system_prompt, _, get_educational_block = _generation_prompts(language)
+    system_prompt = get_system_prompt()
+    # Apply unified entity type restriction
+    system_prompt = apply_type_restrictions(system_prompt, allowed_entity_types, language)
+    # Bildungsmodus: Konsumiere zentrale Prompt-Blöcke
+    if educational:
+        system_prompt = f"{system_prompt.strip()}\n\n{get_educational_block()}"
+    return system_prompt
+
+def _finalize_entities(topic, entities, config):
+    """
+    Apply optional entity inference; entities added there get the empty 'sources' field.
+    """
+    if config.get('ENABLE_ENTITY_INFERENCE', False):
+        entities = infer_entities(topic, entities, config)
+        for pe in entities:
+            pe.setdefault('sources', {})
+    return entities
+
 def generate_entities(topic, user_config=None):
     """
     Generate entities related to a specific topic.
@@ -105,49 +154,78 @@ def generate_entities(topic, user_config=None):
             logging.error("No OpenAI API key provided")
             return []
     
-    # Create OpenAI client
-    client = OpenAI(api_key=api_key)
+    # Shared OpenAI client (reuses the HTTP connection pool across calls)
+    client = get_openai_client(api_key)
     
     # Get model and max entities
     model = config.get("MODEL", "gpt-4.1-mini")
     max_entities = config.get("MAX_ENTITIES", 10)
     language = config.get("LANGUAGE", "de")
     
-    # Get allowed entity types if specified
-    allowed_entity_types = config.get("ALLOWED_ENTITY_TYPES", "auto")
-    
-    # Only generate mode supported; choose prompts based on language
-    if language == "de":
-        system_prompt = get_system_prompt_generate_de(max_entities, topic)
-        user_msg = get_user_prompt_generate_de(max_entities, topic)
-    else:
-        system_prompt = get_system_prompt_generate_en(max_entities, topic)
-        user_msg = get_user_prompt_generate_en(max_entities, topic)
-
-    # Apply unified entity type restriction
-    system_prompt = apply_type_restrictions(system_prompt, allowed_entity_types, language)
-
-    # Bildungsmodus: Konsumiere zentrale Prompt-Blöcke
-    if config.get("COMPENDIUM_EDUCATIONAL_MODE", False):
-        edu_block = get_educational_block_de() if language == "de" else get_educational_block_en()
-        system_prompt = f"{system_prompt.strip()}\n\n{edu_block}"
+    # Only generate mode supported; the system prompt only depends on language,
+    # allowed entity types and educational mode, the user message carries topic and count
+    system_prompt = _generation_system_prompt(
+        language,
+        config.get("ALLOWED_ENTITY_TYPES", "auto"),
+        bool(config.get("COMPENDIUM_EDUCATIONAL_MODE", False)),
+    )
+    _, get_user_prompt, _ = _generation_prompts(language)
+    user_msg = get_user_prompt(max_entities, topic)
 
     try:
+        # === Generation caching ===
+        # Key covers model and the final prompts (topic, language, count, type restriction, educational mode)
+        cache_path = None
+        if config.get("CACHE_ENABLED") and config.get("CACHE_GENERATION_ENABLED"):
+            cache_key = json.dumps({"model": model, "system": system_prompt, "user": user_msg}, ensure_ascii=False, sort_keys=True)
+            cache_path = get_cache_path(config.get("CACHE_DIR", "cache"), "generation", cache_key)
+            cached = load_cache(cache_path)
+            if cached is not None:
+                logging.info(f"Loaded {len(cached)} generated entities from cache for topic: {topic}")
+                return _finalize_entities(topic, cached, config)
+
         # Log the model being used
         logging.info(f"Generating entities with OpenAI model {model}...")
         logging.debug(f"[GENERATION] SYSTEM PROMPT:\n{system_prompt}")
         logging.debug(f"[GENERATION] USER MSG:\n{user_msg}")
         generation_start_time = time.time()
         
-        # Make the API call
-        response = client.chat.completions.create(
+        # Make the API call (streamed: complete lines are parsed while the rest is still generated)
+        stream = client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_msg}
             ],
-            temperature=0.7  # Higher temperature for more creative generation
+            temperature=0.7,  # Higher temperature for more creative generation
+            stream=True
         )
+        processed_entities = []
+        received = False
+        buffer = ""
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                received = True
+                buffer += delta
+                *lines, buffer = buffer.split("\n")
+                for ln in lines:
+                    entity = _parse_entity_line(ln)
+                    if entity:
+                        processed_entities.append(entity)
+                # Requested number reached: stop the stream early and save output tokens
+                if len(processed_entities) >= max_entities:
+                    break
+            else:
+                entity = _parse_entity_line(buffer)
+                if entity:
+                    processed_entities.append(entity)
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
         
         # Log the HTTP response
         generation_time = time.time() - generation_start_time
@@ -155,37 +233,40 @@ def generate_entities(topic, user_config=None):
         logging.info(f"Generation API call completed in {generation_time:.2f} seconds")
         
         # Process the response
-        if not response.choices or not response.choices[0].message.content:
+        if not received:
             logging.error("Empty response from OpenAI API")
             return []
-        
-        # Parse semicolon-separated entity lines
-        raw_output = response.choices[0].message.content.strip()
-        lines = raw_output.splitlines()
-        processed_entities = []
-        for ln in lines:
-            parts = [p.strip() for p in ln.split(';')]
-            if len(parts) >= 4:
-                name, typ, url, citation = parts[:4]
-                processed_entities.append({
-                    'name': name,
-                    'type': typ,
-                    'wikipedia_url': url,
-                    'citation': citation,
-                    'inferred': 'implicit'
-                })
         elapsed_time = time.time() - generation_start_time
         logging.info(f"Generated {len(processed_entities)} entities in {elapsed_time:.2f} seconds")
+        if cache_path:
+            save_cache(cache_path, processed_entities)
         # Save training data if enabled
         if config.get('COLLECT_TRAINING_DATA', False):
             save_training_data(topic, processed_entities, config)
-        # Optional entity inference
-        if config.get('ENABLE_ENTITY_INFERENCE', False):
-            processed_entities = infer_entities(topic, processed_entities, config)
-        # Add 'sources' field
-        for pe in processed_entities:
-            pe['sources'] = {}
-        return processed_entities
+        # Optional entity inference and 'sources' field
+        return _finalize_entities(topic, processed_entities, config)
     except Exception as e:
         logging.error(f"Error generating entities: {e}")
         return []
+
+def generate_entities_many(topics, user_config=None):
+    """
+    Generate entities for several topics concurrently.
+
+    Each topic is one independent, network-bound LLM request, so the calls are
+    spread over a thread pool of GENERATION_CONCURRENCY workers sharing one client.
+
+    Args:
+        topics: List of topics to generate entities for
+        user_config: Optional user configuration to override defaults
+
+    Returns:
+        A list with one list of generated entities per topic (same order as topics)
+    """
+    topics = list(topics)
+    if not topics:
+        return []
+    config = get_config(user_config)
+    max_workers = max(1, min(config.get("GENERATION_CONCURRENCY", 4), len(topics)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda topic: generate_entities(topic, config), topics))
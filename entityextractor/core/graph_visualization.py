@@ -1,12 +1,133 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
-from matplotlib.patches import Patch
-from matplotlib import cm, colors as mcolors
-from pyvis.network import Network
+import numpy as np
 import logging
 import math
-import re
+from functools import lru_cache
+
+# Schwere Abhängigkeiten (networkx, matplotlib, pyvis, numba) werden erst in den
+# Funktionen importiert, damit der Import dieses Moduls ohne Visualisierung billig bleibt
+numba = None
+
+# Linienstil je inferred-Wert (alles außer explicit -> gestrichelt)
+_EDGE_STYLES = {"explicit": "solid"}
+
+# HTML-Legende (statische Teile); nur die Typ-Einträge werden pro Aufruf erzeugt
+_LEGEND_HEAD = (
+    '<div style="padding:8px; background:#f9f9f9; border:1px solid #ddd; margin:0 auto 8px auto; border-radius:5px; font-size:12px; max-width:800px; text-align:center;">'
+    '<h4 style="margin-top:0; margin-bottom:5px;">Knowledge Graph</h4>'
+    '<div style="margin:5px 0"><b>Entity Types:</b> '
+)
+_LEGEND_TYPE_SPAN = '<span style="background:{color};border:1px solid #444;padding:1px 4px;margin-right:4px;display:inline-block;font-size:11px;">{label}</span>'
+_LEGEND_TAIL = (
+    '</div>'
+    '<div style="margin:5px 0"><b>Relationships:</b> '
+    '<span style="border-bottom:1px solid #333;padding:1px 4px;margin-right:5px;display:inline-block;font-size:11px;">Explicit</span>'
+    '<span style="border-bottom:1px dashed #555;padding:1px 4px;display:inline-block;font-size:11px;">Implicit</span>'
+    '</div></div>'
+)
+
+# Layout-Cache: (Methode, Parameter, Knoten, Kanten) -> Positionen; wiederholte
+# Visualisierungen desselben Graphen überspringen die teure Layout-Berechnung
+_LAYOUT_CACHE = {}
+_LAYOUT_CACHE_MAX = 32
+
+# Ab dieser Knotenzahl wird (falls installiert) die Numba-Version der Überlappungsprävention genutzt
+_NUMBA_MIN_NODES = 200
+
+
+def _compute_layout(G, layout_method, layout_k, layout_iters):
+    """Compute (or reuse) node positions for G with the configured layout method."""
+    import networkx as nx
+    key = (layout_method, layout_k, layout_iters, tuple(G.nodes()), tuple(G.edges()))
+    pos = _LAYOUT_CACHE.get(key)
+    if pos is not None:
+        return dict(pos)
+    if layout_method == "spring":
+        pos = nx.spring_layout(G, k=layout_k, iterations=layout_iters)
+    elif layout_method == "forceatlas2" and hasattr(nx, "forceatlas2_layout"):
+        # ForceAtlas2 (NetworkX >= 3.4), skaliert besser für größere Graphen
+        pos = nx.forceatlas2_layout(G, max_iter=layout_iters)
+    else:
+        pos = nx.kamada_kawai_layout(G)
+    if len(_LAYOUT_CACHE) >= _LAYOUT_CACHE_MAX:
+        _LAYOUT_CACHE.clear()
+    _LAYOUT_CACHE[key] = dict(pos)
+    return pos
+
+def _resolve_overlaps(coords, min_dist, max_iter):
+    """Push apart nodes closer than min_dist (NumPy version, modifies coords in place)."""
+    n_nodes = coords.shape[0]
+    # Working set: only nodes moved in the previous round can form new overlaps,
+    # so later rounds check just those rows instead of the full N x N matrix
+    moved = np.arange(n_nodes)
+    for _ in range(max_iter):
+        diff = coords[moved][:, None, :] - coords[None, :, :]
+        rows, j_idx = np.nonzero(np.hypot(diff[..., 0], diff[..., 1]) < min_dist)
+        i_idx = moved[rows]
+        not_self = i_idx != j_idx
+        i_idx, j_idx = i_idx[not_self], j_idx[not_self]
+        if i_idx.size == 0:
+            break
+        # Each overlapping pair once, as (i, j) with i < j
+        pair_ids = np.unique(np.minimum(i_idx, j_idx) * n_nodes + np.maximum(i_idx, j_idx))
+        i_idx, j_idx = np.divmod(pair_ids, n_nodes)
+        delta = coords[i_idx] - coords[j_idx]
+        d = np.hypot(delta[:, 0], delta[:, 1])
+        # Coincident nodes: push apart along a fixed diagonal
+        coincident = d == 0
+        delta[coincident] = 0.01
+        d[coincident] = math.hypot(0.01, 0.01)
+        # Move both nodes half the missing distance apart along their connecting line
+        shift = delta * ((min_dist - d) / 2 / d)[:, None]
+        np.add.at(coords, i_idx, shift)
+        np.add.at(coords, j_idx, -shift)
+        moved = np.unique(np.concatenate((i_idx, j_idx)))
+    return coords
+
+
+def _resolve_overlaps_kernel(coords, min_dist, max_iter):
+    """Same as _resolve_overlaps as a plain loop; compiled with Numba by _numba_overlap_resolver."""
+    n_nodes = coords.shape[0]
+    shifts = np.zeros_like(coords)
+    for _ in range(max_iter):
+        n_moved = 0
+        # Each node sums its own shifts over all overlapping partners (no write conflicts)
+        for i in numba.prange(n_nodes):
+            sx = 0.0
+            sy = 0.0
+            for j in range(n_nodes):
+                if j == i:
+                    continue
+                dx = coords[i, 0] - coords[j, 0]
+                dy = coords[i, 1] - coords[j, 1]
+                d = math.sqrt(dx * dx + dy * dy)
+                if d < min_dist:
+                    if d == 0.0:
+                        # Coincident nodes: push apart along a fixed diagonal
+                        dx = 0.01 if i < j else -0.01
+                        dy = dx
+                        d = math.hypot(0.01, 0.01)
+                    f = (min_dist - d) / 2 / d
+                    sx += dx * f
+                    sy += dy * f
+            shifts[i, 0] = sx
+            shifts[i, 1] = sy
+            if sx != 0.0 or sy != 0.0:
+                n_moved += 1
+        if n_moved == 0:
+            break
+        coords += shifts
+    return coords
+
+
+@lru_cache(maxsize=1)
+def _numba_overlap_resolver():
+    """Return the Numba-compiled overlap kernel, or None if numba is not installed."""
+    global numba
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(parallel=True, cache=True, fastmath=True)(_resolve_overlaps_kernel)
 
 def visualize_graph(result, config):
     """
@@ -19,9 +140,21 @@ def visualize_graph(result, config):
         logging.warning("Graph visualization requires RELATION_EXTRACTION=True, skipping.")
         return
 
+    import networkx as nx
+    # Figure mit eigenem Agg-Canvas statt pyplot: nur Dateiausgabe, kein GUI-Overhead und
+    # keine Änderung des prozessweiten Backends bzw. offener Figuren der aufrufenden Anwendung
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+    from matplotlib import cm, colors as mcolors
+    from pyvis.network import Network
+
     # Prepare output filenames and log status
-    png_filename = "knowledge_graph.png"
-    html_filename = "knowledge_graph_interactive.html"
+    png_enabled = config.get("GRAPH_PNG_ENABLED", True)
+    html_enabled = config.get("GRAPH_HTML_ENABLED", True)
+    png_filename = "knowledge_graph.png" if png_enabled else None
+    html_filename = "knowledge_graph_interactive.html" if html_enabled else None
     logging.info(f"Graph visualization enabled - PNG: {png_filename}, HTML: {html_filename}")
 
     entities = result.get("entities", [])
@@ -34,18 +167,13 @@ def visualize_graph(result, config):
 
     # Build MultiDiGraph
     G = nx.MultiDiGraph()
-    for rel in relationships:
-        inferred = rel.get("inferred", "")
-        subj = rel.get("subject")
-        obj = rel.get("object")
-        pred = rel.get("predicate")
-        style = "solid" if inferred == "explicit" else "dashed"
-        if subj:
-            G.add_node(subj)
-        if obj:
-            G.add_node(obj)
-        if subj and obj and pred:
-            G.add_edge(subj, obj, label=pred, style=style)
+    # Nodes first (same order as before, including endpoints of incomplete triples), then all edges in bulk
+    G.add_nodes_from(node for rel in relationships for node in (rel.get("subject"), rel.get("object")) if node)
+    G.add_edges_from(
+        (rel["subject"], rel["object"], {"label": rel["predicate"], "style": _EDGE_STYLES.get(rel.get("inferred"), "dashed")})
+        for rel in relationships
+        if rel.get("subject") and rel.get("object") and rel.get("predicate")
+    )
 
     # Determine colors by entity type
     base_colors = {
@@ -57,24 +185,23 @@ def visualize_graph(result, config):
         "work": "#ffe6cc"
     }
 
-    def get_entity_type(node):
-        for rel in relationships:
-            if rel.get("subject") == node and rel.get("subject_type"):
-                return rel.get("subject_type").lower()
-            if rel.get("object") == node and rel.get("object_type"):
-                return rel.get("object_type").lower()
-        for ent in entities:
-            name = ent.get("entity") or ent.get("name")
-            if name == node and ent.get("entity_type"):
-                return ent.get("entity_type").lower()
-        return ""
+    # Resolve each node's type in one pass: first typed occurrence in the relationships wins,
+    # entity types are the fallback
+    node_type = {}
+    for rel in relationships:
+        subject_type = rel.get("subject_type")
+        if subject_type:
+            node_type.setdefault(rel.get("subject"), subject_type.lower())
+        object_type = rel.get("object_type")
+        if object_type:
+            node_type.setdefault(rel.get("object"), object_type.lower())
+    for ent in entities:
+        entity_type = ent.get("entity_type")
+        if entity_type:
+            node_type.setdefault(ent.get("entity") or ent.get("name"), entity_type.lower())
 
     # Build list of unique types in order encountered
-    unique_types = []
-    for node in G.nodes():
-        etype = get_entity_type(node)
-        if etype not in unique_types:
-            unique_types.append(etype)
+    unique_types = list(dict.fromkeys(node_type.get(node, "") for node in G.nodes()))
     # Build mapping: base colors first
     type_color_map = {}
     for etype in unique_types:
@@ -86,18 +213,15 @@ def visualize_graph(result, config):
     for idx, etype in enumerate(other_types):
         type_color_map[etype] = mcolors.to_hex(cmap(idx))
     # Assign each node its fill color
-    type_fill_colors = {node: type_color_map.get(get_entity_type(node), '#f2f2f2') for node in G.nodes()}
+    type_fill_colors = {node: type_color_map.get(node_type.get(node, ""), '#f2f2f2') for node in G.nodes()}
 
     # -- PNG Visualization --
     # Determine layout method and parameters
     layout_method = config.get("GRAPH_LAYOUT_METHOD", "kamada_kawai")
     layout_k = config.get("GRAPH_LAYOUT_K")
     layout_iters = config.get("GRAPH_LAYOUT_ITERATIONS", 50)
-    # Compute positions based on configured layout
-    if layout_method == "spring":
-        pos = nx.spring_layout(G, k=layout_k, iterations=layout_iters)
-    else:
-        pos = nx.kamada_kawai_layout(G)
+    # Compute positions based on configured layout (cached per graph)
+    pos = _compute_layout(G, layout_method, layout_k, layout_iters)
     # Scale positions according to GRAPH_PNG_SCALE setting
     scale = config.get("GRAPH_PNG_SCALE", 0.33)
     pos = {node: (coords[0] * scale, coords[1] * scale) for node, coords in pos.items()}
@@ -105,106 +229,94 @@ def visualize_graph(result, config):
     if config.get("GRAPH_PHYSICS_PREVENT_OVERLAP", True):
         nodes = list(pos.keys())
         min_dist = config.get("GRAPH_PHYSICS_PREVENT_OVERLAP_DISTANCE", 0.1)
-        for _ in range(config.get("GRAPH_PHYSICS_PREVENT_OVERLAP_ITERATIONS", 50)):
-            moved = False
-            for i in range(len(nodes)):
-                for j in range(i+1, len(nodes)):
-                    n1, n2 = nodes[i], nodes[j]
-                    x1, y1 = pos[n1]
-                    x2, y2 = pos[n2]
-                    dx, dy = x1 - x2, y1 - y2
-                    dist = math.hypot(dx, dy)
-                    if dist < min_dist:
-                        if dist == 0:
-                            dx, dy = 0.01, 0.01
-                            dist = math.hypot(dx, dy)
-                        shift = (min_dist - dist) / 2
-                        ux, uy = dx / dist, dy / dist
-                        pos[n1] = (x1 + ux * shift, y1 + uy * shift)
-                        pos[n2] = (x2 - ux * shift, y2 - uy * shift)
-                        moved = True
-            if not moved:
-                break
+        coords = np.array([pos[n] for n in nodes], dtype=float).reshape(-1, 2)
+        max_iter = config.get("GRAPH_PHYSICS_PREVENT_OVERLAP_ITERATIONS", 50)
+        resolver = _numba_overlap_resolver() if len(nodes) >= _NUMBA_MIN_NODES else None
+        if resolver is not None:
+            coords = resolver(coords, float(min_dist), max_iter)
+        else:
+            coords = _resolve_overlaps(coords, min_dist, max_iter)
+        pos = {node: (x, y) for node, (x, y) in zip(nodes, coords.tolist())}
     # Center graph positions by subtracting mean coordinates
     mean_x = sum(x for x, _ in pos.values()) / len(pos)
     mean_y = sum(y for _, y in pos.values()) / len(pos)
     pos = {node: (x - mean_x, y - mean_y) for node, (x, y) in pos.items()}
-    # Static PNG layout with fixed scaling
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.set_aspect('equal')
-    node_colors = [type_fill_colors.get(n, "#f2f2f2") for n in G.nodes()]
-    nx.draw_networkx_nodes(G, pos, node_size=500, node_color=node_colors, edgecolors="#222", ax=ax)
-    nx.draw_networkx_labels(G, pos, font_size=9, ax=ax)
-    edge_styles = [d.get("style", "solid") for _, _, d in G.edges(data=True)]
-    nx.draw_networkx_edges(G, pos, arrows=True, style=edge_styles, ax=ax)
-    edge_labels = nx.get_edge_attributes(G, "label")
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8, ax=ax)
-    # Set symmetric axis limits to center graph with buffer
-    xs = [coords[0] for coords in pos.values()]
-    ys = [coords[1] for coords in pos.values()]
-    if xs and ys:
-        max_x = max(abs(x) for x in xs)
-        max_y = max(abs(y) for y in ys)
-        max_range = max(max_x, max_y)
-        # Use 15% buffer for more breathing room and to avoid clipping
-        buffer = max_range * 0.15
-        ax.set_xlim(-max_range - buffer, max_range + buffer)
-        ax.set_ylim(-max_range - buffer, max_range + buffer)
-    ax.set_axis_off()
-    # Keine automatische Neuberechnung mehr – statische Achsenlimits nutzen
-    legend_elements = [
-        Line2D([0], [0], color="#222", lw=2.4, label="Explicit relationship →"),
-        Line2D([0], [0], color="#888", lw=2.0, linestyle="dashed", label="Implicit relationship →")
-    ]
     # Typ-Farben-Legende auf Basis der Knoten
     type_color_map = {}
     for node, color in type_fill_colors.items():
-        typ = get_entity_type(node)
+        typ = node_type.get(node, "")
         if typ:
             type_color_map[typ] = color
-    for typ, color in sorted(type_color_map.items()):
-        legend_elements.append(Patch(facecolor=color, edgecolor="#444", label=typ.capitalize()))
-    # Add legend at figure level (lower-left image corner)
-    fig.legend(handles=legend_elements, loc="lower left",
-               bbox_to_anchor=(0.02, 0.02), bbox_transform=fig.transFigure,
-               fontsize=9, frameon=True, facecolor="white", edgecolor="#aaa")
-    # Remove all subplot margins for maximal drawing area
-    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
-    fig.savefig(png_filename, dpi=180)
-    plt.close(fig)
-    logging.info(f"Knowledge Graph PNG gespeichert: {png_filename}")
-    print(f"Knowledge Graph PNG gespeichert: {png_filename}")
+    if png_enabled:
+        # Static PNG layout with fixed scaling
+        fig = Figure(figsize=(8, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        try:
+            ax.set_aspect('equal')
+            node_colors = [type_fill_colors.get(n, "#f2f2f2") for n in G.nodes()]
+            nx.draw_networkx_nodes(G, pos, node_size=500, node_color=node_colors, edgecolors="#222", ax=ax)
+            nx.draw_networkx_labels(G, pos, font_size=9, ax=ax)
+            edge_styles = [d.get("style", "solid") for _, _, d in G.edges(data=True)]
+            nx.draw_networkx_edges(G, pos, arrows=True, style=edge_styles, ax=ax)
+            edge_labels = nx.get_edge_attributes(G, "label")
+            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8, ax=ax)
+            # Set symmetric axis limits to center graph with buffer
+            xs = [coords[0] for coords in pos.values()]
+            ys = [coords[1] for coords in pos.values()]
+            if xs and ys:
+                max_x = max(abs(x) for x in xs)
+                max_y = max(abs(y) for y in ys)
+                max_range = max(max_x, max_y)
+                # Use 15% buffer for more breathing room and to avoid clipping
+                buffer = max_range * 0.15
+                ax.set_xlim(-max_range - buffer, max_range + buffer)
+                ax.set_ylim(-max_range - buffer, max_range + buffer)
+            ax.set_axis_off()
+            # Keine automatische Neuberechnung mehr – statische Achsenlimits nutzen
+            legend_elements = [
+                Line2D([0], [0], color="#222", lw=2.4, label="Explicit relationship →"),
+                Line2D([0], [0], color="#888", lw=2.0, linestyle="dashed", label="Implicit relationship →")
+            ]
+            for typ, color in sorted(type_color_map.items()):
+                legend_elements.append(Patch(facecolor=color, edgecolor="#444", label=typ.capitalize()))
+            # Add legend at figure level (lower-left image corner)
+            fig.legend(handles=legend_elements, loc="lower left",
+                       bbox_to_anchor=(0.02, 0.02), bbox_transform=fig.transFigure,
+                       fontsize=9, frameon=True, facecolor="white", edgecolor="#aaa")
+            # Remove all subplot margins for maximal drawing area
+            fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
+            fig.savefig(png_filename, dpi=config.get("GRAPH_PNG_DPI", 180))
+        finally:
+            # Nicht bei pyplot registriert: Speicher der Figur direkt freigeben
+            fig.clear()
+        logging.info(f"Knowledge Graph PNG gespeichert: {png_filename}")
+        print(f"Knowledge Graph PNG gespeichert: {png_filename}")
 
     # -- HTML Visualization (interactive) using PyVis --
-    net = Network(height="800px", width="100%", directed=True, bgcolor="#ffffff", font_color="#222", notebook=False)
-    # Reuse static positions and invert Y for matching orientation
-    scale_px = config.get("GRAPH_INTERACTIVE_SCALE", 1000)
-    pos_inter = {node: (coords[0] * scale_px, -coords[1] * scale_px) for node, coords in pos.items()}
-    for node in G.nodes():
-        x, y = pos_inter.get(node, (0, 0))
-        net.add_node(node, label=node, color=type_fill_colors.get(node, "#f2f2f2"), x=x, y=y, physics=False)
-    for u, v, d in G.edges(data=True):
-        net.add_edge(u, v, label=d.get("label", ""), color="#333", arrows="to",
-                     dashes=(d.get("style") == "dashed"), font={"size": 10}, smooth=False)
-    # Save interactive HTML directly
-    net.write_html(html_filename)
-    # Inject HTML-Legende am Seitenanfang
-    legend_html = '<div style="padding:8px; background:#f9f9f9; border:1px solid #ddd; margin:0 auto 8px auto; border-radius:5px; font-size:12px; max-width:800px; text-align:center;">'
-    legend_html += '<h4 style="margin-top:0; margin-bottom:5px;">Knowledge Graph</h4>'
-    legend_html += '<div style="margin:5px 0"><b>Entity Types:</b> '
-    for typ, color in sorted(type_color_map.items()):
-        legend_html += f'<span style="background:{color};border:1px solid #444;padding:1px 4px;margin-right:4px;display:inline-block;font-size:11px;">{typ.capitalize()}</span>'
-    legend_html += '</div>'
-    legend_html += '<div style="margin:5px 0"><b>Relationships:</b> '
-    legend_html += '<span style="border-bottom:1px solid #333;padding:1px 4px;margin-right:5px;display:inline-block;font-size:11px;">Explicit</span>'
-    legend_html += '<span style="border-bottom:1px dashed #555;padding:1px 4px;display:inline-block;font-size:11px;">Implicit</span>'
-    legend_html += '</div></div>'
-    with open(html_filename, 'r', encoding='utf-8') as f:
-        html_content = f.read()
-    if '<body>' in html_content:
-        html_content = html_content.replace('<body>', '<body>\n' + legend_html + '\n')
-    with open(html_filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    logging.info(f"Interaktive Knowledge Graph HTML gespeichert: {html_filename}")
-    print(f"Interaktive Knowledge Graph HTML gespeichert: {html_filename}")
+    if html_enabled:
+        net = Network(height="800px", width="100%", directed=True, bgcolor="#ffffff", font_color="#222", notebook=False)
+        # Reuse static positions and invert Y for matching orientation
+        scale_px = config.get("GRAPH_INTERACTIVE_SCALE", 1000)
+        pos_inter = {node: (coords[0] * scale_px, -coords[1] * scale_px) for node, coords in pos.items()}
+        for node in G.nodes():
+            x, y = pos_inter.get(node, (0, 0))
+            net.add_node(node, label=node, color=type_fill_colors.get(node, "#f2f2f2"), x=x, y=y, physics=False)
+        for u, v, d in G.edges(data=True):
+            net.add_edge(u, v, label=d.get("label", ""), color="#333", arrows="to",
+                         dashes=(d.get("style") == "dashed"), font={"size": 10}, smooth=False)
+        # Save interactive HTML directly
+        net.write_html(html_filename)
+        # Inject HTML-Legende am Seitenanfang
+        type_spans = "".join(_LEGEND_TYPE_SPAN.format(color=color, label=typ.capitalize())
+                             for typ, color in sorted(type_color_map.items()))
+        legend_html = _LEGEND_HEAD + type_spans + _LEGEND_TAIL
+        with open(html_filename, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        if '<body>' in html_content:
+            html_content = html_content.replace('<body>', '<body>\n' + legend_html + '\n')
+        with open(html_filename, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        logging.info(f"Interaktive Knowledge Graph HTML gespeichert: {html_filename}")
+        print(f"Interaktive Knowledge Graph HTML gespeichert: {html_filename}")
     return {"png": png_filename, "html": html_filename}
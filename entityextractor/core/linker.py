@@ -7,8 +7,10 @@ like Wikipedia, Wikidata, and DBpedia.
 
 import logging
 import time
-import re
 import urllib.parse
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
 
 from entityextractor.utils.text_utils import is_valid_wikipedia_url
 
@@ -16,18 +18,220 @@ from entityextractor.config.settings import get_config
 from entityextractor.services.wikipedia_service import (
     fallback_wikipedia_url,
     get_wikipedia_extract,
-    convert_to_de_wikipedia_url,
+    get_wikipedia_extracts_bulk,
     follow_wikipedia_redirect,
     get_wikipedia_details,
     get_wikipedia_categories
 )
 from entityextractor.services.wikidata_service import (
     get_wikidata_id_from_wikipedia_url,
-    get_wikidata_details
+    get_wikidata_details_bulk
 )
 from entityextractor.services.dbpedia_service import get_dbpedia_info_from_wikipedia_url
 from entityextractor.utils.logging_utils import configure_logging
 from entityextractor.utils.text_utils import strip_trailing_ellipsis
+from entityextractor.utils.http_utils import warm_up_connections
+from entityextractor.utils.cache_utils import get_cache_path, load_cache, save_cache
+
+# (Quellfeld, Zielfeld) für die Übernahme der Wikidata-Details: Basisfelder und Relationen P361, P527, P463
+_WIKIDATA_FIELDS = (
+    ("description", "wikidata_description"), ("label", "wikidata_label"),
+    ("types", "wikidata_types"), ("subclasses", "wikidata_subclasses"),
+    ("part_of", "part_of"), ("has_parts", "has_parts"), ("member_of", "member_of"),
+)
+# Nur bei ADDITIONAL_DETAILS übernommen
+_WIKIDATA_ADDITIONAL_FIELDS = tuple((field, field) for field in (
+    "image_url", "website", "coordinates", "foundation_date", "birth_date", "death_date", "occupations"
+))
+# (Quellfelder in Priorität, Zielfeld) für die DBpedia-Informationen
+_DBPEDIA_FIELDS = (
+    (("dbpedia_title", "title"), "dbpedia_title"),
+    (("resource_uri", "uri"), "dbpedia_uri"),
+    (("abstract",), "dbpedia_abstract"),
+    (("types",), "dbpedia_types"),
+    (("part_of",), "dbpedia_part_of"),
+    (("has_parts",), "dbpedia_has_parts"),
+    (("member_of",), "dbpedia_member_of"),
+    (("language",), "dbpedia_language"),
+)
+
+def _link_entity(entity, config, prefetched_extracts=None):
+    """
+    Link a single entity (with a non-empty name) to Wikipedia, Wikidata (ID only) and DBpedia.
+    prefetched_extracts maps Wikipedia URLs to already fetched (extract, wikidata_id) tuples.
+    Returns the linked copy of the entity and whether its Wikidata details should be added.
+    """
+    needs_wikidata_details = False
+    # Einstellungen einmal lesen statt bei jedem Schritt
+    language = config.get("LANGUAGE", "de")
+    use_wikidata = config.get("USE_WIKIDATA", True)
+    use_dbpedia = config.get("USE_DBPEDIA", False)
+    additional_details = config.get("ADDITIONAL_DETAILS", False)
+    entity_name = entity.get("name", "")
+    linked_entity = entity.copy()
+    
+    # Step 1: Wikipedia-URL bestimmen
+    wikipedia_url = None
+    llm_generated_url = entity.get("wikipedia_url", None)
+
+    # 1. LLM-URL direkt nutzen, falls gültig
+    if llm_generated_url and is_valid_wikipedia_url(llm_generated_url):
+        logging.info("Using LLM-generated Wikipedia URL for '%s': %s", entity_name, llm_generated_url)
+        wikipedia_url = llm_generated_url
+    else:
+        # 2. Fallback nur wenn LLM-URL fehlt/ungültig
+        if llm_generated_url:
+            logging.info("LLM-generated URL invalid or incomplete: '%s'. Using fallback.", llm_generated_url)
+        wikipedia_url = fallback_wikipedia_url(entity_name, language=language)
+
+    if wikipedia_url:
+        linked_entity["wikipedia_url"] = wikipedia_url
+
+        # Step 2: Wikipedia-Extract versuchen (ohne Redirect-Check/Opensearch), vorab geladene Extrakte bevorzugen
+        prefetched = prefetched_extracts.get(wikipedia_url) if prefetched_extracts else None
+        extract, wiki_id = prefetched or get_wikipedia_extract(wikipedia_url, config)
+        if extract:
+            linked_entity["wikipedia_extract"] = strip_trailing_ellipsis(extract)
+            # Wenn MediaWiki API die Wikidata-ID liefert, setzen und späteren Abruf überspringen
+            if wiki_id:
+                linked_entity["wikidata_id"] = wiki_id
+                # Soft-Redirect überspringen, da alle Daten bereits abgerufen wurden
+                linked_entity["wikipedia_title"] = entity_name
+        else:
+            # 3. Nur wenn kein Extract: Redirect prüfen und Fallback nutzen
+            logging.info("No extract found for '%s' (URL: %s). Trying redirect/fallback...", entity_name, wikipedia_url)
+            final_url, page_title = follow_wikipedia_redirect(wikipedia_url, entity_name, config)
+            redirected = bool(final_url) and final_url != wikipedia_url
+            if redirected:
+                logging.info("Redirect detected: %s -> %s", wikipedia_url, final_url)
+                linked_entity["wikipedia_url"] = final_url
+                wikipedia_url = final_url
+            if page_title:
+                linked_entity["wikipedia_title"] = page_title
+                entity_name = page_title
+            # Nochmals Extract versuchen, aber nur für eine neue URL: get_wikipedia_extract hat für die
+            # ursprüngliche URL bereits Redirect-, Opensearch- und Synonym-Fallbacks durchlaufen
+            if redirected:
+                extract, wiki_id = get_wikipedia_extract(wikipedia_url, config)
+            if not extract:
+                # 4. Letzter Fallback: Opensearch explizit
+                fallback_url = fallback_wikipedia_url(entity_name, language=language)
+                if fallback_url and fallback_url != wikipedia_url:
+                    logging.info("Using fallback URL from Opensearch: %s for '%s'", fallback_url, entity_name)
+                    linked_entity["wikipedia_url"] = fallback_url
+                    wikipedia_url = fallback_url
+                    # Update entity_name and wikipedia_title based on fallback URL
+                    try:
+                        fb_title = urllib.parse.unquote(fallback_url.split("/wiki/")[1].split("#")[0])
+                        linked_entity["wikipedia_title"] = fb_title
+                        entity_name = fb_title
+                    except Exception as e:
+                        logging.warning("Failed parsing fallback title from URL %s: %s", fallback_url, e)
+                    extract, wiki_id = get_wikipedia_extract(wikipedia_url, config)
+            if extract:
+                linked_entity["wikipedia_extract"] = strip_trailing_ellipsis(extract)
+                # Wenn MediaWiki API die Wikidata-ID liefert, setzen und späteren Abruf überspringen
+                if wiki_id:
+                    linked_entity["wikidata_id"] = wiki_id
+
+        # Die folgenden Abrufe lesen nur die feststehende Wikipedia-URL und sind voneinander
+        # unabhängig: gleichzeitig starten, Ergebnisse danach wie bisher übernehmen
+        wikipedia_url = linked_entity["wikipedia_url"]
+        lookups = {}
+        if linked_entity.get("wikipedia_extract"):
+            # Wikipedia-Kategorien und zusätzliche Details nur, wenn ein Extract gefunden wurde
+            lookups["categories"] = (get_wikipedia_categories, (wikipedia_url, config), {})
+            if additional_details:
+                lookups["details"] = (get_wikipedia_details, (wikipedia_url, config), {})
+        if use_wikidata and not linked_entity.get("wikidata_id"):
+            # ID aus Extract übernehmen oder per Fallback suchen
+            lookups["wikidata_id"] = (get_wikidata_id_from_wikipedia_url, (wikipedia_url,),
+                                      {"entity_name": entity_name, "config": config})
+        if use_dbpedia:
+            lookups["dbpedia"] = (get_dbpedia_info_from_wikipedia_url, (wikipedia_url, config), {})
+        lookup_results = _run_lookups(lookups)
+
+        cats = lookup_results.get("categories")
+        if cats:
+            linked_entity["wikipedia_categories"] = cats
+
+        wiki_details = lookup_results.get("details")
+        if wiki_details:
+            linked_entity["wikipedia_details"] = wiki_details
+            
+        # Step 5: Wikidata ID und Details (intelligent: Details auch bei Extract-ID, Fallback falls nötig)
+        if use_wikidata:
+            wikidata_id = lookup_results.get("wikidata_id")
+            if wikidata_id:
+                linked_entity["wikidata_id"] = wikidata_id
+            # Details nur abrufen, wenn ID vorhanden ist (gesammelt für alle Entitäten, siehe link_entities)
+            needs_wikidata_details = bool(linked_entity.get("wikidata_id"))
+            
+        # Step 6: Get DBpedia information
+        if use_dbpedia:
+            dbpedia_info = lookup_results.get("dbpedia")
+            if dbpedia_info:
+                # Store the complete DBpedia info object
+                linked_entity["dbpedia_info"] = dbpedia_info
+                    
+                # For backward compatibility, also store individual fields (title, URI, abstract, types, relations, language)
+                for sources, target in _DBPEDIA_FIELDS:
+                    source = next((key for key in sources if key in dbpedia_info), None)
+                    if source:
+                        linked_entity[target] = dbpedia_info[source]
+                    
+                # Additional DBpedia details
+                if additional_details:
+                    linked_entity["dbpedia_details"] = dbpedia_info
+            else:
+                # Fallback: minimale DBpedia-URI bei Fehlern
+                title = linked_entity["wikipedia_url"].rsplit("/", 1)[-1]
+                if config.get("DBPEDIA_USE_DE", False):
+                    prefix = "http://de.dbpedia.org/resource/"
+                    lang = "de"
+                else:
+                    prefix = "http://dbpedia.org/resource/"
+                    lang = "en"
+                linked_entity["dbpedia_uri"] = prefix + title
+                linked_entity["dbpedia_language"] = lang
+
+    return linked_entity, needs_wikidata_details
+
+def _linking_cache_path(entity, config):
+    """
+    Cache path for the linking result of entity, or None if linking caching is disabled.
+    The key covers the entity name, the LLM URL and every setting that changes the result.
+    """
+    if not (config.get("CACHE_ENABLED") and config.get("CACHE_LINKING_ENABLED")):
+        return None
+    key = json.dumps([
+        entity.get("name"), entity.get("wikipedia_url"), config.get("LANGUAGE", "de"),
+        config.get("USE_WIKIDATA", True), config.get("USE_DBPEDIA", False),
+        config.get("DBPEDIA_USE_DE", False), config.get("ADDITIONAL_DETAILS", False)
+    ], ensure_ascii=False)
+    return get_cache_path(config.get("CACHE_DIR", "cache"), "linking", key)
+
+def _run_lookups(lookups):
+    """
+    Run independent lookups {name: (function, args, kwargs)} concurrently and return {name: result}.
+    A single lookup is called directly; exceptions propagate as with a direct call.
+    """
+    if len(lookups) <= 1:
+        return {name: func(*args, **kwargs) for name, (func, args, kwargs) in lookups.items()}
+    with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+        futures = {name: executor.submit(func, *args, **kwargs) for name, (func, args, kwargs) in lookups.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def _apply_wikidata_details(linked_entity, wikidata_details, config):
+    """
+    Copy the Wikidata details into the linked entity.
+    """
+    linked_entity["wikidata_url"] = f"https://www.wikidata.org/wiki/{linked_entity['wikidata_id']}"
+    field_map = _WIKIDATA_FIELDS + _WIKIDATA_ADDITIONAL_FIELDS if config.get("ADDITIONAL_DETAILS", False) else _WIKIDATA_FIELDS
+    for source, target in field_map:
+        if source in wikidata_details:
+            linked_entity[target] = wikidata_details[source]
+    linked_entity["wikidata_details"] = wikidata_details
 
 def link_entities(entities, text=None, user_config=None):
     """
@@ -51,182 +255,82 @@ def link_entities(entities, text=None, user_config=None):
     start_time = time.time()
     logging.info("Starting entity linking...")
     
-    linked_entities = []
+    named_entities = [entity for entity in entities if entity.get("name", "")]
+    if named_entities:
+        # DNS und TLS-Handshake zu Wikipedia/Wikidata vorziehen, während die Entitäten gruppiert werden
+        warm_up_hosts = [f"{config.get('LANGUAGE', 'de')}.wikipedia.org"]
+        if config.get("USE_WIKIDATA", True):
+            warm_up_hosts.append("www.wikidata.org")
+        warm_up_connections(warm_up_hosts, timeout=config.get("TIMEOUT_THIRD_PARTY", 15))
+    # Gleiche Entitäten (Name ohne Groß-/Kleinschreibung + LLM-URL) nur einmal verknüpfen
+    groups = {}
+    for index, entity in enumerate(named_entities):
+        key = (entity["name"].strip().lower(), entity.get("wikipedia_url") or "")
+        groups.setdefault(key, []).append(index)
+    representatives = [named_entities[indices[0]] for indices in groups.values()]
+    if len(representatives) < len(named_entities):
+        logging.info("Linking %d unique of %d entities", len(representatives), len(named_entities))
+    # Ergebnisse früherer Läufe aus dem Linking-Cache übernehmen, nur die übrigen Entitäten verknüpfen
+    cache_paths = [_linking_cache_path(entity, config) for entity in representatives]
+    cached_fields = [load_cache(path) if path else None for path in cache_paths]
+    to_link = [entity for entity, fields in zip(representatives, cached_fields) if fields is None]
+    if len(to_link) < len(representatives):
+        logging.info("Loaded %d linked entities from cache", len(representatives) - len(to_link))
+    # Step 2 vorab: Extrakte für alle gültigen LLM-URLs gesammelt abrufen (mehrere Titel pro API-Anfrage)
+    prefetched_extracts = get_wikipedia_extracts_bulk(
+        [entity["wikipedia_url"] for entity in to_link
+         if entity.get("wikipedia_url") and is_valid_wikipedia_url(entity["wikipedia_url"])],
+        config
+    )
+    # Entitäten sind unabhängig voneinander und I/O-gebunden (Wiki-Requests): parallel verknüpfen,
+    # Reihenfolge bleibt erhalten; die Request-Rate begrenzt weiterhin der RateLimiter
+    workers = max(1, min(config.get("LINKING_CONCURRENCY", 4), len(to_link)))
+    if workers == 1:
+        results = [_link_entity(entity, config, prefetched_extracts) for entity in to_link]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda entity: _link_entity(entity, config, prefetched_extracts), to_link))
     
-    for entity in entities:
-        entity_name = entity.get("name", "")
-        if not entity_name:
-            continue
-            
-        linked_entity = entity.copy()
-        
-        # Step 1: Wikipedia-URL bestimmen
-        wikipedia_url = None
-        llm_generated_url = entity.get("wikipedia_url", None)
-
-        # 1. LLM-URL direkt nutzen, falls gültig
-        if llm_generated_url and is_valid_wikipedia_url(llm_generated_url):
-            logging.info(f"Using LLM-generated Wikipedia URL for '{entity_name}': {llm_generated_url}")
-            wikipedia_url = llm_generated_url
+    # Step 5b: Wikidata-Details für alle Entitäten gesammelt abrufen (wbgetentities, bis zu 50 IDs pro Anfrage)
+    pending = [linked_entity for linked_entity, needs_details in results if needs_details]
+    if pending:
+        details_by_id = get_wikidata_details_bulk(
+            [linked_entity["wikidata_id"] for linked_entity in pending],
+            language=config.get("LANGUAGE", "de"),
+            config=config
+        )
+        for linked_entity in pending:
+            wikidata_details = details_by_id.get(linked_entity["wikidata_id"])
+            if wikidata_details:
+                _apply_wikidata_details(linked_entity, wikidata_details, config)
+    
+    # Verknüpfte Felder der Repräsentanten auf alle Vorkommen übertragen (Reihenfolge bleibt erhalten)
+    linked_entities = [None] * len(named_entities)
+    new_results = iter(results)
+    for representative, link_fields, cache_path, indices in zip(representatives, cached_fields, cache_paths, groups.values()):
+        if link_fields is None:
+            linked_entity, _ = next(new_results)
+            link_fields = {key: value for key, value in linked_entity.items()
+                           if key not in representative or representative[key] != value}
+            if cache_path:
+                save_cache(cache_path, link_fields)
         else:
-            # 2. Fallback nur wenn LLM-URL fehlt/ungültig
-            if llm_generated_url:
-                logging.info(f"LLM-generated URL invalid or incomplete: '{llm_generated_url}'. Using fallback.")
-            wikipedia_url = fallback_wikipedia_url(entity_name, language=config.get("LANGUAGE", "de"))
-
-        if wikipedia_url:
-            linked_entity["wikipedia_url"] = wikipedia_url
-
-            # Step 2: Wikipedia-Extract versuchen (ohne Redirect-Check/Opensearch)
-            extract, wiki_id = get_wikipedia_extract(wikipedia_url, config)
-            if extract:
-                linked_entity["wikipedia_extract"] = strip_trailing_ellipsis(extract)
-                # Wenn MediaWiki API die Wikidata-ID liefert, setzen und späteren Abruf überspringen
-                if wiki_id:
-                    linked_entity["wikidata_id"] = wiki_id
-                    # Soft-Redirect überspringen, da alle Daten bereits abgerufen wurden
-                    linked_entity["wikipedia_title"] = entity_name
-            else:
-                # 3. Nur wenn kein Extract: Redirect prüfen und Fallback nutzen
-                logging.info(f"No extract found for '{entity_name}' (URL: {wikipedia_url}). Trying redirect/fallback...")
-                final_url, page_title = follow_wikipedia_redirect(wikipedia_url, entity_name)
-                if final_url and final_url != wikipedia_url:
-                    logging.info(f"Redirect detected: {wikipedia_url} -> {final_url}")
-                    linked_entity["wikipedia_url"] = final_url
-                    wikipedia_url = final_url
-                if page_title:
-                    linked_entity["wikipedia_title"] = page_title
-                    entity_name = page_title
-                # Nochmals Extract versuchen
-                extract, wiki_id = get_wikipedia_extract(wikipedia_url, config)
-                if not extract:
-                    # 4. Letzter Fallback: Opensearch explizit
-                    fallback_url = fallback_wikipedia_url(entity_name, language=config.get("LANGUAGE", "de"))
-                    if fallback_url and fallback_url != wikipedia_url:
-                        logging.info(f"Using fallback URL from Opensearch: {fallback_url} for '{entity_name}'")
-                        linked_entity["wikipedia_url"] = fallback_url
-                        wikipedia_url = fallback_url
-                        # Update entity_name and wikipedia_title based on fallback URL
-                        try:
-                            fb_title = urllib.parse.unquote(fallback_url.split("/wiki/")[1].split("#")[0])
-                            linked_entity["wikipedia_title"] = fb_title
-                            entity_name = fb_title
-                        except Exception as e:
-                            logging.warning(f"Failed parsing fallback title from URL {fallback_url}: {e}")
-                        extract, wiki_id = get_wikipedia_extract(wikipedia_url, config)
-                if extract:
-                    linked_entity["wikipedia_extract"] = strip_trailing_ellipsis(extract)
-                    # Wenn MediaWiki API die Wikidata-ID liefert, setzen und späteren Abruf überspringen
-                    if wiki_id:
-                        linked_entity["wikidata_id"] = wiki_id
-
-            # Wikipedia-Kategorien nur, wenn ein Extract gefunden wurde
-            if linked_entity.get("wikipedia_extract"):
-                cats = get_wikipedia_categories(linked_entity["wikipedia_url"], config)
-                if cats:
-                    linked_entity["wikipedia_categories"] = cats
-
-            # Zusätzliche Details nur, wenn ein Extract gefunden wurde
-            if config.get("ADDITIONAL_DETAILS", False) and linked_entity.get("wikipedia_extract"):
-                wiki_details = get_wikipedia_details(linked_entity["wikipedia_url"], config)
-                if wiki_details:
-
-                    linked_entity["wikipedia_details"] = wiki_details
-            
-            # Step 5: Wikidata ID und Details (intelligent: Details auch bei Extract-ID, Fallback falls nötig)
-            if config.get("USE_WIKIDATA", True):
-                # ID aus Extract übernehmen oder per Fallback suchen
-                if linked_entity.get("wikidata_id"):
-                    wikidata_id = linked_entity["wikidata_id"]
-                else:
-                    wikidata_id = get_wikidata_id_from_wikipedia_url(
-                        linked_entity["wikipedia_url"],
-                        entity_name=entity_name,
-                        config=config
-                    )
-                    if wikidata_id:
-                        linked_entity["wikidata_id"] = wikidata_id
-                # Details nur abrufen, wenn ID vorhanden ist
-                if linked_entity.get("wikidata_id"):
-                    wikidata_details = get_wikidata_details(
-                        linked_entity["wikidata_id"],
-                        language=config.get("LANGUAGE", "de"),
-                        config=config
-                    )
-                    if wikidata_details:
-                        linked_entity["wikidata_url"] = f"https://www.wikidata.org/wiki/{linked_entity['wikidata_id']}"
-                        # Basisfelder
-                        for field in ("description","label","types","subclasses"):
-                            if field in wikidata_details:
-                                linked_entity[f"wikidata_{field}"] = wikidata_details[field]
-                        # Relationen P361, P527, P463
-                        for rel in ("part_of","has_parts","member_of"):
-                            if rel in wikidata_details:
-                                linked_entity[rel] = wikidata_details.get(rel, [])
-                        # Zusätzliche Details optional
-                        if config.get("ADDITIONAL_DETAILS", False):
-                            for field in ("image_url","website","coordinates","foundation_date","birth_date","death_date","occupations"):
-                                if field in wikidata_details:
-                                    linked_entity[field] = wikidata_details[field]
-                        linked_entity["wikidata_details"] = wikidata_details
-            
-            # Step 6: Get DBpedia information
-            if config.get("USE_DBPEDIA", False):
-                dbpedia_info = get_dbpedia_info_from_wikipedia_url(linked_entity["wikipedia_url"], config)
-                if dbpedia_info:
-                    # Store the complete DBpedia info object
-                    linked_entity["dbpedia_info"] = dbpedia_info
-                    
-                    # Also store the title if available
-                    if "dbpedia_title" in dbpedia_info:
-                        linked_entity["dbpedia_title"] = dbpedia_info["dbpedia_title"]
-                    elif "title" in dbpedia_info:
-                        linked_entity["dbpedia_title"] = dbpedia_info["title"]
-                        
-                    # For backward compatibility, also store individual fields
-                    if "resource_uri" in dbpedia_info:
-                        linked_entity["dbpedia_uri"] = dbpedia_info["resource_uri"]
-                    elif "uri" in dbpedia_info:
-                        linked_entity["dbpedia_uri"] = dbpedia_info["uri"]
-                        
-                    # Add abstract if available
-                    if "abstract" in dbpedia_info:
-                        linked_entity["dbpedia_abstract"] = dbpedia_info["abstract"]
-                        
-                    # Add types if available
-                    if "types" in dbpedia_info:
-                        linked_entity["dbpedia_types"] = dbpedia_info["types"]
-                        
-                    # Add DBpedia relations if available
-                    if "part_of" in dbpedia_info:
-                        linked_entity["dbpedia_part_of"] = dbpedia_info["part_of"]
-                    if "has_parts" in dbpedia_info:
-                        linked_entity["dbpedia_has_parts"] = dbpedia_info["has_parts"]
-                    if "member_of" in dbpedia_info:
-                        linked_entity["dbpedia_member_of"] = dbpedia_info["member_of"]
-                        
-                    # Add language information
-                    if "language" in dbpedia_info:
-                        linked_entity["dbpedia_language"] = dbpedia_info["language"]
-                    
-                    # Additional DBpedia details
-                    if config.get("ADDITIONAL_DETAILS", False):
-                        linked_entity["dbpedia_details"] = dbpedia_info
-                else:
-                    # Fallback: minimale DBpedia-URI bei Fehlern
-                    title = linked_entity["wikipedia_url"].rsplit("/", 1)[-1]
-                    if config.get("DBPEDIA_USE_DE", False):
-                        prefix = "http://de.dbpedia.org/resource/"
-                        lang = "de"
-                    else:
-                        prefix = "http://dbpedia.org/resource/"
-                        lang = "en"
-                    linked_entity["dbpedia_uri"] = prefix + title
-                    linked_entity["dbpedia_language"] = lang
-        
-        linked_entities.append(linked_entity)
+            linked_entity = {**representative, **link_fields}
+        linked_entities[indices[0]] = linked_entity
+        for index in indices[1:]:
+            linked_entities[index] = {**named_entities[index], **copy.deepcopy(link_fields)}
     
     elapsed_time = time.time() - start_time
-    logging.info(f"Entity linking completed in {elapsed_time:.2f} seconds")
+    # Eine Zusammenfassung statt weiterer Einzelmeldungen pro Entität
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info(
+            "Entity linking completed in %.2f seconds: %d entities, %d with Wikipedia extract, "
+            "%d with Wikidata ID, %d with corrected URL (redirect/fallback)",
+            elapsed_time, len(linked_entities),
+            sum(1 for e in linked_entities if e.get("wikipedia_extract")),
+            sum(1 for e in linked_entities if e.get("wikidata_id")),
+            sum(1 for e, original in zip(linked_entities, named_entities)
+                if e.get("wikipedia_url") != original.get("wikipedia_url")),
+        )
     
     return linked_entities
@@ -4,9 +4,18 @@ orchestrator.py
 Orchestrates the full entity extraction workflow, including chunking,
 entity/relationship deduplication, KGC, legacy packaging, and optional visualization.
 """
+import json
 import logging
+import sys
 import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    import orjson  # optional: schnellere JSON-Serialisierung
+except ImportError:
+    orjson = None
 
 from entityextractor.config.settings import get_config
 from entityextractor.utils.logging_utils import configure_logging
@@ -15,13 +24,188 @@ from entityextractor.utils.category_utils import filter_category_counts
 
 from entityextractor.core.extract_api import extract_and_link
 from entityextractor.core.generate_api import generate_and_link
+from entityextractor.core.extractor import extract_entities
+from entityextractor.core.generator import generate_entities
 from entityextractor.core.link_api import link_entities
 from entityextractor.core.relationship_api import infer_entity_relationships
-from entityextractor.core.visualization_api import visualize_graph
 from entityextractor.core.deduplication_utils import deduplicate_relationships_llm
 from entityextractor.core.semantic_dedup_utils import filter_semantically_similar_relationships
 from entityextractor.services.compendium_service import generate_compendium
 
+# Deklarative Feldzuordnung für die Legacy-Ausgabe der Wissensquellen
+_WIKIDATA_BASE_FIELDS = ("description", "types", "label")
+_WIKIDATA_DETAIL_FIELDS = (
+    "aliases", "instance_of", "subclass_of", "part_of", "has_parts", "member_of",
+    "gnd_id", "isni", "official_name", "citizenship", "citizenships", "image_url",
+    "website", "coordinates", "foundation_date", "birth_date", "death_date",
+    "birth_place", "death_place", "population", "area", "country", "region",
+    "founder", "parent_company",
+)
+_WIKIDATA_DETAIL_KEYS = frozenset(_WIKIDATA_DETAIL_FIELDS)
+_DBPEDIA_BASE_FIELDS = (
+    "endpoint", "language", "label", "abstract", "types", "same_as",
+    "part_of", "has_parts", "member_of",
+)
+# Umbenannte Felder: (Zielfeld, Quellfelder in Prioritätsreihenfolge)
+_DBPEDIA_RENAMED_FIELDS = (
+    ("subjects", ("subject", "subjects")),
+    ("categories", ("category", "categories")),
+)
+_DBPEDIA_DETAIL_FIELDS = (
+    "comment", "homepage", "thumbnail", "depiction", "birth_date", "death_date",
+    "birth_place", "death_place", "population", "area", "country", "region",
+    "foundation_date", "founder", "parent_company", "current_member",
+    "former_member", "dbp_part_of", "dbp_member_of",
+)
+_DBPEDIA_DETAIL_KEYS = frozenset(_DBPEDIA_DETAIL_FIELDS)
+# DBpedia-Quellfeld -> Schlüssel unter "coordinates"
+_DBPEDIA_COORDINATE_KEYS = {"lat": "latitude", "long": "longitude"}
+
+# Cache: Wikipedia-URL -> aus der URL abgeleitetes Label (begrenzt, LRU)
+@lru_cache(maxsize=4096)
+def _wikipedia_label_from_url(url):
+    """Derives a readable label from a Wikipedia URL (fallback if no title is known)."""
+    raw = url.split("/wiki/")[-1].split("#")[0]
+    # unquote nur bei prozentkodierten Titeln nötig
+    if "%" in raw:
+        raw = urllib.parse.unquote(raw)
+    return raw.replace("_", " ")
+
+
+def _citation_spans(input_text, entities):
+    """
+    Precomputes (citation_start, citation_end) for all unique citations of the given entities
+    in one pass, so entities quoting the same sentence share a single search.
+    """
+    spans = {}
+    for e in entities:
+        cit = e.get("citation", input_text)
+        if cit not in spans:
+            s = input_text.find(cit) if cit != input_text else 0
+            spans[cit] = (s, s + len(cit) if s != -1 else len(input_text))
+    return spans
+
+
+def _triple_key(rel):
+    """
+    Returns the (subject, predicate, object) key of a relationship.
+    The strings are interned in place, so recurring predicates/entities share one object
+    and tuple hashing/comparison in the relationship maps hits the identity fast path.
+    """
+    key = []
+    for field in ("subject", "predicate", "object"):
+        value = rel.get(field)
+        if isinstance(value, str):
+            value = rel[field] = sys.intern(value)
+        key.append(value)
+    return tuple(key)
+
+
+def _copy_fields(src, dst, keys):
+    """Copies all keys present in src into dst."""
+    dst.update({key: src[key] for key in keys if key in src})
+
+
+def _copy_dbpedia_fields(bd, db_src, with_details):
+    """Maps dbpedia_info fields onto the legacy DBpedia source dict."""
+    _copy_fields(bd, db_src, _DBPEDIA_BASE_FIELDS)
+    for dst_key, src_keys in _DBPEDIA_RENAMED_FIELDS:
+        for src_key in src_keys:
+            if src_key in bd:
+                db_src[dst_key] = bd[src_key]
+                break
+    if with_details:
+        # Ein Durchlauf über die vorhandenen Felder statt einer Prüfung je bekanntem Feld
+        for key, value in bd.items():
+            if key in _DBPEDIA_DETAIL_KEYS:
+                db_src[key] = value
+            elif key in _DBPEDIA_COORDINATE_KEYS:
+                db_src.setdefault("coordinates", {})[_DBPEDIA_COORDINATE_KEYS[key]] = value
+
+
+def _to_legacy(e, input_text, citation_spans, config):
+    """
+    Packages a linked entity into the legacy output format
+    (entity, details with citation span, sources for Wikipedia/Wikidata/DBpedia).
+    Shared by the chunked and the single-pass flow.
+    """
+    get = e.get
+    with_details = config.get("ADDITIONAL_DETAILS", False)
+    cit = get("citation", input_text)
+    s, t = citation_spans[cit]
+    sources = {}
+    leg = {"entity": get("name", ""),
+           "details": {"typ": get("type", ""),
+                       "inferred": get("inferred", "explicit"),
+                       "citation": cit,
+                       "citation_start": s,
+                       "citation_end": t},
+           "sources": sources}
+    wikipedia_url = get("wikipedia_url")
+    wikidata_details = get("wikidata_details")
+    bd = get("dbpedia_info")
+    # Ohne jegliche Quellinformation bleibt sources leer: alle Quell-Blöcke überspringen
+    if not (wikipedia_url or wikidata_details or bd or get("dbpedia_uri")):
+        return leg
+    # wikipedia
+    if wikipedia_url:
+        ws = sources["wikipedia"] = {}
+        # Fallback: derive label from URL
+        ws["label"] = get("wikipedia_title") or _wikipedia_label_from_url(wikipedia_url)
+        ws["url"] = wikipedia_url
+        extract = get("wikipedia_extract")
+        if extract:
+            ws["extract"] = extract
+        categories = get("wikipedia_categories")
+        if categories:
+            ws["categories"] = categories
+        # Zusätzliche Wikipedia-Details bei ADDITIONAL_DETAILS (flatten)
+        if with_details:
+            wikipedia_details = get("wikipedia_details")
+            if wikipedia_details:
+                ws.update(wikipedia_details)
+    # wikidata
+    if wikidata_details and config.get("USE_WIKIDATA", False):
+        wd_src = sources["wikidata"] = {}
+        # Basisfelder
+        wd_src["id"] = wikidata_details.get("id", "")
+        _copy_fields(wikidata_details, wd_src, _WIKIDATA_BASE_FIELDS)
+        wikidata_url = get("wikidata_url")
+        if wikidata_url:
+            wd_src["url"] = wikidata_url
+        # Zusätzliche Wikidata-Felder bei ADDITIONAL_DETAILS
+        if with_details:
+            wd_src.update({key: value for key, value in wikidata_details.items() if key in _WIKIDATA_DETAIL_KEYS})
+    # dbpedia
+    if config.get("USE_DBPEDIA", False):
+        if bd:
+            db_src = sources["dbpedia"] = {}
+            # Basisfelder
+            db_src["resource_uri"] = bd["resource_uri"] if "resource_uri" in bd else bd.get("uri", "")
+            _copy_dbpedia_fields(bd, db_src, with_details)
+        elif get("dbpedia_uri"):
+            sources["dbpedia"] = {"resource_uri": get("dbpedia_uri"), "language": get("dbpedia_language")}
+    return leg
+
+
+def _process_chunk(chunk, idx, total, extractor, config):
+    """
+    Runs extraction/generation, linking and optional relation inference for one chunk.
+    Linking and relation inference only depend on the extracted entities (name/type/inferred),
+    so both stages run concurrently to overlap their network calls.
+    Returns a tuple (entities, relationships).
+    """
+    logging.info("[orchestrator] Chunk %d/%d", idx, total)
+    ents = extractor(chunk, config)
+    logging.info("[orchestrator] Chunk %d: %d entities, linking...", idx, len(ents))
+    if not config.get("RELATION_EXTRACTION", False):
+        return link_entities(ents, chunk, config), []
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        linked_future = pool.submit(link_entities, ents, chunk, config)
+        rels = infer_entity_relationships(chunk, ents, config)
+        linked = linked_future.result()
+    return linked, rels
+
 
 def process_entities(input_text: str, user_config: dict = None):
     """
@@ -41,33 +225,32 @@ def process_entities(input_text: str, user_config: dict = None):
         logging.info("[orchestrator] Chunking: size=%d, overlap=%d", size, overlap)
         chunks = chunk_text(input_text, size, overlap)
         all_ents, all_rels = [], []
-        for i, c in enumerate(chunks, 1):
-            logging.info("[orchestrator] Chunk %d/%d", i, len(chunks))
-            # Choose extraction or generation (compendium handled later via ENABLE_COMPENDIUM)
-            if mode == "generate":
-                ents = generate_and_link(c, config)
-            else:
-                ents = extract_and_link(c, config)
-            all_ents.extend(ents)
-            if config.get("RELATION_EXTRACTION", False):
-                r = infer_entity_relationships(c, ents, config)
+        # Choose extraction or generation once (compendium handled later via ENABLE_COMPENDIUM)
+        extractor = generate_entities if mode == "generate" else extract_entities
+        # Chunks parallel verarbeiten (I/O-gebunden: LLM- und Wiki-Requests), Reihenfolge bleibt erhalten
+        workers = max(1, min(config.get("CHUNK_WORKERS", 4), len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda args: _process_chunk(args[1], args[0], len(chunks), extractor, config),
+                enumerate(chunks, 1),
+            )
+            for ents, r in results:
+                all_ents.extend(ents)
                 all_rels.extend(r)
         # dedup entities
-        deduped_ents, seen = [], set()
+        # (erstes Vorkommen gewinnt, Reihenfolge bleibt erhalten)
+        ent_map = {}
         for e in all_ents:
             k = e.get("wikipedia_url") or e.get("name")
-            if k and k not in seen:
-                seen.add(k)
-                deduped_ents.append(e)
+            if k:
+                ent_map.setdefault(k, e)
+        deduped_ents = list(ent_map.values())
         # dedup relationships explicit>implicit
         rel_map = {}
         for r in all_rels:
-            k = (r.get("subject"), r.get("predicate"), r.get("object"))
-            if k in rel_map:
-                ex = rel_map[k]
-                if ex.get("inferred") == "implicit" and r.get("inferred") == "explicit":
-                    rel_map[k] = r
-            else:
+            k = _triple_key(r)
+            ex = rel_map.get(k)
+            if ex is None or (ex.get("inferred") == "implicit" and r.get("inferred") == "explicit"):
                 rel_map[k] = r
         deduped_rels = list(rel_map.values())
         # LLM dedup
@@ -75,133 +258,55 @@ def process_entities(input_text: str, user_config: dict = None):
         # semantic dedup
         deduped_rels = filter_semantically_similar_relationships(deduped_rels, similarity_threshold=0.85)
         # packaging
-        result = {"entities": [], "relationships": deduped_rels}
-        for e in deduped_ents:
-            cit = e.get("citation", input_text)
-            s = input_text.find(cit) if cit != input_text else 0
-            t = s + len(cit) if s != -1 else len(input_text)
-            leg = {"entity": e.get("name", ""),
-                   "details": {"typ": e.get("type", ""),
-                                "inferred": e.get("inferred", "explicit"),
-                                "citation": cit,
-                                "citation_start": s,
-                                "citation_end": t},
-                   "sources": {}}
-            # wikipedia
-            if e.get("wikipedia_url"):
-                ws = leg["sources"].setdefault("wikipedia", {})
-                if e.get("wikipedia_title"):
-                    ws["label"] = e.get("wikipedia_title")
-                else:
-                    # Fallback: derive label from URL
-                    from urllib.parse import unquote
-                    raw = e.get("wikipedia_url").split("/wiki/")[-1].split("#")[0]
-                    title = unquote(raw).replace("_", " ")
-                    ws["label"] = title
-                ws["url"] = e.get("wikipedia_url")
-                if e.get("wikipedia_extract"):
-                    ws["extract"] = e.get("wikipedia_extract")
-                if e.get("wikipedia_categories"):
-                    ws["categories"] = e.get("wikipedia_categories")
-                # Zusätzliche Wikipedia-Details bei ADDITIONAL_DETAILS (flatten)
-                if config.get("ADDITIONAL_DETAILS", False) and e.get("wikipedia_details"):
-                    for key, value in e["wikipedia_details"].items():
-                        ws[key] = value
-            # wikidata
-            if config.get("USE_WIKIDATA", False) and e.get("wikidata_details"):
-                wd_src = leg["sources"].setdefault("wikidata", {})
-                # Basisfelder
-                wd_src["id"] = e["wikidata_details"].get("id", "")
-                if "description" in e["wikidata_details"]:
-                    wd_src["description"] = e["wikidata_details"]["description"]
-                if "types" in e["wikidata_details"]:
-                    wd_src["types"] = e["wikidata_details"]["types"]
-                if e.get("wikidata_url"):
-                    wd_src["url"] = e.get("wikidata_url")
-                if "label" in e["wikidata_details"]:
-                    wd_src["label"] = e["wikidata_details"]["label"]
-                # Zusätzliche Wikidata-Felder bei ADDITIONAL_DETAILS
-                if config.get("ADDITIONAL_DETAILS", False):
-                    for key in ["aliases","instance_of","subclass_of","part_of","has_parts","member_of","gnd_id","isni","official_name","citizenship","citizenships","image_url","website","coordinates","foundation_date","birth_date","death_date","birth_place","death_place","population","area","country","region","founder","parent_company"]:
-                        if key in e["wikidata_details"]:
-                            wd_src[key] = e["wikidata_details"][key]
-            # dbpedia
-            if config.get("USE_DBPEDIA", False):
-                if e.get("dbpedia_info"):
-                    bd = e["dbpedia_info"]
-                    db_src = leg["sources"].setdefault("dbpedia", {})
-                    # Basisfelder
-                    db_src["resource_uri"] = bd.get("resource_uri", bd.get("uri", ""))
-                    if "endpoint" in bd:
-                        db_src["endpoint"] = bd["endpoint"]
-                    if "language" in bd:
-                        db_src["language"] = bd["language"]
-                    if "label" in bd:
-                        db_src["label"] = bd["label"]
-                    if "abstract" in bd:
-                        db_src["abstract"] = bd["abstract"]
-                    if "types" in bd:
-                        db_src["types"] = bd["types"]
-                    if "same_as" in bd:
-                        db_src["same_as"] = bd["same_as"]
-                    if "subject" in bd:
-                        db_src["subjects"] = bd["subject"]
-                    elif "subjects" in bd:
-                        db_src["subjects"] = bd["subjects"]
-                    if "part_of" in bd:
-                        db_src["part_of"] = bd["part_of"]
-                    if "has_parts" in bd:
-                        db_src["has_parts"] = bd["has_parts"]
-                    if "member_of" in bd:
-                        db_src["member_of"] = bd["member_of"]
-                    if "category" in bd:
-                        db_src["categories"] = bd["category"]
-                    elif "categories" in bd:
-                        db_src["categories"] = bd["categories"]
-                    # Zusätzliche DBpedia-Felder bei ADDITIONAL_DETAILS
-                    if config.get("ADDITIONAL_DETAILS", False):
-                        for key in ["comment","homepage","thumbnail","depiction","lat","long","birth_date","death_date","birth_place","death_place","population","area","country","region","foundation_date","founder","parent_company","current_member","former_member","dbp_part_of","dbp_member_of"]:
-                            if key in bd:
-                                if key in ("lat","long"):
-                                    if "coordinates" not in db_src:
-                                        db_src["coordinates"] = {}
-                                    coord_key = "latitude" if key == "lat" else "longitude"
-                                    db_src["coordinates"][coord_key] = bd[key]
-                                else:
-                                    db_src[key] = bd[key]
-                elif e.get("dbpedia_uri"):
-                    db_src = leg["sources"].setdefault("dbpedia", {})
-                    db_src["resource_uri"] = e.get("dbpedia_uri")
-                    db_src["language"] = e.get("dbpedia_language")
-            result["entities"].append(leg)
+        citation_spans = _citation_spans(input_text, deduped_ents)
+        result = {"entities": [_to_legacy(e, input_text, citation_spans, config) for e in deduped_ents],
+                  "relationships": deduped_rels}
         # Knowledge Graph Completion for chunked input
         if config.get("ENABLE_KGC", False):
             rounds = config.get("KGC_ROUNDS", 3)
             logging.info("[orchestrator] KGC for chunked: Rounds=%d", rounds)
-            ex_map = {(r["subject"], r["predicate"], r["object"]): r for r in result["relationships"]}
-            for rnd in range(1, rounds + 1):
-                logging.info("[orchestrator] KGC round %d/%d (chunked)", rnd, rounds)
-                cfg = config.copy()
-                cfg["existing_relationships"] = list(ex_map.values())
-                new_rels = infer_entity_relationships(input_text, deduped_ents, cfg)
-                added = 0
-                for nr in new_rels:
-                    k = (nr.get("subject"), nr.get("predicate"), nr.get("object"))
-                    if k not in ex_map:
-                        ex_map[k] = nr
-                        added += 1
-                logging.info("[orchestrator] KGC round %d (chunked): %d new relationships", rnd, added)
-            final_rels = list(ex_map.values())
-            final_rels = list({(r["subject"], r["predicate"], r["object"]): r for r in final_rels}.values())
-            final_rels = deduplicate_relationships_llm(final_rels, deduped_ents, config)
-            final_rels = filter_semantically_similar_relationships(final_rels, similarity_threshold=0.85)
-            result["relationships"] = final_rels
+            ex_map = {_triple_key(r): r for r in result["relationships"]}
+            # Eine Liste über alle Runden fortschreiben statt sie pro Runde neu aufzubauen
+            kgc_rels = list(ex_map.values())
+            total_added = 0
+            # config nicht pro Runde kopieren: kgc_rels wächst in-place, der Schlüssel wird danach entfernt
+            config["existing_relationships"] = kgc_rels
+            try:
+                for rnd in range(1, rounds + 1):
+                    logging.info("[orchestrator] KGC round %d/%d (chunked)", rnd, rounds)
+                    new_rels = infer_entity_relationships(input_text, deduped_ents, config)
+                    added = 0
+                    for nr in new_rels:
+                        k = _triple_key(nr)
+                        if k not in ex_map:
+                            ex_map[k] = nr
+                            kgc_rels.append(nr)
+                            added += 1
+                    total_added += added
+                    logging.info("[orchestrator] KGC round %d (chunked): %d new relationships", rnd, added)
+                    # Graph konvergiert: weitere Runden liefern erfahrungsgemäß keine neuen Tripel mehr
+                    if added < config.get("KGC_MIN_NEW", 1):
+                        logging.info("[orchestrator] KGC converged at round %d (chunked)", rnd)
+                        break
+            finally:
+                config.pop("existing_relationships", None)
+            # Bereits deduplizierte Beziehungen nur erneut filtern, wenn KGC neue Tripel ergänzt hat;
+            # unveränderte Paare werden von der LLM-Dedup aus dem Cache beantwortet
+            if total_added:
+                final_rels = kgc_rels
+                final_rels = deduplicate_relationships_llm(final_rels, deduped_ents, config)
+                final_rels = filter_semantically_similar_relationships(final_rels, similarity_threshold=0.85)
+                result["relationships"] = final_rels
+            else:
+                logging.info("[orchestrator] KGC (chunked): no new relationships, skipping second deduplication")
         # visualization
         if config.get("ENABLE_GRAPH_VISUALIZATION", False):
             if not result.get("relationships"):
                 logging.error("[orchestrator] Graph visualization aborted: no relationships available.")
                 result["knowledgegraph_visualisation"] = []
             else:
+                # networkx/matplotlib/pyvis erst bei aktivierter Visualisierung laden
+                from entityextractor.core.visualization_api import visualize_graph
                 vis = visualize_graph(result, config)
                 result["knowledgegraph_visualisation"] = [{"static": vis.get("png"), "interactive": vis.get("html")}]
         logging.info("[orchestrator] Chunking flow done in %.2f sec", time.time()-start)
@@ -327,10 +432,8 @@ def process_entities(input_text: str, user_config: dict = None):
         return result
 
     # single-pass flow: extract or generate
-    if mode == "generate":
-        ents = generate_and_link(input_text, config)
-    else:
-        ents = extract_and_link(input_text, config)
+    extract_and_link_fn = generate_and_link if mode == "generate" else extract_and_link
+    ents = extract_and_link_fn(input_text, config)
     rels = []
     if config.get("RELATION_EXTRACTION", False):
         logging.info("[orchestrator] Starting single-pass relation extraction")
@@ -345,133 +448,54 @@ def process_entities(input_text: str, user_config: dict = None):
         # semantic dedup
         rels = filter_semantically_similar_relationships(rels, similarity_threshold=0.85)
     # package entities and relationships
-    result = {"entities": [], "relationships": rels}
-    for e in ents:
-        cit = e.get("citation", input_text)
-        s = input_text.find(cit) if cit != input_text else 0
-        t = s + len(cit) if s != -1 else len(input_text)
-        leg = {"entity": e.get("name",""),
-               "details": {"typ": e.get("type",""),
-                            "inferred": e.get("inferred","explicit"),
-                            "citation": cit,
-                            "citation_start": s,
-                            "citation_end": t},
-               "sources": {}}
-        if e.get("wikipedia_url"):
-            ws = leg["sources"].setdefault("wikipedia", {})
-            if e.get("wikipedia_title"):
-                ws["label"] = e.get("wikipedia_title")
-            else:
-                # Fallback: derive label from URL
-                from urllib.parse import unquote
-                raw = e.get("wikipedia_url").split("/wiki/")[-1].split("#")[0]
-                title = unquote(raw).replace("_", " ")
-                ws["label"] = title
-            ws["url"] = e.get("wikipedia_url")
-            if e.get("wikipedia_extract"):
-                ws["extract"] = e.get("wikipedia_extract")
-            if e.get("wikipedia_categories"):
-                ws["categories"] = e.get("wikipedia_categories")
-            # Zusätzliche Wikipedia-Details bei ADDITIONAL_DETAILS (flatten)
-            if config.get("ADDITIONAL_DETAILS", False) and e.get("wikipedia_details"):
-                for key, value in e["wikipedia_details"].items():
-                    ws[key] = value
-        # Wikidata-Quellen auch im Single-Pass
-        if config.get("USE_WIKIDATA", False) and e.get("wikidata_details"):
-            wd_src = leg["sources"].setdefault("wikidata", {})
-            # Basisfelder
-            wd_src["id"] = e["wikidata_details"].get("id", "")
-            if "description" in e["wikidata_details"]:
-                wd_src["description"] = e["wikidata_details"]["description"]
-            if "types" in e["wikidata_details"]:
-                wd_src["types"] = e["wikidata_details"]["types"]
-            if e.get("wikidata_url"):
-                wd_src["url"] = e.get("wikidata_url")
-            if "label" in e["wikidata_details"]:
-                wd_src["label"] = e["wikidata_details"]["label"]
-            # Zusätzliche Wikidata-Felder bei ADDITIONAL_DETAILS
-            if config.get("ADDITIONAL_DETAILS", False):
-                for key in ["aliases","instance_of","subclass_of","part_of","has_parts","member_of","gnd_id","isni","official_name","citizenship","citizenships","image_url","website","coordinates","foundation_date","birth_date","death_date","birth_place","death_place","population","area","country","region","founder","parent_company"]:
-                    if key in e["wikidata_details"]:
-                        wd_src[key] = e["wikidata_details"][key]
-        # DBpedia-Quellen auch im Single-Pass
-        if config.get("USE_DBPEDIA", False):
-            if e.get("dbpedia_info"):
-                bd = e["dbpedia_info"]
-                db_src = leg["sources"].setdefault("dbpedia", {})
-                # Basisfelder
-                db_src["resource_uri"] = bd.get("resource_uri", bd.get("uri", ""))
-                if "endpoint" in bd:
-                    db_src["endpoint"] = bd["endpoint"]
-                if "language" in bd:
-                    db_src["language"] = bd["language"]
-                if "label" in bd:
-                    db_src["label"] = bd["label"]
-                if "abstract" in bd:
-                    db_src["abstract"] = bd["abstract"]
-                if "types" in bd:
-                    db_src["types"] = bd["types"]
-                if "same_as" in bd:
-                    db_src["same_as"] = bd["same_as"]
-                if "subject" in bd:
-                    db_src["subjects"] = bd["subject"]
-                elif "subjects" in bd:
-                    db_src["subjects"] = bd["subjects"]
-                if "part_of" in bd:
-                    db_src["part_of"] = bd["part_of"]
-                if "has_parts" in bd:
-                    db_src["has_parts"] = bd["has_parts"]
-                if "member_of" in bd:
-                    db_src["member_of"] = bd["member_of"]
-                if "category" in bd:
-                    db_src["categories"] = bd["category"]
-                elif "categories" in bd:
-                    db_src["categories"] = bd["categories"]
-                # Zusätzliche DBpedia-Felder bei ADDITIONAL_DETAILS
-                if config.get("ADDITIONAL_DETAILS", False):
-                    for key in ["comment","homepage","thumbnail","depiction","lat","long","birth_date","death_date","birth_place","death_place","population","area","country","region","foundation_date","founder","parent_company","current_member","former_member","dbp_part_of","dbp_member_of"]:
-                        if key in bd:
-                            if key in ("lat","long"):
-                                if "coordinates" not in db_src:
-                                    db_src["coordinates"] = {}
-                                coord_key = "latitude" if key == "lat" else "longitude"
-                                db_src["coordinates"][coord_key] = bd[key]
-                            else:
-                                db_src[key] = bd[key]
-            elif e.get("dbpedia_uri"):
-                db_src = leg["sources"].setdefault("dbpedia", {})
-                db_src["resource_uri"] = e.get("dbpedia_uri")
-                db_src["language"] = e.get("dbpedia_language")
-        result["entities"].append(leg)
+    citation_spans = _citation_spans(input_text, ents)
+    result = {"entities": [_to_legacy(e, input_text, citation_spans, config) for e in ents],
+              "relationships": rels}
     # Knowledge Graph Completion (KGC) at end
     if config.get("ENABLE_KGC", False):
         rounds = config.get("KGC_ROUNDS", 3)
         logging.info("[orchestrator] KGC final: Rounds=%d", rounds)
-        ex_map = {(r["subject"], r["predicate"], r["object"]): r for r in result["relationships"]}
-        for rnd in range(1, rounds + 1):
-            logging.info("[orchestrator] KGC round %d/%d", rnd, rounds)
-            cfg = config.copy()
-            cfg["existing_relationships"] = list(ex_map.values())
-            new_rels = infer_entity_relationships(input_text, ents, cfg)
-            added = 0
-            for nr in new_rels:
-                k = (nr.get("subject"), nr.get("predicate"), nr.get("object"))
-                if k not in ex_map:
-                    ex_map[k] = nr
-                    added += 1
-            logging.info("[orchestrator] KGC round %d: %d new relationships", rnd, added)
-        # after all rounds, deduplicate
-        final_rels = list(ex_map.values())
-        final_rels = list({(r["subject"], r["predicate"], r["object"]): r for r in final_rels}.values())
-        final_rels = deduplicate_relationships_llm(final_rels, ents, config)
-        final_rels = filter_semantically_similar_relationships(final_rels, similarity_threshold=0.85)
-        result["relationships"] = final_rels
+        ex_map = {_triple_key(r): r for r in result["relationships"]}
+        # Eine Liste über alle Runden fortschreiben statt sie pro Runde neu aufzubauen
+        kgc_rels = list(ex_map.values())
+        total_added = 0
+        # config nicht pro Runde kopieren: kgc_rels wächst in-place, der Schlüssel wird danach entfernt
+        config["existing_relationships"] = kgc_rels
+        try:
+            for rnd in range(1, rounds + 1):
+                logging.info("[orchestrator] KGC round %d/%d", rnd, rounds)
+                new_rels = infer_entity_relationships(input_text, ents, config)
+                added = 0
+                for nr in new_rels:
+                    k = _triple_key(nr)
+                    if k not in ex_map:
+                        ex_map[k] = nr
+                        kgc_rels.append(nr)
+                        added += 1
+                total_added += added
+                logging.info("[orchestrator] KGC round %d: %d new relationships", rnd, added)
+                # Graph konvergiert: weitere Runden liefern erfahrungsgemäß keine neuen Tripel mehr
+                if added < config.get("KGC_MIN_NEW", 1):
+                    logging.info("[orchestrator] KGC converged at round %d", rnd)
+                    break
+        finally:
+            config.pop("existing_relationships", None)
+        # after all rounds, deduplicate only if KGC added triples (unchanged pairs hit the dedup cache)
+        if total_added:
+            final_rels = kgc_rels
+            final_rels = deduplicate_relationships_llm(final_rels, ents, config)
+            final_rels = filter_semantically_similar_relationships(final_rels, similarity_threshold=0.85)
+            result["relationships"] = final_rels
+        else:
+            logging.info("[orchestrator] KGC: no new relationships, skipping second deduplication")
     # visualization if enabled
     if config.get("ENABLE_GRAPH_VISUALIZATION", False):
         if not result.get("relationships"):
             logging.error("[orchestrator] Graph visualization aborted: no relationships available.")
             result["knowledgegraph_visualisation"] = []
         else:
+            # networkx/matplotlib/pyvis erst bei aktivierter Visualisierung laden
+            from entityextractor.core.visualization_api import visualize_graph
             vis = visualize_graph(result, config)
             result["knowledgegraph_visualisation"] = [{"static": vis.get("png"), "interactive": vis.get("html")}]
     logging.info("[orchestrator] Single-pass done in %.2f sec", time.time()-start)
@@ -595,3 +619,14 @@ def process_entities(input_text: str, user_config: dict = None):
         structured_refs = [{"number": idx+1, "url": url} for idx, url in enumerate(refs)]
         result["compendium"] = {"text": comp_text, "references": structured_refs}
     return result
+
+
+def process_entities_json(input_text: str, user_config: dict = None) -> bytes:
+    """
+    Like process_entities, but returns the result serialized as UTF-8 JSON bytes
+    (e.g. for HTTP APIs). Uses orjson if installed, otherwise the standard json module.
+    """
+    result = process_entities(input_text, user_config)
+    if orjson is not None:
+        return orjson.dumps(result)
+    return json.dumps(result, ensure_ascii=False).encode("utf-8")
@@ -4,6 +4,10 @@ relationship_api.py
 Provides an interface for relationship inference.
 """
 
-from entityextractor.core.relationship_inference import infer_entity_relationships
+from entityextractor.core.relationship_inference import (
+    infer_entity_relationships,
+    infer_entity_relationships_batch,
+    infer_entity_relationships_batch_api
+)
 
-__all__ = ["infer_entity_relationships"]
+__all__ = ["infer_entity_relationships", "infer_entity_relationships_batch", "infer_entity_relationships_batch_api"]
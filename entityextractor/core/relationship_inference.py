@@ -5,13 +5,27 @@ Dieses Modul ermöglicht die Inferenz von Beziehungen zwischen Entitäten
 basierend auf dem Originaltext und den extrahierten Entitäten.
 """
 
+import copy
 import json
 import time
 import logging
-from openai import OpenAI
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson  # optional: schnelleres JSON-Parsing
+except ImportError:
+    orjson = None
+
 from entityextractor.config.settings import get_config
 from entityextractor.utils.logging_utils import configure_logging
-from entityextractor.services.openai_service import save_relationship_training_data
+from entityextractor.services.openai_service import (
+    get_openai_client, save_relationship_training_data, run_chat_completion_batch, cached_chat_completion,
+    get_text_embedding
+)
+from entityextractor.utils.semantic_cache import SemanticCache
+from entityextractor.utils.inferred_utils import INFERRED_MAP, normalize_inferred
 from entityextractor.prompts.relationship_prompts import (
     get_explicit_system_prompt_extract_en,
     get_explicit_user_prompt_extract_en,
@@ -25,6 +39,10 @@ from entityextractor.prompts.relationship_prompts import (
     get_implicit_user_prompt_en,
     get_implicit_system_prompt_de,
     get_implicit_user_prompt_de,
+    get_combined_system_prompt_en,
+    get_combined_user_prompt_en,
+    get_combined_system_prompt_de,
+    get_combined_user_prompt_de,
     get_kgc_system_prompt_en,
     get_kgc_user_prompt_en,
     get_kgc_system_prompt_de,
@@ -43,6 +61,198 @@ DEFAULT_CONFIG = {
     "RELATION_EXTRACTION": False
 }
 
+# Prozessweiter semantischer Cache für Beziehungen nahezu gleicher Texte (SEMANTIC_CACHE_ENABLED)
+_SEMANTIC_CACHE = SemanticCache()
+
+def _remember_relationships(config, scope, embedding, relationships):
+    """
+    Legt das Ergebnis im semantischen Cache ab (falls ein Embedding vorliegt) und gibt es unverändert zurück.
+    """
+    if embedding is not None:
+        _SEMANTIC_CACHE.max_entries = config.get("SEMANTIC_CACHE_MAX_ENTRIES", 1000)
+        _SEMANTIC_CACHE.set(scope, embedding, copy.deepcopy(relationships))
+    return relationships
+
+def _entity_to_name_type(entity):
+    """
+    Liefert (Name, Typ) einer Entität aus den möglichen Strukturen; leere Strings, falls nicht vorhanden.
+    """
+    # Wikipedia-Label hat Vorrang vor den direkten Feldern
+    wikipedia = (entity.get("sources") or {}).get("wikipedia") or {}
+    name = wikipedia.get("label") or entity.get("entity") or entity.get("name", "")
+    entity_type = entity.get("entity_type") or entity.get("type") or (entity.get("details") or {}).get("typ", "")
+    return name, entity_type
+
+def _prepare_entity_info(entities):
+    """
+    Extrahiert Name und Typ der Entitäten für die Prompts.
+    
+    Returns:
+        Tuple (entity_info, entity_type_map, entity_inferred_map)
+    """
+    names_types = [_entity_to_name_type(entity) for entity in entities]
+    # Typ- und Inferenz-Map in einem Durchlauf mit demselben kanonischen Namen aufbauen;
+    # jede Entität wird nur einmal an das LLM übergeben (erstes Vorkommen gewinnt)
+    entity_type_map = {}
+    entity_inferred_map = {}
+    skipped = 0
+    for (name, entity_type), entity in zip(names_types, entities):
+        if not (name and entity_type):
+            skipped += 1
+        if not name:
+            continue
+        # Namen und Typen internieren: Maps, Prompts und Beziehungen teilen dasselbe String-Objekt
+        name = sys.intern(name)
+        if entity_type:
+            entity_type = sys.intern(entity_type)
+        if name not in entity_inferred_map:
+            entity_inferred_map[name] = entity.get("inferred", "explizit")
+        if entity_type and name not in entity_type_map:
+            entity_type_map[name] = entity_type
+    entity_info = [{"name": name, "type": entity_type} for name, entity_type in entity_type_map.items()]
+    
+    if skipped:
+        logging.warning("%d Entitäten ohne Namen oder Typ für die Beziehungsextraktion übersprungen", skipped)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        for (name, entity_type), entity in zip(names_types, entities):
+            logging.debug("  - %s (%s) aus %s", name, entity_type, list(entity.keys()))
+    logging.info("Extrahierte %d/%d Entitäten für Beziehungsextraktion", len(entity_info), len(entities))
+    return entity_info, entity_type_map, entity_inferred_map
+
+# Geschätzte Ausgabe-Tokens je Beziehungszeile (subject; predicate; object; explicit|implicit)
+_TOKENS_PER_RELATION = 40
+
+def _relation_max_tokens(config, relation_kinds=1):
+    """
+    Ausgabebudget eines Beziehungsprompts: wächst mit MAX_RELATIONS je angefragter Beziehungsart,
+    damit lange Antworten nicht abgeschnitten werden (mindestens 2000, höchstens MAX_TOKENS).
+    """
+    budget = config.get("MAX_RELATIONS", 15) * relation_kinds * _TOKENS_PER_RELATION
+    return min(max(2000, budget), config.get("MAX_TOKENS", 16000))
+
+def _compact_json(value):
+    """
+    Serialisiert Prompt-Daten kompakt (ohne Einrückung und Leerzeichen), um Prompt-Tokens zu sparen.
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+def _explicit_prompts(mode, language, text, entity_info_json, max_relations):
+    """
+    Wählt System- und User-Prompt des ersten Aufrufs (extract: nur explizite, generate: alle Beziehungen).
+    """
+    # Unified extract-first prompt
+    if mode == "generate":
+        # All relationships mode
+        if language == "en":
+            system_prompt_explicit = get_explicit_system_prompt_all_en()
+            user_msg_explicit = get_explicit_user_prompt_all_en(text, entity_info_json, max_relations)
+        else:
+            system_prompt_explicit = get_explicit_system_prompt_all_de()
+            user_msg_explicit = get_explicit_user_prompt_all_de(text, entity_info_json, max_relations)
+    else:
+        # Explicit-only mode
+        if language == "en":
+            system_prompt_explicit = get_explicit_system_prompt_extract_en()
+            user_msg_explicit = get_explicit_user_prompt_extract_en(text, entity_info_json, max_relations)
+        else:
+            system_prompt_explicit = get_explicit_system_prompt_extract_de()
+            user_msg_explicit = get_explicit_user_prompt_extract_de(text, entity_info_json, max_relations)
+    return system_prompt_explicit, user_msg_explicit
+
+def _combined_prompts(language, text, entity_info_json, max_relations):
+    """
+    Wählt System- und User-Prompt für explizite und implizite Beziehungen in einem Aufruf.
+    """
+    if language == "en":
+        return get_combined_system_prompt_en(), get_combined_user_prompt_en(text, entity_info_json, max_relations)
+    return get_combined_system_prompt_de(), get_combined_user_prompt_de(text, entity_info_json, max_relations)
+
+def _implicit_prompts(language, text, entity_info_json, explicit_relationships, max_relations):
+    """
+    Wählt System- und User-Prompt des zweiten Aufrufs; die expliziten Beziehungen werden übergeben.
+    """
+    explicit_rels_json = _compact_json(explicit_relationships)
+    if language == "en":
+        return (get_implicit_system_prompt_en(),
+                get_implicit_user_prompt_en(text, entity_info_json, explicit_rels_json, max_relations))
+    return (get_implicit_system_prompt_de(),
+            get_implicit_user_prompt_de(text, entity_info_json, explicit_rels_json, max_relations))
+
+def _validate_relationships(relationships, inferred_status, entity_type_map, entity_inferred_map):
+    """
+    Behält vollständige Tripel zwischen bekannten Entitäten und ergänzt Typ- und Inferenzfelder.
+    """
+    # Lookups einmal binden; gültig sind nur vollständige Tripel zwischen Entitäten mit bekanntem Typ
+    type_of = entity_type_map.get
+    inferred_of = entity_inferred_map.get
+    return [
+        {
+            **rel,
+            "inferred": inferred_status,
+            "subject_type": type_of(rel["subject"]),
+            "object_type": type_of(rel["object"]),
+            "subject_inferred": inferred_of(rel["subject"], "explicit"),
+            "object_inferred": inferred_of(rel["object"], "explicit")
+        }
+        for rel in relationships
+        if "subject" in rel and "predicate" in rel and "object" in rel
+        and type_of(rel["subject"]) and type_of(rel["object"])
+    ]
+
+def _merge_relationships(explicit_relationships, implicit_relationships):
+    """
+    Führt explizite und implizite Beziehungen zusammen; jedes (Subjekt, Prädikat, Objekt) bleibt einmal erhalten,
+    explizite Beziehungen haben Vorrang.
+    """
+    seen = set()
+    merged = []
+    for rel in explicit_relationships + implicit_relationships:
+        key = (rel["subject"], rel["predicate"], rel["object"])
+        if key not in seen:
+            seen.add(key)
+            merged.append(rel)
+    return merged
+
+def _parse_relationships_with_entity_names(raw_json, entity_type_map):
+    """
+    Parst eine Antwort und gleicht Entitätsnamen ohne Groß-/Kleinschreibung an die Entitätenliste an.
+    """
+    relationships = extract_json_relationships(raw_json)
+    # Normalize entity names case-insensitively to match extracted entities
+    lower_to_name = {name.lower(): name for name in entity_type_map.keys()}
+    for rel in relationships:
+        subj_lower = rel.get("subject", "").lower()
+        if subj_lower in lower_to_name:
+            rel["subject"] = lower_to_name[subj_lower]
+        obj_lower = rel.get("object", "").lower()
+        if obj_lower in lower_to_name:
+            rel["object"] = lower_to_name[obj_lower]
+    return relationships
+
+def _validate_explicit_relationships(raw_json, inferred_status, entity_type_map, entity_inferred_map):
+    """
+    Parst die Antwort des ersten Prompts, gleicht Entitätsnamen ohne Groß-/Kleinschreibung ab und validiert.
+    """
+    relationships = _parse_relationships_with_entity_names(raw_json, entity_type_map)
+    return _validate_relationships(relationships, inferred_status, entity_type_map, entity_inferred_map)
+
+def _validate_combined_relationships(raw_json, entity_type_map, entity_inferred_map):
+    """
+    Teilt die Antwort des kombinierten Prompts nach ihrer Kennzeichnung auf und validiert beide Teile.
+    
+    Returns:
+        Tuple (explizite Beziehungen, implizite Beziehungen)
+    """
+    relationships = _parse_relationships_with_entity_names(raw_json, entity_type_map)
+    # Kennzeichnung normalisieren (implizit, Implicit, ...); ohne erkennbare Kennzeichnung gilt eine
+    # Beziehung als explizit (wie beim ersten Prompt des zweistufigen Ablaufs)
+    for rel in relationships:
+        normalize_inferred(rel, "inferred", default="explicit")
+    explicit = [rel for rel in relationships if rel["inferred"] == "explicit"]
+    implicit = [rel for rel in relationships if rel["inferred"] == "implicit"]
+    return (_validate_relationships(explicit, "explicit", entity_type_map, entity_inferred_map),
+            _validate_relationships(implicit, "implicit", entity_type_map, entity_inferred_map))
+
 def infer_entity_relationships(text, entities, user_config=None):
     """
     Inferiert Beziehungen zwischen Entitäten basierend auf dem Originaltext.
@@ -78,14 +288,13 @@ def infer_entity_relationships(text, entities, user_config=None):
     # OpenAI API-Schlüssel abrufen
     api_key = config.get("OPENAI_API_KEY")
     if not api_key:
-        import os
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             logging.error("Kein OpenAI API-Schlüssel angegeben")
             return []
     
-    # OpenAI-Client erstellen
-    client = OpenAI(api_key=api_key)
+    # Gemeinsamen OpenAI-Client verwenden (Verbindungen bleiben über Aufrufe hinweg offen)
+    client = get_openai_client(api_key)
     
     # Modell und Sprache abrufen
     model = config.get("MODEL", "gpt-4.1-mini")
@@ -95,73 +304,31 @@ def infer_entity_relationships(text, entities, user_config=None):
     max_relations = config.get("MAX_RELATIONS", 15)
     
     # Entitätsnamen und Typen extrahieren
-    entity_info = []
-    logging.info(f"Verarbeite {len(entities)} Entitäten für Beziehungsextraktion")
-    
-    for i, entity in enumerate(entities):
-        # Überprüfe die Struktur der Entität für Debugging
-        logging.info(f"Verarbeite Entität {i+1}: {entity.keys()}")
-        
-        # Versuche, den Namen und Typ aus verschiedenen möglichen Strukturen zu extrahieren
-        entity_name = ""
-        entity_type = ""
-        
-        # Direkte Felder in der Entität
-        if "entity" in entity:
-            entity_name = entity["entity"]
-        elif "name" in entity:
-            entity_name = entity["name"]
-            
-        if "entity_type" in entity:
-            entity_type = entity["entity_type"]
-        elif "type" in entity:
-            entity_type = entity["type"]
-        elif "details" in entity and "typ" in entity["details"]:
-            entity_type = entity["details"]["typ"]
-        
-        # Wikipedia-Label verwenden, falls vorhanden
-        if "sources" in entity and "wikipedia" in entity["sources"]:
-            if "label" in entity["sources"]["wikipedia"]:
-                entity_name = entity["sources"]["wikipedia"]["label"]
-        
-        # Nur hinzufügen, wenn Name und Typ vorhanden sind
-        if entity_name and entity_type:
-            entity_info.append({"name": entity_name, "type": entity_type})
-            logging.info(f"  - Extrahiert: {entity_name} ({entity_type})")
-        else:
-            logging.warning(f"  - Konnte keinen Namen oder Typ für Entität {i+1} extrahieren: {entity}")
-    
-    logging.info(f"Extrahierte {len(entity_info)} Entitäten für Beziehungsextraktion")
-    
-    # Erstelle ein Dictionary für schnellen Zugriff auf Entitätstypen
-    entity_type_map = {entity['name']: entity['type'] for entity in entity_info}
-    logging.info(f"Erstellt Entitätstyp-Map mit {len(entity_type_map)} Einträgen")
-    
-    # Mappt jeden Entitätsnamen auf seinen Inferenzstatus
-    entity_inferred_map = {(e.get("entity") or e.get("name", "")): e.get("inferred", "explizit") for e in entities}
-    logging.info(f"Erstellt Entität-Inferenz-Map mit {len(entity_inferred_map)} Einträgen")
+    entity_info, entity_type_map, entity_inferred_map = _prepare_entity_info(entities)
+    # Einmal serialisiert, von allen Prompts dieses Aufrufs gemeinsam verwendet
+    entity_info_json = _compact_json(entity_info)
 
     # KGC-Modus: nur neue implizite Beziehungen basierend auf bestehenden generieren
     existing_rels = config.get("existing_relationships")
-    allowed_entities = {e.get("entity") or e.get("name", "") for e in entities}
+    allowed_entities = entity_inferred_map.keys()
     if config.get("ENABLE_KGC", False) and existing_rels is not None:
         logging.info(f"Starte Knowledge Graph Completion-Inferenz: {len(existing_rels)} bestehende Beziehungen")
         if language == "en":
             system_prompt = get_kgc_system_prompt_en()
-            user_msg = get_kgc_user_prompt_en(text, entity_info, existing_rels, max_relations)
+            user_msg = get_kgc_user_prompt_en(text, entity_info_json, _compact_json(existing_rels), max_relations)
         else:
             system_prompt = get_kgc_system_prompt_de()
-            user_msg = get_kgc_user_prompt_de(text, entity_info, existing_rels, max_relations)
-        response = client.chat.completions.create(
+            user_msg = get_kgc_user_prompt_de(text, entity_info_json, _compact_json(existing_rels), max_relations)
+        raw = cached_chat_completion(
+            client, config,
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_msg}
             ],
             temperature=0.2,
-            max_tokens=2000
+            max_tokens=_relation_max_tokens(config)
         )
-        raw = response.choices[0].message.content.strip()
         new_rels = extract_json_relationships(raw)
         # Nur Beziehungen, die noch nicht vorhanden sind
         existing_keys = {(r["subject"], r["predicate"], r["object"]) for r in existing_rels}
@@ -188,124 +355,102 @@ def infer_entity_relationships(text, entities, user_config=None):
     mode = config.get("MODE", "extract")
     # Implizite Beziehungen aktivieren, wenn ENABLE_RELATIONS_INFERENCE=True
     enable_inference = config.get("ENABLE_RELATIONS_INFERENCE", False)
+    # Im Modus extract mit Inferenz explizite und implizite Beziehungen in einem Aufruf abfragen
+    # (Text und Entitäten nur einmal senden); der zweistufige Ablauf bleibt per Einstellung verfügbar
+    combined = mode != "generate" and enable_inference and not config.get("STRICT_TWO_PASS_INFERENCE", False)
+
+    # Semantischer Cache: Treffer nur bei gleichen Entitäten und Einstellungen und sehr ähnlichem Text
+    semantic_scope = semantic_embedding = None
+    if config.get("SEMANTIC_CACHE_ENABLED", False):
+        semantic_scope = json.dumps(
+            [model, language, mode, combined, enable_inference, max_relations,
+             sorted((e["name"], e["type"]) for e in entity_info)],
+            ensure_ascii=False
+        )
+        try:
+            semantic_embedding = get_text_embedding(client, text, config.get("EMBEDDING_MODEL", "text-embedding-3-small"))
+        except Exception as e:
+            logging.warning(f"Embedding für den semantischen Cache fehlgeschlagen: {e}")
+        if semantic_embedding is not None:
+            cached, similarity = _SEMANTIC_CACHE.get(
+                semantic_scope, semantic_embedding, config.get("SEMANTIC_CACHE_THRESHOLD", 0.95)
+            )
+            if cached is not None:
+                logging.info(f"{len(cached)} Beziehungen aus dem semantischen Cache übernommen (Ähnlichkeit {similarity:.3f})")
+                return copy.deepcopy(cached)
     
-    # Primärer Prompt: extract vs generate
-    # Unified extract-first prompt
-    if mode == "generate":
-        # All relationships mode
-        if language == "en":
-            system_prompt_explicit = get_explicit_system_prompt_all_en()
-            user_msg_explicit = get_explicit_user_prompt_all_en(text, entity_info, max_relations)
-        else:
-            system_prompt_explicit = get_explicit_system_prompt_all_de()
-            user_msg_explicit = get_explicit_user_prompt_all_de(text, entity_info, max_relations)
+    # Primärer Prompt: extract vs generate (bzw. kombiniert)
+    if combined:
+        system_prompt_explicit, user_msg_explicit = _combined_prompts(language, text, entity_info_json, max_relations)
     else:
-        # Explicit-only mode
-        if language == "en":
-            system_prompt_explicit = get_explicit_system_prompt_extract_en()
-            user_msg_explicit = get_explicit_user_prompt_extract_en(text, entity_info, max_relations)
-        else:
-            system_prompt_explicit = get_explicit_system_prompt_extract_de()
-            user_msg_explicit = get_explicit_user_prompt_extract_de(text, entity_info, max_relations)
+        system_prompt_explicit, user_msg_explicit = _explicit_prompts(mode, language, text, entity_info_json, max_relations)
 
     # Log the model being used
-    rel_type = "implizite" if mode == "generate" else "explizite"
+    rel_type = "explizite und implizite" if combined else "implizite" if mode == "generate" else "explizite"
     logging.info(f"Rufe OpenAI API für {rel_type} Beziehungen auf (Modell {model})...")
     logging.debug(f"[REL_EXP] SYSTEM PROMPT:\n{system_prompt_explicit}")
     logging.debug(f"[REL_EXP] USER MSG:\n{user_msg_explicit}")
 
     try:
-        response_explicit = client.chat.completions.create(
+        raw_json_explicit = cached_chat_completion(
+            client, config,
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt_explicit},
                 {"role": "user", "content": user_msg_explicit}
             ],
             temperature=0.2,
-            max_tokens=2000
+            max_tokens=_relation_max_tokens(config, 2 if combined else 1)
         )
-        raw_json_explicit = response_explicit.choices[0].message.content.strip()
         logging.info(f"Erhaltene Antwort (explizit): {raw_json_explicit[:200]}...")
         elapsed_time = time.time() - start_time
         logging.info(f"Erster Prompt abgeschlossen in {elapsed_time:.2f} Sekunden")
 
-        relationships_explicit = extract_json_relationships(raw_json_explicit)
-        # Normalize entity names case-insensitively to match extracted entities
-        lower_to_name = {name.lower(): name for name in entity_type_map.keys()}
-        for rel in relationships_explicit:
-            subj_lower = rel.get("subject", "").lower()
-            if subj_lower in lower_to_name:
-                rel["subject"] = lower_to_name[subj_lower]
-            obj_lower = rel.get("object", "").lower()
-            if obj_lower in lower_to_name:
-                rel["object"] = lower_to_name[obj_lower]
-        valid_relationships_explicit = []
-        for rel in relationships_explicit:
-            if all(k in rel for k in ["subject", "predicate", "object"]):
-                # In generate mode, mark all as implicit; else explicit
-                inferred_status = "implicit" if mode == "generate" else "explicit"
-                rel["inferred"] = inferred_status
-                rel["subject_type"] = entity_type_map.get(rel["subject"], "")
-                rel["object_type"] = entity_type_map.get(rel["object"], "")
-                rel["subject_inferred"] = entity_inferred_map.get(rel["subject"], "explicit")
-                rel["object_inferred"] = entity_inferred_map.get(rel["object"], "explicit")
-                if rel["subject_type"] and rel["object_type"]:
-                    valid_relationships_explicit.append(rel)
-        logging.info(f"{len(valid_relationships_explicit)} gültige {rel_type} Beziehungen gefunden")
-
-        # Wenn keine Inferenz gewünscht: Nur explizite Beziehungen zurückgeben
-        if not enable_inference:
-            # Save relationship training data for explicit relationships if enabled
-            if config.get("COLLECT_TRAINING_DATA", False):
-                save_relationship_training_data(system_prompt_explicit, user_msg_explicit, valid_relationships_explicit, config)
-            return valid_relationships_explicit
-
-        # Implizite Beziehungen (falls enabled)
-        if enable_inference:
-            if language == "en":
-                system_prompt_implicit = get_implicit_system_prompt_en()
-                user_msg_implicit = get_implicit_user_prompt_en(text, entity_info, valid_relationships_explicit, max_relations)
-            else:
-                system_prompt_implicit = get_implicit_system_prompt_de()
-                user_msg_implicit = get_implicit_user_prompt_de(text, entity_info, valid_relationships_explicit, max_relations)
+        if combined:
+            valid_relationships_explicit, valid_relationships_implicit = _validate_combined_relationships(
+                raw_json_explicit, entity_type_map, entity_inferred_map
+            )
+            logging.info(f"{len(valid_relationships_explicit)} gültige explizite und "
+                         f"{len(valid_relationships_implicit)} gültige implizite Beziehungen gefunden")
         else:
-            system_prompt_implicit = None
-            user_msg_implicit = None
+            # In generate mode, mark all as implicit; else explicit
+            valid_relationships_explicit = _validate_explicit_relationships(
+                raw_json_explicit, "implicit" if mode == "generate" else "explicit", entity_type_map, entity_inferred_map
+            )
+            logging.info(f"{len(valid_relationships_explicit)} gültige {rel_type} Beziehungen gefunden")
 
-        logging.info(f"Rufe OpenAI API für implizite Beziehungen auf (Modell {model})...")
-        response_implicit = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt_implicit},
-                {"role": "user", "content": user_msg_implicit}
-            ],
-            temperature=0.2,
-            max_tokens=2000
-        )
-        raw_json_implicit = response_implicit.choices[0].message.content.strip()
-        logging.info(f"Erhaltene Antwort (implizit): {raw_json_implicit[:200]}...")
-
-        relationships_implicit = extract_json_relationships(raw_json_implicit)
-        valid_relationships_implicit = []
-        for rel in relationships_implicit:
-            if all(k in rel for k in ["subject", "predicate", "object"]):
-                rel["inferred"] = "implicit"
-                rel["subject_type"] = entity_type_map.get(rel["subject"], "")
-                rel["object_type"] = entity_type_map.get(rel["object"], "")
-                rel["subject_inferred"] = entity_inferred_map.get(rel["subject"], "explicit")
-                rel["object_inferred"] = entity_inferred_map.get(rel["object"], "explicit")
-                if rel["subject_type"] and rel["object_type"]:
-                    valid_relationships_implicit.append(rel)
-        logging.info(f"{len(valid_relationships_implicit)} gültige implizite Beziehungen gefunden")
+            # Wenn keine Inferenz gewünscht: Nur explizite Beziehungen zurückgeben
+            if not enable_inference:
+                # Save relationship training data for explicit relationships if enabled
+                if config.get("COLLECT_TRAINING_DATA", False):
+                    save_relationship_training_data(system_prompt_explicit, user_msg_explicit, valid_relationships_explicit, config)
+                return _remember_relationships(config, semantic_scope, semantic_embedding, valid_relationships_explicit)
+
+            # Implizite Beziehungen (falls enabled)
+            system_prompt_implicit, user_msg_implicit = _implicit_prompts(
+                language, text, entity_info_json, valid_relationships_explicit, max_relations
+            )
+
+            logging.info(f"Rufe OpenAI API für implizite Beziehungen auf (Modell {model})...")
+            raw_json_implicit = cached_chat_completion(
+                client, config,
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt_implicit},
+                    {"role": "user", "content": user_msg_implicit}
+                ],
+                temperature=0.2,
+                max_tokens=_relation_max_tokens(config)
+            )
+            logging.info(f"Erhaltene Antwort (implizit): {raw_json_implicit[:200]}...")
+
+            valid_relationships_implicit = _validate_relationships(
+                extract_json_relationships(raw_json_implicit), "implicit", entity_type_map, entity_inferred_map
+            )
+            logging.info(f"{len(valid_relationships_implicit)} gültige implizite Beziehungen gefunden")
 
         # --- Zusammenführen (explizit + implizit, keine Duplikate) ---
-        def rel_key(rel):
-            return (rel["subject"], rel["predicate"], rel["object"])
-        all_relationships = {rel_key(rel): rel for rel in valid_relationships_explicit}
-        for rel in valid_relationships_implicit:
-            if rel_key(rel) not in all_relationships:
-                all_relationships[rel_key(rel)] = rel
-        result = list(all_relationships.values())
+        result = _merge_relationships(valid_relationships_explicit, valid_relationships_implicit)
         logging.info(f"Gesamt: {len(result)} Beziehungen")
 
         # === LLM-basierte Deduplizierung ähnlicher Beziehungen pro (Subjekt, Objekt) ===
@@ -334,17 +479,18 @@ def infer_entity_relationships(text, entities, user_config=None):
                 user_prompt = get_user_prompt_dedup_relationship_de(subj, obj, prompt_rels_json)
             # LLM-Call
             try:
-                response = client.chat.completions.create(
+                raw_json = cached_chat_completion(
+                    client, config,
                     model=model,
                     messages=[
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt}
                     ],
                     temperature=0.0,
-                    max_tokens=300
+                    max_tokens=300,
+                    response_format={"type": "json_object"}
                 )
-                raw_json = response.choices[0].message.content.strip()
-                cleaned = extract_json_relationships(raw_json)
+                cleaned = _parse_dedup_response(raw_json)
                 # Rekonstruiere vollständige Relationseinträge
                 for c in cleaned:
                     # Finde Originalrelation mit gleichem Prädikat und inferred
@@ -363,26 +509,195 @@ def infer_entity_relationships(text, entities, user_config=None):
 
         # Trainingsdaten für Beziehungsextraktion speichern
         if config.get("COLLECT_TRAINING_DATA", False):
-            # Explizite Beziehungen
-            save_relationship_training_data(system_prompt_explicit, user_msg_explicit, valid_relationships_explicit, config)
-            # Implizite Beziehungen, falls aktiviert
-            if config.get("ENABLE_RELATIONS_INFERENCE", False):
-                save_relationship_training_data(system_prompt_implicit, user_msg_implicit, valid_relationships_implicit, config)
-        return deduped_result
+            if combined:
+                # Ein Beispiel mit dem kombinierten Prompt und beiden Beziehungsarten
+                save_relationship_training_data(system_prompt_explicit, user_msg_explicit,
+                                                valid_relationships_explicit + valid_relationships_implicit, config)
+            else:
+                # Explizite Beziehungen
+                save_relationship_training_data(system_prompt_explicit, user_msg_explicit, valid_relationships_explicit, config)
+                # Implizite Beziehungen, falls aktiviert
+                if config.get("ENABLE_RELATIONS_INFERENCE", False):
+                    save_relationship_training_data(system_prompt_implicit, user_msg_implicit, valid_relationships_implicit, config)
+        return _remember_relationships(config, semantic_scope, semantic_embedding, deduped_result)
 
     except Exception as e:
         logging.error(f"Fehler beim Aufruf der OpenAI API: {e}")
         return []
 
+def infer_entity_relationships_batch(documents, user_config=None, max_workers=4):
+    """
+    Inferiert Beziehungen für mehrere Dokumente gleichzeitig.
+    
+    Ein Aufruf von infer_entity_relationships wartet fast nur auf die OpenAI API, daher
+    laufen mehrere Dokumente parallel in einem Thread-Pool; max_workers begrenzt die Zahl
+    gleichzeitiger Anfragen (Rate Limits). Innerhalb eines Dokuments bleiben die Prompts
+    sequentiell, da der implizite Prompt die expliziten Beziehungen benötigt.
+    
+    Args:
+        documents: Liste von (text, entities)-Paaren
+        user_config: Optionale Benutzerkonfiguration (für alle Dokumente gleich)
+        max_workers: Maximale Anzahl gleichzeitig verarbeiteter Dokumente
+        
+    Returns:
+        Eine Liste mit der Beziehungsliste je Dokument, in der Reihenfolge der Eingabe
+    """
+    documents = list(documents)
+    workers = max(1, min(max_workers, len(documents)))
+    if workers == 1:
+        return [infer_entity_relationships(text, entities, user_config) for text, entities in documents]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda doc: infer_entity_relationships(doc[0], doc[1], user_config), documents))
+
+def infer_entity_relationships_batch_api(documents, user_config=None, poll_interval=30):
+    """
+    Inferiert Beziehungen für viele Dokumente über die OpenAI Batch API.
+    
+    Alle ersten Prompts werden als ein Batch eingereicht (halbe Kosten, eigenes Rate Limit);
+    bei ENABLE_RELATIONS_INFERENCE wird wie online der kombinierte Prompt verwendet, mit
+    STRICT_TWO_PASS_INFERENCE folgt ein zweiter Batch mit den impliziten Prompts.
+    Die Antworten durchlaufen dieselbe Validierung wie in infer_entity_relationships. KGC und
+    die interne LLM-Deduplizierung entfallen; deduplicate_relationships_llm kann anschließend
+    auf die Ergebnisse angewendet werden. Ein Batch kann bis zu 24 Stunden dauern.
+    
+    Args:
+        documents: Liste von (text, entities)-Paaren
+        user_config: Optionale Benutzerkonfiguration (für alle Dokumente gleich)
+        poll_interval: Sekunden zwischen zwei Statusabfragen eines Batches
+        
+    Returns:
+        Eine Liste mit der Beziehungsliste je Dokument, in der Reihenfolge der Eingabe
+    """
+    config = get_config(user_config)
+    configure_logging(config)
+    documents = list(documents)
+    if not config.get("RELATION_EXTRACTION", False):
+        logging.info("Entity Relationship Inference ist deaktiviert.")
+        return [[] for _ in documents]
+    if not (config.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY")):
+        logging.error("Kein OpenAI API-Schlüssel angegeben")
+        return [[] for _ in documents]
+    
+    model = config.get("MODEL", "gpt-4.1-mini")
+    language = config.get("LANGUAGE", "de")
+    max_relations = config.get("MAX_RELATIONS", 15)
+    mode = config.get("MODE", "extract")
+    
+    def request_body(system_prompt, user_msg, relation_kinds=1):
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_msg}
+            ],
+            "temperature": 0.2,
+            "max_tokens": _relation_max_tokens(config, relation_kinds)
+        }
+    
+    enable_inference = config.get("ENABLE_RELATIONS_INFERENCE", False)
+    combined = mode != "generate" and enable_inference and not config.get("STRICT_TWO_PASS_INFERENCE", False)
+    
+    prepared = [_prepare_entity_info(entities) for _, entities in documents]
+    entity_info_jsons = [_compact_json(entity_info) for entity_info, _, _ in prepared]
+    
+    if combined:
+        # Ein Batch mit dem kombinierten Prompt (explizite und implizite Beziehungen)
+        raw_combined = run_chat_completion_batch({
+            str(i): request_body(*_combined_prompts(language, text, entity_info_json, max_relations), relation_kinds=2)
+            for i, ((text, _), entity_info_json) in enumerate(zip(documents, entity_info_jsons))
+        }, config, poll_interval)
+        results = []
+        for i, (_, entity_type_map, entity_inferred_map) in enumerate(prepared):
+            raw_json = raw_combined.get(str(i))
+            if not raw_json:
+                results.append([])
+                continue
+            results.append(_merge_relationships(*_validate_combined_relationships(raw_json, entity_type_map, entity_inferred_map)))
+        return results
+    
+    # Erster Batch: explizite (bzw. im Modus generate alle) Beziehungen
+    raw_explicit = run_chat_completion_batch({
+        str(i): request_body(*_explicit_prompts(mode, language, text, entity_info_json, max_relations))
+        for i, ((text, _), entity_info_json) in enumerate(zip(documents, entity_info_jsons))
+    }, config, poll_interval)
+    inferred_status = "implicit" if mode == "generate" else "explicit"
+    results = []
+    for i, (_, entity_type_map, entity_inferred_map) in enumerate(prepared):
+        raw_json = raw_explicit.get(str(i))
+        results.append(_validate_explicit_relationships(raw_json, inferred_status, entity_type_map, entity_inferred_map)
+                       if raw_json else [])
+    
+    # Zweiter Batch: implizite Beziehungen auf Basis der expliziten Ergebnisse
+    if enable_inference:
+        raw_implicit = run_chat_completion_batch({
+            str(i): request_body(*_implicit_prompts(language, text, entity_info_json, results[i], max_relations))
+            for i, ((text, _), entity_info_json) in enumerate(zip(documents, entity_info_jsons))
+        }, config, poll_interval)
+        for i, (_, entity_type_map, entity_inferred_map) in enumerate(prepared):
+            raw_json = raw_implicit.get(str(i))
+            if not raw_json:
+                continue
+            results[i] = _merge_relationships(results[i], _validate_relationships(
+                extract_json_relationships(raw_json), "implicit", entity_type_map, entity_inferred_map
+            ))
+    return results
+
+def _parse_dedup_response(raw_json):
+    """
+    Liest die Beziehungsliste einer Deduplizierungsantwort im JSON-Mode ({"relationships": [...]});
+    andere Antwortformate werden wie bisher heuristisch geparst.
+    """
+    try:
+        relationships = json.loads(raw_json)["relationships"]
+        if isinstance(relationships, list) and all(isinstance(rel, dict) and "predicate" in rel for rel in relationships):
+            return relationships
+    except (ValueError, KeyError, TypeError):
+        pass
+    return extract_json_relationships(raw_json)
+
+# Decoder für das objektweise Lesen unvollständiger JSON-Arrays
+_JSON_DECODER = json.JSONDecoder()
+
+def _decode_json_objects(raw_json, start):
+    """
+    Liest die Objekte eines JSON-Arrays ab Position start einzeln und bricht beim ersten
+    fehlerhaften Element ab. Bei einer abgeschnittenen Antwort (max_tokens) bleiben so alle
+    vollständigen Objekte erhalten.
+    """
+    objects = []
+    pos = start
+    length = len(raw_json)
+    while pos < length:
+        # Trennzeichen und Leerraum zwischen den Elementen überspringen
+        while pos < length and raw_json[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= length or raw_json[pos] == "]":
+            break
+        try:
+            obj, pos = _JSON_DECODER.raw_decode(raw_json, pos)
+        except ValueError:
+            break
+        if isinstance(obj, dict):
+            objects.append(obj)
+    return objects
+
 def extract_json_relationships(raw_json):
-    # Try to parse as JSON array
+    # Try to parse as JSON array (Markdown-Fences o.ä. werden per find/rfind ohne Regex abgeschnitten)
     json_start = raw_json.find('[')
     json_end = raw_json.rfind(']') + 1
     if json_start >= 0 and json_end > json_start:
         try:
+            if orjson is not None:
+                return orjson.loads(raw_json[json_start:json_end])
             return json.loads(raw_json[json_start:json_end])
         except Exception:
             pass
+    # Abgeschnittenes oder an einer Stelle fehlerhaftes JSON-Array: vollständige Objekte retten
+    if json_start >= 0 and raw_json[json_start + 1:].lstrip().startswith("{"):
+        relationships = _decode_json_objects(raw_json, json_start + 1)
+        if relationships:
+            logging.warning(f"Unvollständige JSON-Antwort: {len(relationships)} vollständige Beziehungen übernommen")
+            return relationships
     # Fallback: parse semicolon-separated lines 'subject; predicate; object'
     relationships = []
     for line in raw_json.splitlines():
@@ -390,9 +705,16 @@ def extract_json_relationships(raw_json):
         if not line:
             continue
         parts = [p.strip() for p in line.split(';')]
+        # Optionale vierte Spalte des kombinierten Prompts: explicit|implicit (auch explizit|implizit)
+        inferred = INFERRED_MAP.get(parts[-1].lower()) if len(parts) >= 4 else None
+        if inferred:
+            parts.pop()
         if len(parts) >= 3:
             subj, pred, obj = parts[0], parts[1], ';'.join(parts[2:])
-            relationships.append({"subject": subj, "predicate": pred, "object": obj})
+            rel = {"subject": subj, "predicate": pred, "object": obj}
+            if inferred:
+                rel["inferred"] = inferred
+            relationships.append(rel)
         else:
             logging.warning(f"Cannot parse relationship line: {line}")
     return relationships
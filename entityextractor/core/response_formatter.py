@@ -5,7 +5,8 @@ Formats entities, relationships, and optional visualization into the final API o
 """
 import logging
 from typing import List, Dict, Any, Optional
-from entityextractor.core.visualization_api import visualize_graph
+
+from entityextractor.utils.inferred_utils import normalize_inferred
 
 
 def format_response(
@@ -23,8 +24,7 @@ def format_response(
     for ent in entities:
         details = ent.get("details")
         if isinstance(details, dict) and "inferred" in details:
-            inf = details["inferred"].lower()
-            details["inferred"] = "explicit" if inf in ("explizit", "explicit") else "implicit"
+            normalize_inferred(details, "inferred")
 
     # If no relationships and no visualization, return flat list
     has_rels = bool(relationships)
@@ -33,21 +33,17 @@ def format_response(
 
     result: Dict[str, Any] = {"entities": entities}
     if has_rels:
-        # Normalize relationship inferred flags
+        # Normalize relationship inferred flags (subject/object only if present)
         for rel in relationships:
-            inf = rel.get("inferred", "").lower()
-            rel["inferred"] = "explicit" if inf in ("explizit", "explicit") else "implicit"
-            # Normalize subject/object inferred
-            if "subject_inferred" in rel:
-                si = rel["subject_inferred"].lower()
-                rel["subject_inferred"] = "explicit" if si in ("explizit", "explicit") else "implicit"
-            if "object_inferred" in rel:
-                oi = rel["object_inferred"].lower()
-                rel["object_inferred"] = "explicit" if oi in ("explizit", "explicit") else "implicit"
+            normalize_inferred(rel, "inferred")
+            for key in ("subject_inferred", "object_inferred"):
+                if key in rel:
+                    normalize_inferred(rel, key)
         result["relationships"] = relationships
 
     if config.get("ENABLE_GRAPH_VISUALIZATION", False):
         logging.info("[response_formatter] Generating graph visualization...")
+        from entityextractor.core.visualization_api import visualize_graph
         vis = visualize_graph({"entities": entities, "relationships": relationships}, config)
         result["knowledgegraph_visualisation"] = [{"static": vis.get("png"), "interactive": vis.get("html")}]
 
@@ -1,4 +1,20 @@
 import difflib
+from collections import defaultdict
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def _predicates_similar(p1, p2, similarity_threshold):
+    """
+    Prüft, ob zwei Prädikate fuzzy ähnlich sind. Das Ergebnis wird zwischengespeichert,
+    damit der zweite Durchlauf (nach KGC) bereits verglichene Paare nicht erneut berechnet.
+    """
+    matcher = difflib.SequenceMatcher(None, p1, p2)
+    # Günstige Obergrenzen zuerst prüfen, ratio() nur für verbleibende Kandidaten
+    return (matcher.real_quick_ratio() >= similarity_threshold
+            and matcher.quick_ratio() >= similarity_threshold
+            and matcher.ratio() >= similarity_threshold)
+
 
 def filter_semantically_similar_relationships(relationships, similarity_threshold=0.85):
     """
@@ -6,8 +22,6 @@ def filter_semantically_similar_relationships(relationships, similarity_threshol
     deren Prädikat semantisch/fuzzy sehr ähnlich ist.
     Nur das Triple mit dem "prägnantesten" Prädikat (kürzester String) bleibt erhalten.
     """
-    from collections import defaultdict
-    import difflib
     grouped = defaultdict(list)
     for rel in relationships:
         # Gruppieren nach Entity-Paar unabhängig von Richtung
@@ -15,17 +29,28 @@ def filter_semantically_similar_relationships(relationships, similarity_threshol
         grouped[key].append(rel)
     result = []
     for key_set, rels in grouped.items():
+        if len(rels) > 1:
+            # Identische Prädikate landen immer im selben Cluster: vorab auf das erste Vorkommen
+            # reduzieren, damit der paarweise Vergleich nur auf unterschiedlichen Strings läuft
+            first_by_predicate = {}
+            for rel in rels:
+                first_by_predicate.setdefault(rel["predicate"], rel)
+            rels = list(first_by_predicate.values())
+        if len(rels) == 1:
+            result.append(rels[0])
+            continue
         kept = []
         used = set()
         for i, r1 in enumerate(rels):
             if i in used:
                 continue
             similar = [r1]
-            for j, r2 in enumerate(rels):
-                if j <= i or j in used:
+            p1 = r1["predicate"]
+            for j in range(i + 1, len(rels)):
+                if j in used:
                     continue
-                ratio = difflib.SequenceMatcher(None, r1["predicate"], r2["predicate"]).ratio()
-                if ratio >= similarity_threshold:
+                r2 = rels[j]
+                if _predicates_similar(p1, r2["predicate"], similarity_threshold):
                     similar.append(r2)
                     used.add(j)
             # Behalte das kürzeste Prädikat (prägnanteste Formulierung)
@@ -5,30 +5,65 @@ Provides system and user prompts for both English and German.
 
 import json
 
+# System prompts
+SYSTEM_PROMPT_DEDUP_EN = "You are a helpful assistant for deduplicating knowledge graph relationships."
+SYSTEM_PROMPT_DEDUP_DE = "Du bist ein hilfreicher Assistent zur Bereinigung von Knowledge-Graph-Beziehungen."
+
+# User prompt templates (one entity pair)
+USER_PROMPT_DEDUP_EN = (
+    "For the following relationships between subject and object, select the single most relevant relationship that optimally connects the two entities, "
+    "prioritizing 'explicit' over 'implicit'. Only include additional relationships if they represent completely different aspects. "
+    "Consolidate any synonyms or stylistic variants into the selection. "
+    "Subject: '{subject}', Object: '{obj}', Relationships: {prompt_rels_json}. "
+    "Return a JSON array with the chosen relationship(s), including their predicates and inferred fields."
+)
+USER_PROMPT_DEDUP_DE = (
+    "Für die folgenden Beziehungen zwischen Subjekt und Objekt wähle genau eine besonders relevante Beziehung, die die beiden Entitäten optimal verbindet, "
+    "wobei 'explicit' über 'implicit' priorisiert wird. Mehr als eine Beziehung soll nur dann zurückgegeben werden, wenn sie vollständig unterschiedliche Aspekte abbildet. "
+    "Synonyme oder stilistische Varianten sollen zusammengeführt und berücksichtigt werden. "
+    "Subjekt: '{subject}', Objekt: '{obj}', Beziehungen: {prompt_rels_json}. "
+    "Gib ein JSON-Array mit der ausgewählten(n) Beziehung(en) inkl. Prädikat und inferred-Feld zurück."
+)
+
+# User prompt templates (several entity pairs in one request)
+USER_PROMPT_DEDUP_BATCH_EN = (
+    "Below is a list of entity pairs, each with an id, a subject, an object and its relationships. "
+    "For each pair, select the single most relevant relationship that optimally connects the two entities, "
+    "prioritizing 'explicit' over 'implicit'. Only include additional relationships if they represent completely different aspects. "
+    "Consolidate any synonyms or stylistic variants into the selection. "
+    "Pairs: {groups_json}. "
+    "Return a JSON object that maps every id (as a string) to a JSON array with the chosen relationship(s) of that pair, "
+    "including their predicates and inferred fields."
+)
+USER_PROMPT_DEDUP_BATCH_DE = (
+    "Es folgt eine Liste von Entitätenpaaren, jeweils mit id, Subjekt, Objekt und den zugehörigen Beziehungen. "
+    "Wähle für jedes Paar genau eine besonders relevante Beziehung, die die beiden Entitäten optimal verbindet, "
+    "wobei 'explicit' über 'implicit' priorisiert wird. Mehr als eine Beziehung soll nur dann zurückgegeben werden, wenn sie vollständig unterschiedliche Aspekte abbildet. "
+    "Synonyme oder stilistische Varianten sollen zusammengeführt und berücksichtigt werden. "
+    "Paare: {groups_json}. "
+    "Gib ein JSON-Objekt zurück, das jede id (als String) auf ein JSON-Array mit der ausgewählten(n) Beziehung(en) dieses Paares inkl. Prädikat und inferred-Feld abbildet."
+)
+
 
 def get_system_prompt_dedup_en():
-    return "You are a helpful assistant for deduplicating knowledge graph relationships."
+    return SYSTEM_PROMPT_DEDUP_EN
 
 
 def get_user_prompt_dedup_en(subject, obj, prompt_rels_json):
-    return (
-        f"For the following relationships between subject and object, select the single most relevant relationship that optimally connects the two entities, "
-        f"prioritizing 'explicit' over 'implicit'. Only include additional relationships if they represent completely different aspects. "
-        f"Consolidate any synonyms or stylistic variants into the selection. "
-        f"Subject: '{subject}', Object: '{obj}', Relationships: {prompt_rels_json}. "
-        f"Return a JSON array with the chosen relationship(s), including their predicates and inferred fields."
-    )
+    return USER_PROMPT_DEDUP_EN.format(subject=subject, obj=obj, prompt_rels_json=prompt_rels_json)
 
 
 def get_system_prompt_dedup_de():
-    return "Du bist ein hilfreicher Assistent zur Bereinigung von Knowledge-Graph-Beziehungen."
+    return SYSTEM_PROMPT_DEDUP_DE
 
 
 def get_user_prompt_dedup_de(subject, obj, prompt_rels_json):
-    return (
-        f"Für die folgenden Beziehungen zwischen Subjekt und Objekt wähle genau eine besonders relevante Beziehung, die die beiden Entitäten optimal verbindet, "
-        f"wobei 'explicit' über 'implicit' priorisiert wird. Mehr als eine Beziehung soll nur dann zurückgegeben werden, wenn sie vollständig unterschiedliche Aspekte abbildet. "
-        f"Synonyme oder stilistische Varianten sollen zusammengeführt und berücksichtigt werden. "
-        f"Subjekt: '{subject}', Objekt: '{obj}', Beziehungen: {prompt_rels_json}. "
-        f"Gib ein JSON-Array mit der ausgewählten(n) Beziehung(en) inkl. Prädikat und inferred-Feld zurück."
-    )
+    return USER_PROMPT_DEDUP_DE.format(subject=subject, obj=obj, prompt_rels_json=prompt_rels_json)
+
+
+def get_user_prompt_dedup_batch_en(groups_json):
+    return USER_PROMPT_DEDUP_BATCH_EN.format(groups_json=groups_json)
+
+
+def get_user_prompt_dedup_batch_de(groups_json):
+    return USER_PROMPT_DEDUP_BATCH_DE.format(groups_json=groups_json)
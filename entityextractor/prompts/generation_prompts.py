@@ -1,11 +1,14 @@
 """
 Centralized prompts for entity generation via OpenAI.
 Includes system and user prompts for 'generate' mode, English and German.
+
+The system prompts are static (no topic or entity count), so every request shares
+the same prompt prefix and can benefit from OpenAI's automatic prompt caching.
+Topic and entity count are passed in the user message.
 """
 
-def get_system_prompt_generate_en(max_entities, topic):
-    return f"""
-Generate exactly {max_entities} implicit, logical entities relevant to the topic: {topic}.
+SYSTEM_PROMPT_GENERATE_EN = """
+Generate exactly the requested number of implicit, logical entities relevant to the topic given by the user.
 
 Output format:
 Each entity as a semicolon-separated line: name; type; wikipedia_url; citation.
@@ -20,16 +23,8 @@ Guidelines:
 - Do not include any explanations or additional text.
 """
 
-def get_user_prompt_generate_en(max_entities, topic):
-    return (
-        f"Provide exactly {max_entities} implicit entities as semicolon-separated lines: name; type; wikipedia_url; citation. "
-        f"Ensure Wikipedia URLs are from en.wikipedia.org with exact title and URL. "
-        "One entity per line. No JSON."
-    )
-
-def get_system_prompt_generate_de(max_entities, topic):
-    return f"""
-Generiere genau {max_entities} implizite, logische Entitäten zum Thema: {topic}.
+SYSTEM_PROMPT_GENERATE_DE = """
+Generiere genau die angeforderte Anzahl impliziter, logischer Entitäten zum vom Nutzer genannten Thema.
 
 Ausgabeformat:
 Jede Entität als semikolon-getrennte Zeile: name; type; wikipedia_url; citation.
@@ -44,9 +39,30 @@ Richtlinien:
 - Keine Erklärungen oder zusätzlichen Texte.
 """
 
+# User prompt templates (only topic and entity count vary per request)
+USER_PROMPT_GENERATE_EN = (
+    "Topic: {topic}\n"
+    "Provide exactly {max_entities} implicit entities as semicolon-separated lines: name; type; wikipedia_url; citation. "
+    "Ensure Wikipedia URLs are from en.wikipedia.org with exact title and URL. "
+    "One entity per line. No JSON."
+)
+USER_PROMPT_GENERATE_DE = (
+    "Thema: {topic}\n"
+    "Gib genau {max_entities} implizite Entitäten als semikolon-getrennte Zeilen zurück: name; type; wikipedia_url; citation. "
+    "Stelle sicher, dass die Wikipedia-URLs von de.wikipedia.org stammen und exakten Titel und URL verwenden. "
+    "Eine Entität pro Zeile. Keine JSON."
+)
+
+def get_system_prompt_generate_en(max_entities=None, topic=None):
+    # Static prompt; arguments kept for backwards compatibility
+    return SYSTEM_PROMPT_GENERATE_EN
+
+def get_user_prompt_generate_en(max_entities, topic):
+    return USER_PROMPT_GENERATE_EN.format(topic=topic, max_entities=max_entities)
+
+def get_system_prompt_generate_de(max_entities=None, topic=None):
+    # Statischer Prompt; Argumente nur aus Kompatibilitätsgründen
+    return SYSTEM_PROMPT_GENERATE_DE
+
 def get_user_prompt_generate_de(max_entities, topic):
-    return (
-        f"Gib genau {max_entities} implizite Entitäten als semikolon-getrennte Zeilen zurück: name; type; wikipedia_url; citation. "
-        f"Stelle sicher, dass die Wikipedia-URLs von de.wikipedia.org stammen und exakten Titel und URL verwenden. "
-        "Eine Entität pro Zeile. Keine JSON."
-    )
+    return USER_PROMPT_GENERATE_DE.format(topic=topic, max_entities=max_entities)
@@ -1,7 +1,11 @@
 """
 Centralized prompts for relationship inference via OpenAI.
+
+System prompts are static, and every user prompt starts with its fixed instructions
+(only the relation limit varies, which is constant within a run); text, entities and
+existing relationships follow at the end. Consecutive requests therefore share a long
+prompt prefix and benefit from OpenAI's automatic prompt caching.
 """
-import json
 
 # Knowledge Graph Completion (KGC) prompts
 
@@ -20,17 +24,9 @@ Example:
 Henri Poincaré; born_in; Nancy
 Henri Poincaré; worked_at; École Polytechnique"""
 
-def get_kgc_user_prompt_en(text, entity_info, existing_rels, max_relations):
+def get_kgc_user_prompt_en(text, entity_info_json, existing_rels_json, max_relations):
     return f"""
-Text: ```{text}```
-
-Entities:
-{json.dumps(entity_info, indent=2)}
-
-Existing relationships:
-{json.dumps(existing_rels, indent=2)}
-
-Identify up to {max_relations} additional implicit relationships that reveal missing or novel logical connections between these entities and are not captured by any existing relationships. Do not duplicate, rephrase, or restate relationships. Use only the provided entities for subject and object exactly as they appear in the Entities list (including capitalization); do not introduce new entities. Predicates MUST be 1-3 words lowercase.
+Identify up to {max_relations} additional implicit relationships that reveal missing or novel logical connections between the entities below and are not captured by any existing relationships. Do not duplicate, rephrase, or restate relationships. Use only the provided entities for subject and object exactly as they appear in the Entities list (including capitalization); do not introduce new entities. Predicates MUST be 1-3 words lowercase.
 
 Output:
 Return each relationship as a line in the format: subject; predicate; object. One relationship per line. No JSON or formatting.
@@ -38,7 +34,15 @@ Return each relationship as a line in the format: subject; predicate; object. On
 Answer only in English.
 
 Example:
-Albert Einstein; developed; theory of relativity"""
+Albert Einstein; developed; theory of relativity
+
+Text: ```{text}```
+
+Entities:
+{entity_info_json}
+
+Existing relationships:
+{existing_rels_json}"""
 
 def get_kgc_system_prompt_de():
     return """Du bist ein Knowledge-Graph-Completion-Assistent.
@@ -55,17 +59,9 @@ Beispiel:
 Angela Merkel; geboren_in; Hamburg
 Angela Merkel; hat_studiert; Physik"""
 
-def get_kgc_user_prompt_de(text, entity_info, existing_rels, max_relations):
+def get_kgc_user_prompt_de(text, entity_info_json, existing_rels_json, max_relations):
     return f"""
-Text: ```{text}```
-
-Entitäten:
-{json.dumps(entity_info, indent=2)}
-
-Bestehende Beziehungen:
-{json.dumps(existing_rels, indent=2)}
-
-Ergänze bis zu {max_relations} implizite Beziehungen, die fehlende oder neue logische Verbindungen zwischen diesen Entitäten darstellen und in den bestehenden Beziehungen nicht enthalten sind. Dupliziere oder paraphrasiere keine Beziehungen. Verwende die Entitätsnamen exakt wie in der Liste für Subjekt und Objekt; erfinde keine neuen Entitäten. Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
+Ergänze bis zu {max_relations} implizite Beziehungen, die fehlende oder neue logische Verbindungen zwischen den unten aufgeführten Entitäten darstellen und in den bestehenden Beziehungen nicht enthalten sind. Dupliziere oder paraphrasiere keine Beziehungen. Verwende die Entitätsnamen exakt wie in der Liste für Subjekt und Objekt; erfinde keine neuen Entitäten. Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
 
 Ausgabe:
 Gib jede Beziehung als Zeile im Format subject; predicate; object zurück. Eine Beziehung pro Zeile. Keine JSON oder weitere Formatierung.
@@ -74,7 +70,15 @@ Antworte nur auf Deutsch.
 
 Beispiel:
 Henri Poincaré; geboren_in; Nancy
-Henri Poincaré; hat_studiert; Physik"""
+Henri Poincaré; hat_studiert; Physik
+
+Text: ```{text}```
+
+Entitäten:
+{entity_info_json}
+
+Bestehende Beziehungen:
+{existing_rels_json}"""
 
 # Explicit relationship extraction prompts (extract vs generate)
 
@@ -94,14 +98,9 @@ Return each relationship as a line in the format: subject; predicate; object. On
 Example:
 Barack Obama; born_in; Hawaii"""
 
-def get_explicit_user_prompt_extract_en(text, entity_info, max_relations):
+def get_explicit_user_prompt_extract_en(text, entity_info_json, max_relations):
     return f"""
-Text: ```{text}```
-
-Entities:
-{json.dumps(entity_info, indent=2)}
-
-Identify all EXPLICIT relationships between these entities in the text, using only the provided entities (exact capitalization); do NOT invent new entities. Predicates MUST be 1-3 words lowercase.
+Identify all EXPLICIT relationships between the entities below in the text, using only the provided entities (exact capitalization); do NOT invent new entities. Predicates MUST be 1-3 words lowercase.
 
 Output:
 Return each relationship as a line in the format: subject; predicate; object. One relationship per line. No JSON or formatting.
@@ -109,7 +108,12 @@ Limit to at most {max_relations} relationships.
 Answer only in English.
 
 Example:
-Barack Obama; born_in; Hawaii"""
+Barack Obama; born_in; Hawaii
+
+Text: ```{text}```
+
+Entities:
+{entity_info_json}"""
 
 def get_explicit_system_prompt_extract_de():
     return """Du bist ein fortschrittliches KI-System zur Wissensextraktion und Wissensgraphgenerierung. Denke gründlich nach und antworte besonders vollständig.
@@ -126,14 +130,9 @@ Gib jede Beziehung als Zeile im Format subject; predicate; object zurück. Eine
 Beispiel:
 Barack Obama; geboren_in; Hawaii"""
 
-def get_explicit_user_prompt_extract_de(text, entity_info, max_relations):
+def get_explicit_user_prompt_extract_de(text, entity_info_json, max_relations):
     return f"""
-Text: ```{text}```
-
-Entitäten:
-{json.dumps(entity_info, indent=2)}
-
-Identifiziere alle EXPLIZITEN Beziehungen zwischen den bereitgestellten Entitäten im Text. Verwende nur die bereitgestellten Entitäten (inkl. Original-Großschreibung) und erfinde keine neuen.
+Identifiziere alle EXPLIZITEN Beziehungen zwischen den unten aufgeführten Entitäten im Text. Verwende nur die bereitgestellten Entitäten (inkl. Original-Großschreibung) und erfinde keine neuen.
 Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
 Beispiel-Prädikate: hat_name, ist_typ, ist_teil_von, hat_teil, mitglied_von, hat_mitglied, instanz_von, hat_rolle, hat_kompetenz, bewertet, erhält, vergibt, gehört_zu, behandelt, hat_methode, verwendet, stellt_bereit, erfordert, unterstützt, bietet_an, nimmt_teil_an, organisiert, arbeitet_zusammen_mit, findet_statt_am, findet_statt_in, hat_datum, hat_zeit, hat_ort, hat_person, hat_gruppe, hat_sprache, hat_thema, hat_fachgebiet, hat_theorie, hat_begriff, hat_werkzeug, hat_wert, hat_ziel, hat_lernziel, hat_voraussetzung, hat_richtlinie, hat_förderung, hat_ereignis, hat_aktivität, hat_feedback, hat_ressource, hat_projekt, hat_system, hat_aufgabe, hat_ergebnis, hat_werk, hat_phänomen.
 
@@ -143,7 +142,12 @@ Beschränke auf maximal {max_relations} Beziehungen.
 Antworte nur auf Deutsch.
 
 Beispiel:
-Barack Obama; geboren_in; Hawaii"""
+Barack Obama; geboren_in; Hawaii
+
+Text: ```{text}```
+
+Entitäten:
+{entity_info_json}"""
 
 def get_explicit_system_prompt_all_en():
     return """You are an advanced AI system specializing in knowledge graph extraction and enrichment. Think deeply before answering.
@@ -161,14 +165,9 @@ Answer only in English.
 Example:
 Marie Curie; won; Nobel Prize"""
 
-def get_explicit_user_prompt_all_en(text, entity_info, max_relations):
+def get_explicit_user_prompt_all_en(text, entity_info_json, max_relations):
     return f"""
-Text: ```{text}```
-
-Entities:
-{json.dumps(entity_info, indent=2)}
-
-Identify ALL possible relationships between these entities based on the text. Each must be unique; do NOT duplicate or rephrase. Do NOT invent new entities. Use only the provided entities for subject and object. Predicates MUST be 1-3 words lowercase.
+Identify ALL possible relationships between the entities below based on the text. Each must be unique; do NOT duplicate or rephrase. Do NOT invent new entities. Use only the provided entities for subject and object. Predicates MUST be 1-3 words lowercase.
 
 Output:
 Return each relationship as a line in the format: subject; predicate; object. One relationship per line. Do NOT output JSON or any formatting.
@@ -176,7 +175,12 @@ Limit to at most {max_relations} relationships.
 Answer only in English.
 
 Example:
-Marie Curie; won; Nobel Prize"""
+Marie Curie; won; Nobel Prize
+
+Text: ```{text}```
+
+Entities:
+{entity_info_json}"""
 
 def get_explicit_system_prompt_all_de():
     return """Du bist ein fortschrittliches KI-System zur Wissensgraph-Extraktion und -Anreicherung. Denke gründlich nach und antworte sorgfältig.
@@ -194,14 +198,9 @@ Antworte nur auf Deutsch.
 Beispiel:
 Marie Curie; gewann; Nobelpreis"""
 
-def get_explicit_user_prompt_all_de(text, entity_info, max_relations):
+def get_explicit_user_prompt_all_de(text, entity_info_json, max_relations):
     return f"""
-Text: ```{text}```
-
-Entitäten:
-{json.dumps(entity_info, indent=2)}
-
-Generiere ALLE möglichen Beziehungen zwischen diesen Entitäten basierend auf dem Text. Jede Beziehung nur einmal; dupliziere oder paraphrasiere nicht. Erfinde keine neuen Entitäten. Verwende nur die bereitgestellten Entitäten für Subjekt und Objekt. Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
+Generiere ALLE möglichen Beziehungen zwischen den unten aufgeführten Entitäten basierend auf dem Text. Jede Beziehung nur einmal; dupliziere oder paraphrasiere nicht. Erfinde keine neuen Entitäten. Verwende nur die bereitgestellten Entitäten für Subjekt und Objekt. Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
 
 Ausgabe:
 Gib jede Beziehung als Zeile im Format subject; predicate; object zurück. Eine Beziehung pro Zeile. Keine JSON oder weitere Formatierung.
@@ -209,7 +208,12 @@ Beschränke auf maximal {max_relations} Beziehungen.
 Antworte nur auf Deutsch.
 
 Beispiel:
-Marie Curie; gewann; Nobelpreis"""
+Marie Curie; gewann; Nobelpreis
+
+Text: ```{text}```
+
+Entitäten:
+{entity_info_json}"""
 
 def get_implicit_system_prompt_en():
     return """You are an advanced AI system specializing in knowledge graph enrichment. Think deeply before answering.
@@ -226,23 +230,23 @@ Return each relationship as a line in the format: subject; predicate; object. On
 Example:
 Albert Einstein; developed; theory of relativity"""
 
-def get_implicit_user_prompt_en(text, entity_info, explicit_rels, max_relations):
+def get_implicit_user_prompt_en(text, entity_info_json, explicit_rels_json, max_relations):
     return f"""
-Text: ```{text}```
-
-Entities:
-{json.dumps(entity_info, indent=2)}
-
-Explicit relationships (do NOT repeat):
-{json.dumps(explicit_rels, indent=2)}
-
-Identify up to {max_relations} additional implicit relationships between these entities. Use only the provided entities for subject and object exactly as they appear in the Entities list (including capitalization); do NOT invent new entities. Predicates MUST be 1-3 words lowercase.
+Identify up to {max_relations} additional implicit relationships between the entities below. Use only the provided entities for subject and object exactly as they appear in the Entities list (including capitalization); do NOT invent new entities. Predicates MUST be 1-3 words lowercase.
 
 Output:
 Return each relationship as a line in the format: subject; predicate; object. One relationship per line. No JSON or formatting.
 
 Example:
-Albert Einstein; developed; theory of relativity"""
+Albert Einstein; developed; theory of relativity
+
+Text: ```{text}```
+
+Entities:
+{entity_info_json}
+
+Explicit relationships (do NOT repeat):
+{explicit_rels_json}"""
 
 def get_implicit_system_prompt_de():
     return """Du bist ein fortschrittliches KI-System zur Wissensgraph-Anreicherung. Denke gründlich nach und antworte detailliert.
@@ -259,23 +263,98 @@ Gib jede Beziehung als Zeile im Format subject; predicate; object zurück. Eine
 Beispiel:
 Albert Einstein; entwickelte; Relativitätstheorie"""
 
-def get_implicit_user_prompt_de(text, entity_info, explicit_rels, max_relations):
+def get_implicit_user_prompt_de(text, entity_info_json, explicit_rels_json, max_relations):
     return f"""
+Ergänze bis zu {max_relations} implizite Beziehungen basierend auf dem unten stehenden Text und den expliziten Beziehungen. Verwende nur die bereitgestellten Entitäten für Subjekt und Objekt; erfinde keine neuen Entitäten. Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
+
+Ausgabe:
+Gib jede Beziehung als Zeile im Format subject; predicate; object zurück. Eine Beziehung pro Zeile. Keine JSON oder weitere Formatierung.
+
+Beispiel:
+Albert Einstein; entwickelte; Relativitätstheorie
+
 Text: ```{text}```
 
 Entitäten:
-{json.dumps(entity_info, indent=2)}
+{entity_info_json}
 
 Explizite Beziehungen (nicht wiederholen):
-{json.dumps(explicit_rels, indent=2)}
+{explicit_rels_json}"""
 
-Ergänze bis zu {max_relations} implizite Beziehungen basierend auf dem Text und den expliziten Beziehungen. Verwende nur die bereitgestellten Entitäten für Subjekt und Objekt; erfinde keine neuen Entitäten. Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
+# Combined prompts (explicit + implicit relationships in one call)
+
+def get_combined_system_prompt_en():
+    return """You are an advanced AI system specializing in knowledge extraction and knowledge graph enrichment. Think deeply before answering.
+Your task:
+Extract the EXPLICIT relationships between the provided entities (directly stated in the text) and additionally identify IMPLICIT relationships (inferred from the context). Each relationship may occur only once; do not repeat an explicit relationship as implicit.
+Use only the provided entities for subject and object, exactly as they appear in the Entities list (including capitalization); do NOT invent new entities.
+Rules:
+- Entity Consistency: Use only provided entity names.
+- Predicates MUST be 1-3 words lowercase.
+- Mark every relationship as explicit or implicit.
+- Examples of predicates: has_name, is_type, part_of, has_part, member_of, has_member, instance_of, has_role, has_competence, assesses, receives, issues, belongs_to, covers, has_method, uses, provides, requires, supports, offers, participates_in, organizes, collaborates_with, occurs_on, occurs_at, has_date, has_time, has_location, has_person, has_group, has_language, has_topic, has_field, has_subject, has_theory, has_term, has_tool, has_value, has_goal, has_objective, has_prerequisite, has_policy, has_funding, has_event, has_activity, has_feedback, has_resource, has_project, has_system, has_task, has_result, has_work, has_phenomenon
+
+Output:
+Return each relationship as a line in the format: subject; predicate; object; explicit|implicit. One relationship per line. No JSON or other formatting.
+
+Example:
+Barack Obama; born_in; Hawaii; explicit
+Barack Obama; has_nationality; United States; implicit"""
+
+def get_combined_user_prompt_en(text, entity_info_json, max_relations):
+    return f"""
+Identify all EXPLICIT relationships between the entities below in the text and additional IMPLICIT relationships, using only the provided entities (exact capitalization); do NOT invent new entities. Predicates MUST be 1-3 words lowercase.
+
+Output:
+Return each relationship as a line in the format: subject; predicate; object; explicit|implicit. One relationship per line. No JSON or formatting.
+Limit to at most {max_relations} explicit and {max_relations} implicit relationships.
+Answer only in English.
+
+Example:
+Barack Obama; born_in; Hawaii; explicit
+Barack Obama; has_nationality; United States; implicit
+
+Text: ```{text}```
+
+Entities:
+{entity_info_json}"""
+
+def get_combined_system_prompt_de():
+    return """Du bist ein fortschrittliches KI-System zur Wissensextraktion und Wissensgraph-Anreicherung. Denke gründlich nach und antworte besonders vollständig.
+Deine Aufgabe:
+Extrahiere die EXPLIZITEN Beziehungen zwischen den bereitgestellten Entitäten (direkt im Text genannt) und ergänze zusätzlich IMPLIZITE Beziehungen (aus dem Kontext abgeleitet). Jede Beziehung darf nur einmal vorkommen; wiederhole eine explizite Beziehung nicht als implizite.
+Verwende nur die bereitgestellten Entitäten für Subjekt und Objekt, exakt wie in der Entitätenliste (inkl. Groß-/Kleinschreibung); erfinde keine neuen Entitäten.
+Regeln:
+- Entitätskonsistenz: Verwende nur die bereitgestellten Entitätsnamen.
+- Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
+- Kennzeichne jede Beziehung als explicit oder implicit.
+- Beispiel-Prädikate: hat_name, ist_typ, ist_teil_von, hat_teil, mitglied_von, hat_mitglied, instanz_von, hat_rolle, hat_kompetenz, bewertet, erhält, vergibt, gehört_zu, behandelt, hat_methode, verwendet, stellt_bereit, erfordert, unterstützt, bietet_an, nimmt_teil_an, organisiert, arbeitet_zusammen_mit, findet_statt_am, findet_statt_in, hat_datum, hat_zeit, hat_ort, hat_person, hat_gruppe, hat_sprache, hat_thema, hat_fachgebiet, hat_theorie, hat_begriff, hat_werkzeug, hat_wert, hat_ziel, hat_lernziel, hat_voraussetzung, hat_richtlinie, hat_förderung, hat_ereignis, hat_aktivität, hat_feedback, hat_ressource, hat_projekt, hat_system, hat_aufgabe, hat_ergebnis, hat_werk, hat_phänomen
 
 Ausgabe:
-Gib jede Beziehung als Zeile im Format subject; predicate; object zurück. Eine Beziehung pro Zeile. Keine JSON oder weitere Formatierung.
+Gib jede Beziehung als Zeile im Format subject; predicate; object; explicit|implicit zurück. Eine Beziehung pro Zeile. Keine JSON oder weitere Formatierung.
 
 Beispiel:
-Albert Einstein; entwickelte; Relativitätstheorie"""
+Barack Obama; geboren_in; Hawaii; explicit
+Barack Obama; hat_staatsangehörigkeit; Vereinigte Staaten; implicit"""
+
+def get_combined_user_prompt_de(text, entity_info_json, max_relations):
+    return f"""
+Identifiziere alle EXPLIZITEN Beziehungen zwischen den unten aufgeführten Entitäten im Text sowie zusätzliche IMPLIZITE Beziehungen. Verwende nur die bereitgestellten Entitäten (inkl. Original-Großschreibung) und erfinde keine neuen.
+Prädikate MÜSSEN 1-3 Wörter lang und kleingeschrieben sein.
+
+Ausgabe:
+Gib jede Beziehung als Zeile im Format subject; predicate; object; explicit|implicit zurück. Eine Beziehung pro Zeile. Keine JSON oder weitere Formatierung.
+Beschränke auf maximal {max_relations} explizite und {max_relations} implizite Beziehungen.
+Antworte nur auf Deutsch.
+
+Beispiel:
+Barack Obama; geboren_in; Hawaii; explicit
+Barack Obama; hat_staatsangehörigkeit; Vereinigte Staaten; implicit
+
+Text: ```{text}```
+
+Entitäten:
+{entity_info_json}"""
 
 # Deduplication prompts for relationship inference
 
@@ -288,7 +367,8 @@ def get_user_prompt_dedup_relationship_en(subject, obj, prompt_rels_json):
         f"For the following relationships between subject and object, remove duplicates or very similar predicates. "
         f"Prefer explicit relationships over implicit ones if meaning is similar. Do not change any other fields. "
         f"Subject: '{subject}', Object: '{obj}', Relationships: {prompt_rels_json}. "
-        f"Return a list of unique relationships with their predicates."
+        f"Return a JSON object with the key 'relationships' containing the list of unique relationships "
+        f"with their predicate and inferred fields."
     )
 
 
@@ -301,5 +381,6 @@ def get_user_prompt_dedup_relationship_de(subject, obj, prompt_rels_json):
         f"Für die folgenden Beziehungen zwischen Subjekt und Objekt entferne Duplikate oder sehr ähnliche Prädikate. "
         f"Bevorzuge explizite Beziehungen gegenüber impliziten, falls die Bedeutung ähnlich ist. Keine anderen Felder verändern! "
         f"Subjekt: '{subject}', Objekt: '{obj}', Beziehungen: {prompt_rels_json}. "
-        f"Gib eine Liste der einmaligen Beziehungen mit Prädikat zurück."
+        f"Gib ein JSON-Objekt mit dem Schlüssel 'relationships' zurück, das die Liste der einmaligen Beziehungen "
+        f"mit Prädikat und inferred-Feld enthält."
     )
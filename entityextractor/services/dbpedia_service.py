@@ -6,7 +6,6 @@ and extracting information from DBpedia resources.
 """
 
 import logging
-import requests
 import urllib.parse
 from SPARQLWrapper import SPARQLWrapper, JSON
 import os
@@ -19,13 +18,14 @@ from entityextractor.config.settings import DEFAULT_CONFIG, get_config
 from entityextractor.services.wikipedia_service import get_wikipedia_title_in_language
 from entityextractor.utils.cache_utils import get_cache_path, load_cache, save_cache
 from entityextractor.utils.rate_limiter import RateLimiter
+from entityextractor.utils.http_utils import get_http_session
 
 _config = get_config()
 _rate_limiter = RateLimiter(_config["RATE_LIMIT_MAX_CALLS"], _config["RATE_LIMIT_PERIOD"], _config["RATE_LIMIT_BACKOFF_BASE"], _config["RATE_LIMIT_BACKOFF_MAX"])
 
 @_rate_limiter
 def _limited_get(url, **kwargs):
-    return requests.get(url, **kwargs)
+    return get_http_session().get(url, **kwargs)
 
 def get_dbpedia_info_from_wikipedia_url(wikipedia_url, config=None):
     """
@@ -5,14 +5,23 @@ This module provides functions for interacting with the OpenAI API
 to extract entities from text.
 """
 
+import atexit
 import json
 import logging
 import os
+import threading
 import time
+from functools import lru_cache
 from openai import OpenAI
 
+try:
+    import orjson  # optional: schnellere JSON-Serialisierung
+except ImportError:
+    orjson = None
+
 from entityextractor.config.settings import DEFAULT_CONFIG
 from entityextractor.utils.text_utils import clean_json_from_markdown
+from entityextractor.utils.cache_utils import get_cache_path, load_cache, save_cache
 from entityextractor.prompts.extract_prompts import (
     get_system_prompt_en, get_system_prompt_de,
     USER_PROMPT_EN, USER_PROMPT_DE,
@@ -21,6 +30,143 @@ from entityextractor.prompts.extract_prompts import (
 from entityextractor.utils.prompt_utils import apply_type_restrictions
 from entityextractor.prompts.compendium_prompts import get_educational_block_de, get_educational_block_en
 
+@lru_cache(maxsize=8)
+def get_openai_client(api_key, base_url=None):
+    """
+    Return a shared OpenAI client for the given API key and base URL.
+
+    The client keeps its HTTP connection pool, so repeated calls reuse
+    open connections instead of performing a new TLS handshake each time.
+    """
+    if base_url:
+        return OpenAI(api_key=api_key, base_url=base_url)
+    return OpenAI(api_key=api_key)
+
+# Endzustände eines Batch-Jobs der OpenAI Batch API
+_BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+def run_chat_completion_batch(requests, config=None, poll_interval=30):
+    """
+    Run chat completions through the OpenAI Batch API and wait for the results.
+
+    Batch requests cost half as much as online calls and have their own, larger rate
+    limit, but may take up to 24 hours. Meant for large offline workloads.
+
+    Args:
+        requests: Dictionary custom_id -> chat completion body (model, messages, ...)
+        config: Configuration dictionary (OPENAI_API_KEY, LLM_BASE_URL)
+        poll_interval: Seconds between two status checks of the batch
+
+    Returns:
+        Dictionary custom_id -> response text; failed requests are missing
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if not requests:
+        return {}
+    api_key = config.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
+    client = get_openai_client(api_key, config.get("LLM_BASE_URL"))
+
+    lines = [
+        json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body},
+                   ensure_ascii=False)
+        for custom_id, body in requests.items()
+    ]
+    input_file = client.files.create(file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+    logging.info(f"OpenAI-Batch {batch.id} mit {len(lines)} Anfragen gestartet")
+
+    while batch.status not in _BATCH_FINAL_STATES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        logging.info(f"OpenAI-Batch {batch.id}: Status {batch.status}")
+    if batch.status != "completed" or not batch.output_file_id:
+        logging.error(f"OpenAI-Batch {batch.id} beendet mit Status {batch.status}")
+        return {}
+
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if response.get("status_code") != 200:
+            logging.warning(f"OpenAI-Batch-Anfrage {entry.get('custom_id')} fehlgeschlagen: {entry.get('error')}")
+            continue
+        results[entry["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+    return results
+
+def cached_chat_completion(client, config, model, messages, temperature, max_tokens, response_format=None):
+    """
+    Run a chat completion and return the stripped response text.
+
+    With CACHE_LLM_RESPONSES_ENABLED, identical requests (model, messages, temperature,
+    max_tokens, response_format) are answered from the file cache instead of calling the
+    API again, which makes re-runs on the same corpus fast and free.
+    """
+    request = dict(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+    if response_format is not None:
+        request["response_format"] = response_format
+    cache_path = None
+    if config.get("CACHE_ENABLED") and config.get("CACHE_LLM_RESPONSES_ENABLED", False):
+        cache_key = json.dumps(request, ensure_ascii=False, sort_keys=True)
+        cache_path = get_cache_path(config.get("CACHE_DIR", "cache"), "llm_responses", cache_key)
+        cached = load_cache(cache_path)
+        if cached is not None:
+            logging.debug(f"LLM-Antwort aus dem Cache geladen ({model})")
+            return cached
+    response = client.chat.completions.create(**request)
+    content = response.choices[0].message.content.strip()
+    # Anteil der Prompt-Tokens, die OpenAI aus dem serverseitigen Prompt-Cache bedient hat
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is not None and logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"Prompt-Tokens: {usage.prompt_tokens}, davon aus dem OpenAI-Prompt-Cache: {details.cached_tokens}")
+    if cache_path:
+        save_cache(cache_path, content)
+    return content
+
+def get_text_embedding(client, text, model="text-embedding-3-small"):
+    """
+    Return the embedding vector of text as a list of floats.
+    """
+    response = client.embeddings.create(model=model, input=text)
+    return response.data[0].embedding
+
+# Offene Append-Handles je Trainingsdatei, statt die Datei pro Aufruf neu zu öffnen;
+# jedes Beispiel wird sofort geflusht, beim Prozessende werden alle Handles geschlossen
+_TRAINING_FILES = {}
+_TRAINING_FILES_LOCK = threading.Lock()
+
+def _close_training_files():
+    with _TRAINING_FILES_LOCK:
+        for fh in _TRAINING_FILES.values():
+            fh.close()
+        _TRAINING_FILES.clear()
+
+atexit.register(_close_training_files)
+
+def append_training_example(path, example):
+    """
+    Append one training example as a JSON line to path.
+
+    All writers (extraction, generation, relationships) share one handle per path,
+    so examples keep their order and the file is opened only once. Every example is
+    flushed right away, so the file is complete for readers in the same process and
+    nothing is lost if the process dies.
+    """
+    if orjson is not None:
+        # orjson schreibt UTF-8 ohne ASCII-Escaping (wie ensure_ascii=False)
+        line = orjson.dumps(example, option=orjson.OPT_APPEND_NEWLINE).decode("utf-8")
+    else:
+        line = json.dumps(example, ensure_ascii=False) + "\n"
+    with _TRAINING_FILES_LOCK:
+        fh = _TRAINING_FILES.get(path)
+        if fh is None:
+            fh = _TRAINING_FILES[path] = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        fh.write(line)
+        fh.flush()
+
 def extract_entities_with_openai(text, config=None):
     """
     Extract entities from text using OpenAI's API.
@@ -169,8 +315,7 @@ def save_training_data(text, entities, config=None):
         
         # Speichere nur im OpenAI-Format
         training_data_path = config.get("OPENAI_TRAINING_DATA_PATH", "entity_extractor_openai_format.jsonl")  # Path to JSONL file for training data
-        with open(training_data_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(example, ensure_ascii=False) + "\n")
+        append_training_example(training_data_path, example)
             
         logging.info(f"Saved training example to {training_data_path}")
     except Exception as e:
@@ -202,8 +347,7 @@ def save_relationship_training_data(system_prompt, user_prompt, relationships, c
                 {"role": "assistant", "content": assistant_content}
             ]
         }
-        with open(training_data_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(example, ensure_ascii=False) + "\n")
+        append_training_example(training_data_path, example)
         logging.info(f"Saved relationship training example to {training_data_path}")
     except Exception as e:
         logging.error(f"Error saving relationship training data: {e}")
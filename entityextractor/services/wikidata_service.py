@@ -6,21 +6,26 @@ and extracting information from Wikidata entities.
 """
 
 import logging
-import requests
 import hashlib
 import json
 import os
+from functools import lru_cache
 from openai import OpenAI
 from entityextractor.config.settings import get_config, DEFAULT_CONFIG
 from entityextractor.utils.text_utils import clean_json_from_markdown
 from entityextractor.utils.rate_limiter import RateLimiter
+from entityextractor.utils.http_utils import get_http_session
+from entityextractor.utils.cache_utils import get_cache_path, load_cache, save_cache
 
 _config = get_config()
 _rate_limiter = RateLimiter(_config["RATE_LIMIT_MAX_CALLS"], _config["RATE_LIMIT_PERIOD"], _config["RATE_LIMIT_BACKOFF_BASE"], _config["RATE_LIMIT_BACKOFF_MAX"])
 
 @_rate_limiter
 def _limited_get(url, **kwargs):
-    return requests.get(url, **kwargs)
+    return get_http_session().get(url, **kwargs)
+
+# wbgetentities akzeptiert höchstens 50 IDs pro Anfrage
+_WBGETENTITIES_MAX_IDS = 50
 
 def search_wikidata_by_entity_name(entity_name, language="en", config=None, try_english=True):
     """
@@ -319,22 +324,408 @@ def get_wikidata_description(qid, lang="de", config=None):
     if config is None:
         config = DEFAULT_CONFIG
         
-    api_url = f"https://www.wikidata.org/wiki/Special:EntityData/{qid}.json"
     try:
-        r = _limited_get(api_url, headers={"User-Agent": config.get("USER_AGENT")}, timeout=config.get('TIMEOUT_THIRD_PARTY', 15))
-        r.raise_for_status()
-        data = r.json()
-        entities = data.get("entities", {})
-        entity = entities.get(qid, {})
-        descriptions = entity.get("descriptions", {})
-        description = descriptions.get(lang, {}).get("value")
-        if not description and descriptions:
-            description = list(descriptions.values())[0].get("value")
-        return description
+        return _fetch_wikidata_description(qid, lang, config.get("USER_AGENT"), config.get('TIMEOUT_THIRD_PARTY', 15))
     except Exception as e:
         logging.error("Error retrieving Wikidata description for %s: %s", qid, e)
         return None
 
+@lru_cache(maxsize=4096)
+def _fetch_wikidata_description(qid, lang, user_agent, timeout):
+    """
+    Cached lookup behind get_wikidata_description. Referenced QIDs (types, countries,
+    occupations) repeat across entities, so each one is fetched only once per process.
+    Errors are raised instead of returned and are therefore not cached.
+    """
+    api_url = f"https://www.wikidata.org/wiki/Special:EntityData/{qid}.json"
+    r = _limited_get(api_url, headers={"User-Agent": user_agent}, timeout=timeout)
+    r.raise_for_status()
+    data = r.json()
+    entities = data.get("entities", {})
+    entity = entities.get(qid, {})
+    descriptions = entity.get("descriptions", {})
+    description = descriptions.get(lang, {}).get("value")
+    if not description and descriptions:
+        description = list(descriptions.values())[0].get("value")
+    return description
+
+def _wikidata_cache_path(entity_id, config):
+    """Cache path for the details of entity_id, or None if Wikidata caching is disabled."""
+    if config.get("CACHE_ENABLED") and config.get("CACHE_WIKIDATA_ENABLED") and entity_id:
+        return get_cache_path(config.get("CACHE_DIR", "cache"), "wikidata", entity_id)
+    return None
+
+def _load_wikidata_cache(entity_id, config):
+    cache_path = _wikidata_cache_path(entity_id, config)
+    if cache_path:
+        cached = load_cache(cache_path)
+        if cached is not None:
+            logging.info(f"Loaded Wikidata cache for {entity_id}")
+            return cached
+    return None
+
+def _save_wikidata_cache(entity_id, result, config):
+    cache_path = _wikidata_cache_path(entity_id, config)
+    if cache_path:
+        save_cache(cache_path, result)
+        logging.info(f"Saved Wikidata cache for {entity_id} to {cache_path}")
+
+# Eigenschaften, deren Ziel-QIDs _parse_wikidata_entity über ihre Beschreibung auflöst
+_REFERENCE_PROPERTIES = ("P31", "P279", "P106", "P27", "P19", "P20", "P361", "P527", "P463")
+
+def _referenced_qids(entities):
+    """Collect the QIDs referenced by the description-resolved properties of the given entities."""
+    qids = {}
+    for entity in entities:
+        claims = entity.get("claims", {})
+        for prop in _REFERENCE_PROPERTIES:
+            for claim in claims.get(prop, []):
+                datavalue = claim.get("mainsnak", {}).get("datavalue", {})
+                if datavalue.get("type") == "wikibase-entityid":
+                    qids[datavalue["value"]["id"]] = None
+    return list(qids)
+
+def get_wikidata_descriptions_bulk(qids, lang="de", config=None):
+    """
+    Retrieve the descriptions of several Wikidata entities with one wbgetentities
+    request (props=descriptions) per 50 IDs.
+
+    Returns:
+        A dictionary mapping each returned QID to its description (None if it has none);
+        QIDs missing from the response are left out, so callers can fall back to
+        get_wikidata_description.
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    qids = list(dict.fromkeys(qid for qid in qids if qid))
+    descriptions = {}
+    api_url = "https://www.wikidata.org/w/api.php"
+    for start in range(0, len(qids), _WBGETENTITIES_MAX_IDS):
+        batch = qids[start:start + _WBGETENTITIES_MAX_IDS]
+        params = {
+            "action": "wbgetentities",
+            "ids": "|".join(batch),
+            "props": "descriptions",
+            "format": "json"
+        }
+        try:
+            r = _limited_get(api_url, params=params, headers={"User-Agent": config.get("USER_AGENT")}, timeout=config.get('TIMEOUT_THIRD_PARTY', 15))
+            r.raise_for_status()
+            entities = r.json().get("entities", {})
+        except Exception as e:
+            logging.error("Error retrieving Wikidata descriptions for %s: %s", ", ".join(batch), e)
+            continue
+        for qid in batch:
+            entity = entities.get(qid)
+            if not entity or "missing" in entity:
+                continue
+            # Gleiche Auswahl wie _fetch_wikidata_description: Zielsprache, sonst erste vorhandene
+            entity_descriptions = entity.get("descriptions", {})
+            description = entity_descriptions.get(lang, {}).get("value")
+            if not description and entity_descriptions:
+                description = list(entity_descriptions.values())[0].get("value")
+            descriptions[qid] = description
+    return descriptions
+
+def _parse_wikidata_entity(entity_id, entity, language, config, referenced_descriptions=None):
+    """
+    Build the details dictionary from a Wikidata entity JSON object
+    (as returned by Special:EntityData or wbgetentities).
+
+    referenced_descriptions optionally maps referenced QIDs to their prefetched descriptions
+    (see get_wikidata_descriptions_bulk); other QIDs are looked up one by one.
+    """
+    def describe(qid):
+        if referenced_descriptions is not None and qid in referenced_descriptions:
+            return referenced_descriptions[qid]
+        return get_wikidata_description(qid, lang=language, config=config)
+
+    claims = entity.get("claims", {})
+    labels = entity.get("labels", {})
+    aliases = entity.get("aliases", {})
+    descriptions = entity.get("descriptions", {})
+    
+    # Initialize result dictionary
+    result = {
+        "id": entity_id
+    }
+    
+    # Add description
+    description = descriptions.get(language, {}).get("value")
+    if not description and descriptions:
+        # Fallback to first available language
+        description = list(descriptions.values())[0].get("value")
+    if description:
+        result["description"] = description
+        
+    # Add label/name
+    label = labels.get(language, {}).get("value")
+    if not label and labels:
+        # Fallback to first available language
+        label = list(labels.values())[0].get("value")
+    if label:
+        result["label"] = label
+        
+    # Add aliases/alternative names
+    alias_list = aliases.get(language, [])
+    if alias_list:
+        result["aliases"] = [alias.get("value") for alias in alias_list if alias.get("value")]
+        
+    # P31 = instance of
+    instance_claims = claims.get("P31", [])
+    instances = []
+    for claim in instance_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            dv = claim["mainsnak"]["datavalue"]
+            if dv.get("type") == "wikibase-entityid":
+                iid = dv["value"]["id"]
+                ilabel = describe(iid)
+                if ilabel and ilabel not in instances:
+                    instances.append(ilabel)
+    if instances:
+        result["instance_of"] = instances
+
+    # P279 = subclass of
+    subclass_claims = claims.get("P279", [])
+    subclasses = []
+    for claim in subclass_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            dv = claim["mainsnak"]["datavalue"]
+            if dv.get("type") == "wikibase-entityid":
+                sid = dv["value"]["id"]
+                slabel = describe(sid)
+                if slabel and slabel not in subclasses:
+                    subclasses.append(slabel)
+    if subclasses:
+        result["subclass_of"] = subclasses
+        
+    # Get types/classes (P31 = "instance of")
+    instance_claims = claims.get("P31", [])
+    types = []
+    
+    for claim in instance_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            datavalue = claim["mainsnak"]["datavalue"]
+            if datavalue["type"] == "wikibase-entityid":
+                type_id = datavalue["value"]["id"]
+                # Get label for this type in the configured language
+                type_label = describe(type_id)
+                if type_label and type_label not in types:
+                    types.append(type_label)
+    
+    if types:
+        result["types"] = types
+        
+    # Get subclasses (P279 = "subclass of")
+    subclass_claims = claims.get("P279", [])
+    subclasses = []
+    
+    for claim in subclass_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            datavalue = claim["mainsnak"]["datavalue"]
+            if datavalue["type"] == "wikibase-entityid":
+                subclass_id = datavalue["value"]["id"]
+                subclass_label = describe(subclass_id)
+                if subclass_label and subclass_label not in subclasses:
+                    subclasses.append(subclass_label)
+    
+    if subclasses:
+        result["subclasses"] = subclasses
+        
+    # Get image (P18 = "image")
+    image_claims = claims.get("P18", [])
+    if image_claims and "mainsnak" in image_claims[0] and "datavalue" in image_claims[0]["mainsnak"]:
+        image_value = image_claims[0]["mainsnak"]["datavalue"].get("value")
+        if image_value:
+            # Convert image name to URL
+            image_name = image_value.replace(" ", "_")
+            # Calculate MD5 hash of image name for Wikimedia Commons URL
+            md5_hash = hashlib.md5(image_name.encode('utf-8')).hexdigest()
+            image_url = f"https://commons.wikimedia.org/wiki/Special:FilePath/{image_name}"
+            result["image_url"] = image_url
+            
+    # Get official website (P856 = "official website")
+    website_claims = claims.get("P856", [])
+    if website_claims and "mainsnak" in website_claims[0] and "datavalue" in website_claims[0]["mainsnak"]:
+        website = website_claims[0]["mainsnak"]["datavalue"].get("value")
+        if website:
+            result["website"] = website
+            
+    # Get coordinates (P625 = "coordinate location")
+    coord_claims = claims.get("P625", [])
+    if coord_claims and "mainsnak" in coord_claims[0] and "datavalue" in coord_claims[0]["mainsnak"]:
+        coord_value = coord_claims[0]["mainsnak"]["datavalue"].get("value", {})
+        if coord_value and "latitude" in coord_value and "longitude" in coord_value:
+            result["coordinates"] = {
+                "latitude": coord_value["latitude"],
+                "longitude": coord_value["longitude"]
+            }
+            
+    # Get foundation date (P571 = "inception")
+    foundation_claims = claims.get("P571", [])
+    if foundation_claims and "mainsnak" in foundation_claims[0] and "datavalue" in foundation_claims[0]["mainsnak"]:
+        time_value = foundation_claims[0]["mainsnak"]["datavalue"].get("value", {})
+        if time_value and "time" in time_value:
+            # Format: +YYYY-MM-DDT00:00:00Z
+            time_str = time_value["time"]
+            # Remove the + at the beginning and the T00:00:00Z at the end
+            if time_str.startswith("+"):
+                time_str = time_str[1:]
+            if "T" in time_str:
+                time_str = time_str.split("T")[0]
+            result["foundation_date"] = time_str
+            
+    # For persons: Birth date (P569) and death date (P570)
+    birth_claims = claims.get("P569", [])
+    if birth_claims and "mainsnak" in birth_claims[0] and "datavalue" in birth_claims[0]["mainsnak"]:
+        time_value = birth_claims[0]["mainsnak"]["datavalue"].get("value", {})
+        if time_value and "time" in time_value:
+            time_str = time_value["time"]
+            if time_str.startswith("+"):
+                time_str = time_str[1:]
+            if "T" in time_str:
+                time_str = time_str.split("T")[0]
+            result["birth_date"] = time_str
+            
+    death_claims = claims.get("P570", [])
+    if death_claims and "mainsnak" in death_claims[0] and "datavalue" in death_claims[0]["mainsnak"]:
+        time_value = death_claims[0]["mainsnak"]["datavalue"].get("value", {})
+        if time_value and "time" in time_value:
+            time_str = time_value["time"]
+            if time_str.startswith("+"):
+                time_str = time_str[1:]
+            if "T" in time_str:
+                time_str = time_str.split("T")[0]
+            result["death_date"] = time_str
+            
+    # Get occupations for persons (P106 = "occupation")
+    occupation_claims = claims.get("P106", [])
+    occupations = []
+    
+    for claim in occupation_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            datavalue = claim["mainsnak"]["datavalue"]
+            if datavalue["type"] == "wikibase-entityid":
+                occupation_id = datavalue["value"]["id"]
+                occupation_label = describe(occupation_id)
+                if occupation_label and occupation_label not in occupations:
+                    occupations.append(occupation_label)
+    
+    if occupations:
+        result["occupations"] = occupations
+        
+    # Add additional properties that might be useful
+    # P27 = country of citizenship
+    citizenship_claims = claims.get("P27", [])
+    citizenships = []
+    
+    for claim in citizenship_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            datavalue = claim["mainsnak"]["datavalue"]
+            if datavalue["type"] == "wikibase-entityid":
+                country_id = datavalue["value"]["id"]
+                country_label = describe(country_id)
+                if country_label and country_label not in citizenships:
+                    citizenships.append(country_label)
+    
+    if citizenships:
+        result["citizenships"] = citizenships
+        
+    # P19 = place of birth
+    birth_place_claims = claims.get("P19", [])
+    if birth_place_claims and "mainsnak" in birth_place_claims[0] and "datavalue" in birth_place_claims[0]["mainsnak"]:
+        datavalue = birth_place_claims[0]["mainsnak"]["datavalue"]
+        if datavalue["type"] == "wikibase-entityid":
+            place_id = datavalue["value"]["id"]
+            place_label = describe(place_id)
+            if place_label:
+                result["birth_place"] = place_label
+                
+    # P20 = place of death
+    death_place_claims = claims.get("P20", [])
+    if death_place_claims and "mainsnak" in death_place_claims[0] and "datavalue" in death_place_claims[0]["mainsnak"]:
+        datavalue = death_place_claims[0]["mainsnak"]["datavalue"]
+        if datavalue["type"] == "wikibase-entityid":
+            place_id = datavalue["value"]["id"]
+            place_label = describe(place_id)
+            if place_label:
+                result["death_place"] = place_label
+                
+    # P1448 = official name
+    official_name_claims = claims.get("P1448", [])
+    if official_name_claims and "mainsnak" in official_name_claims[0] and "datavalue" in official_name_claims[0]["mainsnak"]:
+        datavalue = official_name_claims[0]["mainsnak"]["datavalue"]
+        if datavalue["type"] == "monolingualtext":
+            name_value = datavalue["value"]
+            if name_value.get("text"):
+                result["official_name"] = name_value["text"]
+                
+    # P1082 = population
+    population_claims = claims.get("P1082", [])
+    if population_claims and "mainsnak" in population_claims[0] and "datavalue" in population_claims[0]["mainsnak"]:
+        datavalue = population_claims[0]["mainsnak"]["datavalue"]
+        if datavalue["type"] == "quantity":
+            population_value = datavalue["value"]
+            if "amount" in population_value:
+                result["population"] = population_value["amount"]
+        
+    # P361 = part of
+    part_claims = claims.get("P361", [])
+    parts = []
+    for claim in part_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            dv = claim["mainsnak"]["datavalue"]
+            if dv.get("type") == "wikibase-entityid":
+                pid = dv["value"]["id"]
+                plabel = describe(pid)
+                if plabel and plabel not in parts:
+                    parts.append(plabel)
+    if parts:
+        result["part_of"] = parts
+        
+    # P527 = has part
+    has_part_claims = claims.get("P527", [])
+    has_parts = []
+    for claim in has_part_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            dv = claim["mainsnak"]["datavalue"]
+            if dv.get("type") == "wikibase-entityid":
+                hpid = dv["value"]["id"]
+                hplabel = describe(hpid)
+                if hplabel and hplabel not in has_parts:
+                    has_parts.append(hplabel)
+    if has_parts:
+        result["has_parts"] = has_parts
+        
+    # P463 = member of
+    member_claims = claims.get("P463", [])
+    members = []
+    for claim in member_claims:
+        if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
+            dv = claim["mainsnak"]["datavalue"]
+            if dv.get("type") == "wikibase-entityid":
+                mid = dv["value"]["id"]
+                mlabel = describe(mid)
+                if mlabel and mlabel not in members:
+                    members.append(mlabel)
+    if members:
+        result["member_of"] = members
+        
+    # P227 = GND ID
+    gnd_claims = claims.get("P227", [])
+    if gnd_claims and "mainsnak" in gnd_claims[0] and "datavalue" in gnd_claims[0]["mainsnak"]:
+        dv = gnd_claims[0]["mainsnak"]["datavalue"]
+        if dv.get("type") == "string" and dv.get("value"):
+            result["gnd_id"] = dv["value"]
+            
+    # P213 = ISNI
+    isni_claims = claims.get("P213", [])
+    if isni_claims and "mainsnak" in isni_claims[0] and "datavalue" in isni_claims[0]["mainsnak"]:
+        dv = isni_claims[0]["mainsnak"]["datavalue"]
+        if dv.get("type") == "string" and dv.get("value"):
+            result["isni"] = dv["value"]
+    return result
+
 def get_wikidata_details(entity_id, language="de", config=None):
     """
     Retrieve detailed information about a Wikidata entity.
@@ -354,19 +745,9 @@ def get_wikidata_details(entity_id, language="de", config=None):
         config = DEFAULT_CONFIG
         
     # === Wikidata details caching ===
-    if config.get("CACHE_ENABLED") and config.get("CACHE_WIKIDATA_ENABLED") and entity_id:
-        cache_dir = config.get("CACHE_DIR", "cache")
-        wikidata_cache_dir = os.path.join(cache_dir, "wikidata")
-        os.makedirs(wikidata_cache_dir, exist_ok=True)
-        cache_key = hashlib.sha256(entity_id.encode("utf-8")).hexdigest()
-        cache_path = os.path.join(wikidata_cache_dir, f"{cache_key}.json")
-        if os.path.exists(cache_path):
-            logging.info(f"Loaded Wikidata cache for {entity_id}")
-            try:
-                with open(cache_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                logging.warning(f"Failed to load Wikidata cache {cache_path}: {e}")
+    cached = _load_wikidata_cache(entity_id, config)
+    if cached is not None:
+        return cached
                 
     wikidata_url = f"https://www.wikidata.org/wiki/Special:EntityData/{entity_id}.json"
     
@@ -375,306 +756,80 @@ def get_wikidata_details(entity_id, language="de", config=None):
         r.raise_for_status()
         data = r.json()
         
-        entities = data.get("entities", {})
-        entity = entities.get(entity_id, {})
-        claims = entity.get("claims", {})
-        labels = entity.get("labels", {})
-        aliases = entity.get("aliases", {})
-        descriptions = entity.get("descriptions", {})
-        
-        # Initialize result dictionary
-        result = {
-            "id": entity_id
-        }
-        
-        # Add description
-        description = descriptions.get(language, {}).get("value")
-        if not description and descriptions:
-            # Fallback to first available language
-            description = list(descriptions.values())[0].get("value")
-        if description:
-            result["description"] = description
-            
-        # Add label/name
-        label = labels.get(language, {}).get("value")
-        if not label and labels:
-            # Fallback to first available language
-            label = list(labels.values())[0].get("value")
-        if label:
-            result["label"] = label
-            
-        # Add aliases/alternative names
-        alias_list = aliases.get(language, [])
-        if alias_list:
-            result["aliases"] = [alias.get("value") for alias in alias_list if alias.get("value")]
-            
-        # P31 = instance of
-        instance_claims = claims.get("P31", [])
-        instances = []
-        for claim in instance_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                dv = claim["mainsnak"]["datavalue"]
-                if dv.get("type") == "wikibase-entityid":
-                    iid = dv["value"]["id"]
-                    ilabel = get_wikidata_description(iid, lang=language, config=config)
-                    if ilabel and ilabel not in instances:
-                        instances.append(ilabel)
-        if instances:
-            result["instance_of"] = instances
-
-        # P279 = subclass of
-        subclass_claims = claims.get("P279", [])
-        subclasses = []
-        for claim in subclass_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                dv = claim["mainsnak"]["datavalue"]
-                if dv.get("type") == "wikibase-entityid":
-                    sid = dv["value"]["id"]
-                    slabel = get_wikidata_description(sid, lang=language, config=config)
-                    if slabel and slabel not in subclasses:
-                        subclasses.append(slabel)
-        if subclasses:
-            result["subclass_of"] = subclasses
-            
-        # Get types/classes (P31 = "instance of")
-        instance_claims = claims.get("P31", [])
-        types = []
-        
-        for claim in instance_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                datavalue = claim["mainsnak"]["datavalue"]
-                if datavalue["type"] == "wikibase-entityid":
-                    type_id = datavalue["value"]["id"]
-                    # Get label for this type in the configured language
-                    type_label = get_wikidata_description(type_id, lang=language, config=config)
-                    if type_label and type_label not in types:
-                        types.append(type_label)
-        
-        if types:
-            result["types"] = types
-            
-        # Get subclasses (P279 = "subclass of")
-        subclass_claims = claims.get("P279", [])
-        subclasses = []
-        
-        for claim in subclass_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                datavalue = claim["mainsnak"]["datavalue"]
-                if datavalue["type"] == "wikibase-entityid":
-                    subclass_id = datavalue["value"]["id"]
-                    subclass_label = get_wikidata_description(subclass_id, lang=language, config=config)
-                    if subclass_label and subclass_label not in subclasses:
-                        subclasses.append(subclass_label)
-        
-        if subclasses:
-            result["subclasses"] = subclasses
-            
-        # Get image (P18 = "image")
-        image_claims = claims.get("P18", [])
-        if image_claims and "mainsnak" in image_claims[0] and "datavalue" in image_claims[0]["mainsnak"]:
-            image_value = image_claims[0]["mainsnak"]["datavalue"].get("value")
-            if image_value:
-                # Convert image name to URL
-                image_name = image_value.replace(" ", "_")
-                # Calculate MD5 hash of image name for Wikimedia Commons URL
-                md5_hash = hashlib.md5(image_name.encode('utf-8')).hexdigest()
-                image_url = f"https://commons.wikimedia.org/wiki/Special:FilePath/{image_name}"
-                result["image_url"] = image_url
-                
-        # Get official website (P856 = "official website")
-        website_claims = claims.get("P856", [])
-        if website_claims and "mainsnak" in website_claims[0] and "datavalue" in website_claims[0]["mainsnak"]:
-            website = website_claims[0]["mainsnak"]["datavalue"].get("value")
-            if website:
-                result["website"] = website
-                
-        # Get coordinates (P625 = "coordinate location")
-        coord_claims = claims.get("P625", [])
-        if coord_claims and "mainsnak" in coord_claims[0] and "datavalue" in coord_claims[0]["mainsnak"]:
-            coord_value = coord_claims[0]["mainsnak"]["datavalue"].get("value", {})
-            if coord_value and "latitude" in coord_value and "longitude" in coord_value:
-                result["coordinates"] = {
-                    "latitude": coord_value["latitude"],
-                    "longitude": coord_value["longitude"]
-                }
-                
-        # Get foundation date (P571 = "inception")
-        foundation_claims = claims.get("P571", [])
-        if foundation_claims and "mainsnak" in foundation_claims[0] and "datavalue" in foundation_claims[0]["mainsnak"]:
-            time_value = foundation_claims[0]["mainsnak"]["datavalue"].get("value", {})
-            if time_value and "time" in time_value:
-                # Format: +YYYY-MM-DDT00:00:00Z
-                time_str = time_value["time"]
-                # Remove the + at the beginning and the T00:00:00Z at the end
-                if time_str.startswith("+"):
-                    time_str = time_str[1:]
-                if "T" in time_str:
-                    time_str = time_str.split("T")[0]
-                result["foundation_date"] = time_str
-                
-        # For persons: Birth date (P569) and death date (P570)
-        birth_claims = claims.get("P569", [])
-        if birth_claims and "mainsnak" in birth_claims[0] and "datavalue" in birth_claims[0]["mainsnak"]:
-            time_value = birth_claims[0]["mainsnak"]["datavalue"].get("value", {})
-            if time_value and "time" in time_value:
-                time_str = time_value["time"]
-                if time_str.startswith("+"):
-                    time_str = time_str[1:]
-                if "T" in time_str:
-                    time_str = time_str.split("T")[0]
-                result["birth_date"] = time_str
-                
-        death_claims = claims.get("P570", [])
-        if death_claims and "mainsnak" in death_claims[0] and "datavalue" in death_claims[0]["mainsnak"]:
-            time_value = death_claims[0]["mainsnak"]["datavalue"].get("value", {})
-            if time_value and "time" in time_value:
-                time_str = time_value["time"]
-                if time_str.startswith("+"):
-                    time_str = time_str[1:]
-                if "T" in time_str:
-                    time_str = time_str.split("T")[0]
-                result["death_date"] = time_str
-                
-        # Get occupations for persons (P106 = "occupation")
-        occupation_claims = claims.get("P106", [])
-        occupations = []
-        
-        for claim in occupation_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                datavalue = claim["mainsnak"]["datavalue"]
-                if datavalue["type"] == "wikibase-entityid":
-                    occupation_id = datavalue["value"]["id"]
-                    occupation_label = get_wikidata_description(occupation_id, lang=language, config=config)
-                    if occupation_label and occupation_label not in occupations:
-                        occupations.append(occupation_label)
-        
-        if occupations:
-            result["occupations"] = occupations
-            
-        # Add additional properties that might be useful
-        # P27 = country of citizenship
-        citizenship_claims = claims.get("P27", [])
-        citizenships = []
-        
-        for claim in citizenship_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                datavalue = claim["mainsnak"]["datavalue"]
-                if datavalue["type"] == "wikibase-entityid":
-                    country_id = datavalue["value"]["id"]
-                    country_label = get_wikidata_description(country_id, lang=language, config=config)
-                    if country_label and country_label not in citizenships:
-                        citizenships.append(country_label)
-        
-        if citizenships:
-            result["citizenships"] = citizenships
-            
-        # P19 = place of birth
-        birth_place_claims = claims.get("P19", [])
-        if birth_place_claims and "mainsnak" in birth_place_claims[0] and "datavalue" in birth_place_claims[0]["mainsnak"]:
-            datavalue = birth_place_claims[0]["mainsnak"]["datavalue"]
-            if datavalue["type"] == "wikibase-entityid":
-                place_id = datavalue["value"]["id"]
-                place_label = get_wikidata_description(place_id, lang=language, config=config)
-                if place_label:
-                    result["birth_place"] = place_label
-                    
-        # P20 = place of death
-        death_place_claims = claims.get("P20", [])
-        if death_place_claims and "mainsnak" in death_place_claims[0] and "datavalue" in death_place_claims[0]["mainsnak"]:
-            datavalue = death_place_claims[0]["mainsnak"]["datavalue"]
-            if datavalue["type"] == "wikibase-entityid":
-                place_id = datavalue["value"]["id"]
-                place_label = get_wikidata_description(place_id, lang=language, config=config)
-                if place_label:
-                    result["death_place"] = place_label
-                    
-        # P1448 = official name
-        official_name_claims = claims.get("P1448", [])
-        if official_name_claims and "mainsnak" in official_name_claims[0] and "datavalue" in official_name_claims[0]["mainsnak"]:
-            datavalue = official_name_claims[0]["mainsnak"]["datavalue"]
-            if datavalue["type"] == "monolingualtext":
-                name_value = datavalue["value"]
-                if name_value.get("text"):
-                    result["official_name"] = name_value["text"]
-                    
-        # P1082 = population
-        population_claims = claims.get("P1082", [])
-        if population_claims and "mainsnak" in population_claims[0] and "datavalue" in population_claims[0]["mainsnak"]:
-            datavalue = population_claims[0]["mainsnak"]["datavalue"]
-            if datavalue["type"] == "quantity":
-                population_value = datavalue["value"]
-                if "amount" in population_value:
-                    result["population"] = population_value["amount"]
-            
-        # P361 = part of
-        part_claims = claims.get("P361", [])
-        parts = []
-        for claim in part_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                dv = claim["mainsnak"]["datavalue"]
-                if dv.get("type") == "wikibase-entityid":
-                    pid = dv["value"]["id"]
-                    plabel = get_wikidata_description(pid, lang=language, config=config)
-                    if plabel and plabel not in parts:
-                        parts.append(plabel)
-        if parts:
-            result["part_of"] = parts
-            
-        # P527 = has part
-        has_part_claims = claims.get("P527", [])
-        has_parts = []
-        for claim in has_part_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                dv = claim["mainsnak"]["datavalue"]
-                if dv.get("type") == "wikibase-entityid":
-                    hpid = dv["value"]["id"]
-                    hplabel = get_wikidata_description(hpid, lang=language, config=config)
-                    if hplabel and hplabel not in has_parts:
-                        has_parts.append(hplabel)
-        if has_parts:
-            result["has_parts"] = has_parts
-            
-        # P463 = member of
-        member_claims = claims.get("P463", [])
-        members = []
-        for claim in member_claims:
-            if "mainsnak" in claim and "datavalue" in claim["mainsnak"]:
-                dv = claim["mainsnak"]["datavalue"]
-                if dv.get("type") == "wikibase-entityid":
-                    mid = dv["value"]["id"]
-                    mlabel = get_wikidata_description(mid, lang=language, config=config)
-                    if mlabel and mlabel not in members:
-                        members.append(mlabel)
-        if members:
-            result["member_of"] = members
-            
-        # P227 = GND ID
-        gnd_claims = claims.get("P227", [])
-        if gnd_claims and "mainsnak" in gnd_claims[0] and "datavalue" in gnd_claims[0]["mainsnak"]:
-            dv = gnd_claims[0]["mainsnak"]["datavalue"]
-            if dv.get("type") == "string" and dv.get("value"):
-                result["gnd_id"] = dv["value"]
-                
-        # P213 = ISNI
-        isni_claims = claims.get("P213", [])
-        if isni_claims and "mainsnak" in isni_claims[0] and "datavalue" in isni_claims[0]["mainsnak"]:
-            dv = isni_claims[0]["mainsnak"]["datavalue"]
-            if dv.get("type") == "string" and dv.get("value"):
-                result["isni"] = dv["value"]
+        entity = data.get("entities", {}).get(entity_id, {})
+        referenced_descriptions = get_wikidata_descriptions_bulk(_referenced_qids([entity]), lang=language, config=config)
+        result = _parse_wikidata_entity(entity_id, entity, language, config, referenced_descriptions)
             
         # Save Wikidata cache
-        if config.get("CACHE_ENABLED") and config.get("CACHE_WIKIDATA_ENABLED") and entity_id:
-            try:
-                with open(cache_path, "w", encoding="utf-8") as f:
-                    json.dump(result, f)
-                logging.info(f"Saved Wikidata cache for {entity_id} to {cache_path}")
-            except Exception as e:
-                logging.warning(f"Failed to save Wikidata cache {cache_path}: {e}")
+        _save_wikidata_cache(entity_id, result, config)
         return result
     except Exception as e:
         logging.error("Error retrieving Wikidata details for %s: %s", entity_id, e)
         return {"id": entity_id}
 
+def get_wikidata_details_bulk(entity_ids, language="de", config=None):
+    """
+    Retrieve detailed information for several Wikidata entities.
+
+    Cached entities are served from the cache, the remaining ones are fetched with
+    one wbgetentities request per 50 IDs. IDs missing from a bulk response
+    (e.g. redirected items) fall back to get_wikidata_details.
+
+    Args:
+        entity_ids: Iterable of Wikidata entity IDs
+        language: Language for the labels and descriptions ("de" or "en")
+        config: Configuration dictionary with timeout settings
+
+    Returns:
+        A dictionary mapping each entity ID to its details (see get_wikidata_details)
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+
+    results = {}
+    missing = []
+    for entity_id in dict.fromkeys(eid for eid in entity_ids if eid):
+        cached = _load_wikidata_cache(entity_id, config)
+        if cached is not None:
+            results[entity_id] = cached
+        else:
+            missing.append(entity_id)
+
+    api_url = "https://www.wikidata.org/w/api.php"
+    for start in range(0, len(missing), _WBGETENTITIES_MAX_IDS):
+        batch = missing[start:start + _WBGETENTITIES_MAX_IDS]
+        params = {
+            "action": "wbgetentities",
+            "ids": "|".join(batch),
+            "props": "labels|descriptions|aliases|claims",
+            "format": "json"
+        }
+        try:
+            r = _limited_get(api_url, params=params, headers={"User-Agent": config.get("USER_AGENT")}, timeout=config.get('TIMEOUT_THIRD_PARTY', 15))
+            r.raise_for_status()
+            entities = r.json().get("entities", {})
+        except Exception as e:
+            logging.error("Error retrieving Wikidata details for %s: %s", ", ".join(batch), e)
+            entities = {}
+        # Beschreibungen aller referenzierten QIDs (Typen, Länder, Berufe, ...) gesammelt abrufen
+        # statt einzeln je Entität und Eigenschaft
+        found = [entity for entity in entities.values() if "missing" not in entity]
+        referenced_descriptions = get_wikidata_descriptions_bulk(_referenced_qids(found), lang=language, config=config)
+        for entity_id in batch:
+            entity = entities.get(entity_id)
+            if not entity or "missing" in entity:
+                results[entity_id] = get_wikidata_details(entity_id, language=language, config=config)
+                continue
+            try:
+                result = _parse_wikidata_entity(entity_id, entity, language, config, referenced_descriptions)
+            except Exception as e:
+                logging.error("Error retrieving Wikidata details for %s: %s", entity_id, e)
+                results[entity_id] = {"id": entity_id}
+                continue
+            _save_wikidata_cache(entity_id, result, config)
+            results[entity_id] = result
+    return results
+
 def get_entity_types_from_wikidata(entity_id, language="de", config=None):
     """
     Retrieve the types of a Wikidata entity (compatibility function).
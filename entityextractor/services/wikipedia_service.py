@@ -7,9 +7,9 @@ and extracting information from Wikipedia pages.
 
 import logging
 import re
-import requests
 from bs4 import BeautifulSoup
 import urllib.parse
+from functools import lru_cache
 # import wptools
 import os
 import json
@@ -17,6 +17,7 @@ import hashlib
 from entityextractor.services.wikidata_service import generate_entity_synonyms
 from entityextractor.utils.cache_utils import get_cache_path, load_cache, save_cache
 from entityextractor.utils.rate_limiter import RateLimiter
+from entityextractor.utils.http_utils import get_http_session
 from entityextractor.config.settings import get_config, DEFAULT_CONFIG
 from entityextractor.utils.text_utils import is_valid_wikipedia_url
 from entityextractor.utils.wiki_url_utils import sanitize_wikipedia_url
@@ -26,7 +27,7 @@ _rate_limiter = RateLimiter(_config["RATE_LIMIT_MAX_CALLS"], _config["RATE_LIMIT
 
 @_rate_limiter
 def _limited_get(url, **kwargs):
-    return requests.get(url, **kwargs)
+    return get_http_session().get(url, **kwargs)
 
 def get_wikipedia_title_in_language(title, from_lang="de", to_lang="en", config=None):
     """
@@ -171,40 +172,47 @@ def fallback_wikipedia_url(query, langs=None, language="de", config=None):
     # Try each language in sequence
     for lang in langs:
         try:
-            # URL-encode the query
-            encoded_query = urllib.parse.quote(query)
-            
-            # Use the opensearch API to find matching articles
-            api_url = f"https://{lang}.wikipedia.org/w/api.php"
-            params = {
-                "action": "opensearch",
-                "search": query,
-                "limit": 1,
-                "namespace": 0,
-                "format": "json",
-                "maxlag": config.get("WIKIPEDIA_MAXLAG")
-            }
-            
-            headers = {"User-Agent": config.get("USER_AGENT")}
-            
-            logging.info(f"Fallback ({lang}): Searching Wikipedia URL for '{query}'...")
-            
-            response = _limited_get(api_url, params=params, headers=headers, timeout=config.get('TIMEOUT_THIRD_PARTY', 15))
-            response.raise_for_status()
-            
-            data = response.json()
-            if data and len(data) > 3 and data[3] and len(data[3]) > 0:
-                url = data[3][0]
-                if is_valid_wikipedia_url(url):
-                    logging.info(f"Fallback ({lang}) successful: Found URL '{url}' for '{query}'.")
-                    return url
+            url = _opensearch_wikipedia_url(query, lang, config.get("USER_AGENT"),
+                                            config.get('TIMEOUT_THIRD_PARTY', 15), config.get("WIKIPEDIA_MAXLAG"))
+            if url:
+                logging.info(f"Fallback ({lang}) successful: Found URL '{url}' for '{query}'.")
+                return url
         except Exception as e:
             logging.error(f"Error searching Wikipedia for {query} in {lang}: {e}")
             
     logging.warning(f"Fallback failed: No Wikipedia URL found for '{query}'.")
     return None
 
-def follow_wikipedia_redirect(url, entity_name):
+@lru_cache(maxsize=4096)
+def _opensearch_wikipedia_url(query, lang, user_agent, timeout, maxlag):
+    """
+    Cached Opensearch lookup for one language; returns the first valid article URL or None.
+    Repeated entity names in a run are resolved only once. Errors are raised and not cached.
+    """
+    # Use the opensearch API to find matching articles
+    api_url = f"https://{lang}.wikipedia.org/w/api.php"
+    params = {
+        "action": "opensearch",
+        "search": query,
+        "limit": 1,
+        "namespace": 0,
+        "format": "json",
+        "maxlag": maxlag
+    }
+    
+    logging.info(f"Fallback ({lang}): Searching Wikipedia URL for '{query}'...")
+    
+    response = _limited_get(api_url, params=params, headers={"User-Agent": user_agent}, timeout=timeout)
+    response.raise_for_status()
+    
+    data = response.json()
+    if data and len(data) > 3 and data[3] and len(data[3]) > 0:
+        url = data[3][0]
+        if is_valid_wikipedia_url(url):
+            return url
+    return None
+
+def follow_wikipedia_redirect(url, entity_name, config=None):
     url = sanitize_wikipedia_url(url)
     """
     Follow Wikipedia redirects and extract the actual page title.
@@ -216,6 +224,7 @@ def follow_wikipedia_redirect(url, entity_name):
     Args:
         url: Initial Wikipedia URL
         entity_name: Original entity name
+        config: Optional configuration (TIMEOUT_THIRD_PARTY)
         
     Returns:
         Tuple of (final URL, page title)
@@ -223,17 +232,16 @@ def follow_wikipedia_redirect(url, entity_name):
     if not url:
         logging.warning(f"No URL provided for '{entity_name}'")
         return None, None
+    if config is None:
+        config = DEFAULT_CONFIG
         
     try:
-        # Follow redirects and get the final URL
-        response = requests.get(url, allow_redirects=True)
-        final_url = response.url
-        html = response.text
+        final_url, canonical_url, page_title = _fetch_wikipedia_redirect_target(
+            url.split('#')[0], config.get('TIMEOUT_THIRD_PARTY', 15)
+        )
         
         # Check for soft redirect via canonical link
-        canonical_match = re.search(r'<link rel="canonical" href="([^"]+)"', html)
-        if canonical_match:
-            canonical_url = canonical_match.group(1)
+        if canonical_url:
             if canonical_url != final_url:
                 logging.info(f"Wikipedia-Soft-Redirect (canonical) detected: {final_url} -> {canonical_url}")
                 # Extract title from canonical URL
@@ -244,13 +252,7 @@ def follow_wikipedia_redirect(url, entity_name):
                     return canonical_url, canonical_title
                 return canonical_url, entity_name
         
-        # Extract page title from HTML
-        title_match = re.search(r'<title>([^<]+)</title>', html)
-        if title_match:
-            page_title = title_match.group(1)
-            # Remove " - Wikipedia" oder " – Wikipedia" suffix (berücksichtigt sowohl Bindestrich als auch Gedankenstrich)
-            page_title = re.sub(r'[\s]*[–-][\s]*Wikipedia.*$', '', page_title)
-            
+        if page_title:
             if page_title.lower() != entity_name.lower():
                 logging.info(f"Wikipedia-Title-Correction: '{entity_name}' -> '{page_title}'")
             else:
@@ -265,6 +267,26 @@ def follow_wikipedia_redirect(url, entity_name):
         title = splitted[1].split("#")[0].replace('_', ' ') if len(splitted) >= 2 else entity_name
         return url, title
 
+@lru_cache(maxsize=4096)
+def _fetch_wikipedia_redirect_target(url, timeout):
+    """
+    Cached page fetch behind follow_wikipedia_redirect, keyed on the URL without fragment and the timeout.
+    
+    Returns:
+        Tuple of (final URL after HTTP redirects, canonical URL or None, page title or None)
+    """
+    # Follow redirects and get the final URL
+    response = get_http_session().get(url, allow_redirects=True, timeout=timeout)
+    html = response.text
+    canonical_match = re.search(r'<link rel="canonical" href="([^"]+)"', html)
+    # Extract page title from HTML
+    page_title = None
+    title_match = re.search(r'<title>([^<]+)</title>', html)
+    if title_match:
+        # Remove " - Wikipedia" oder " – Wikipedia" suffix (berücksichtigt sowohl Bindestrich als auch Gedankenstrich)
+        page_title = re.sub(r'[\s]*[–-][\s]*Wikipedia.*$', '', title_match.group(1))
+    return response.url, canonical_match.group(1) if canonical_match else None, page_title
+
 def get_wikipedia_extract(wikipedia_url, config=None):
     # Für API-Parameter: Klartext-Titel verwenden
     wikipedia_url = sanitize_wikipedia_url(wikipedia_url)
@@ -324,6 +346,7 @@ def get_wikipedia_extract(wikipedia_url, config=None):
             "explaintext": True,
             "format": "json",
             "titles": title_plain,
+            "redirects": 1,  # Weiterleitungen direkt in der API auflösen (spart den separaten Redirect-Abruf)
             "maxlag": config.get("WIKIPEDIA_MAXLAG")
         }
         headers = {"User-Agent": config.get("USER_AGENT")}
@@ -347,7 +370,7 @@ def get_wikipedia_extract(wikipedia_url, config=None):
         # Fragment entfernen
         base_url = wikipedia_url.split('#')[0]
         # Softredirect prüfen
-        final_url, final_title = follow_wikipedia_redirect(base_url, title_plain)
+        final_url, final_title = follow_wikipedia_redirect(base_url, title_plain, config)
         if final_url and final_url != base_url:
             logging.info(f"Softredirect erkannt: {base_url} -> {final_url} | Versuche Extrakt erneut.")
             try:
@@ -364,7 +387,7 @@ def get_wikipedia_extract(wikipedia_url, config=None):
                         srv_extract = srv_page.get("extract", "")
                         if srv_extract:
                             logging.info(f"Wikipedia extract nach Softredirect für URL {final_url} erfolgreich geladen.")
-                            return srv_extract, None
+                            return srv_extract, srv_page.get("pageprops", {}).get("wikibase_item")
             except Exception as e:
                 logging.error(f"Error during redirect extract for {final_url}: {e}")
         # Softredirect nicht angewendet oder kein Inhalt, nun Opensearch-Fallback
@@ -394,7 +417,7 @@ def get_wikipedia_extract(wikipedia_url, config=None):
                 logging.error(f"Error retrieving Wikipedia extract for fallback URL {fallback_url}: {e}")
         logging.warning(f"No Wikipedia extract found via API for both URL {wikipedia_url} and fallback. Trying BeautifulSoup...")
         try:
-            response = requests.get(wikipedia_url, timeout=config.get('TIMEOUT_THIRD_PARTY', 15))
+            response = get_http_session().get(wikipedia_url, timeout=config.get('TIMEOUT_THIRD_PARTY', 15))
             response.raise_for_status()
             html = response.text
             soup = BeautifulSoup(html, 'html.parser')
@@ -465,6 +488,91 @@ def get_wikipedia_extract(wikipedia_url, config=None):
     logging.warning(f"No extract found using LLM-generated synonyms for '{title_plain}'.")
     return None, None
 
+# TextExtracts liefert mit exintro höchstens 20 Extrakte pro Anfrage
+_EXTRACTS_MAX_TITLES = 20
+
+def get_wikipedia_extracts_bulk(wikipedia_urls, config=None):
+    """
+    Retrieve the extracts of several Wikipedia articles with multi-title API queries.
+
+    Cached URLs are served from the cache, the remaining ones are grouped by language
+    and fetched with one query per 20 titles (titles=A|B|C, redirects resolved by the API).
+    URLs without an extract in the bulk response are left out, so the caller can fall back to
+    get_wikipedia_extract (redirect, Opensearch, BeautifulSoup and synonym fallbacks).
+
+    Args:
+        wikipedia_urls: Iterable of Wikipedia article URLs
+        config: Configuration dictionary with timeout settings
+
+    Returns:
+        A dictionary mapping each found URL (as given) to a tuple (extract, wikidata_id)
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    use_cache = config.get("CACHE_ENABLED") and config.get("CACHE_WIKIPEDIA_ENABLED")
+
+    results = {}
+    pending = {}  # lang -> {title_plain: [(url, cache_path), ...]}
+    for url in dict.fromkeys(u for u in wikipedia_urls if u):
+        sanitized = sanitize_wikipedia_url(url)
+        cache_path = None
+        if use_cache:
+            cache_path = get_cache_path(config.get("CACHE_DIR", "cache"), "wikipedia", sanitized)
+            cached = load_cache(cache_path)
+            if cached is not None:
+                logging.info(f"Loaded Wikipedia extract from cache for {sanitized}")
+                results[url] = (cached.get("extract"), cached.get("wikidata_id"))
+                continue
+        splitted = sanitized.split("/wiki/")
+        if len(splitted) < 2 or "://" not in sanitized:
+            continue
+        title_plain = urllib.parse.unquote(splitted[1].split("#")[0])
+        lang = sanitized.split("://")[1].split("/")[0].split('.')[0]
+        pending.setdefault(lang, {}).setdefault(title_plain, []).append((url, cache_path))
+
+    headers = {"User-Agent": config.get("USER_AGENT")}
+    for lang, by_title in pending.items():
+        api_url = f"https://{lang}.wikipedia.org/w/api.php"
+        titles = list(by_title)
+        for start in range(0, len(titles), _EXTRACTS_MAX_TITLES):
+            batch = titles[start:start + _EXTRACTS_MAX_TITLES]
+            params = {
+                "action": "query",
+                "prop": "extracts|pageprops",
+                "ppprop": "wikibase_item",
+                "exintro": True,
+                "explaintext": True,
+                "exlimit": "max",
+                "format": "json",
+                "titles": "|".join(batch),
+                "redirects": 1,
+                "maxlag": config.get("WIKIPEDIA_MAXLAG")
+            }
+            try:
+                r = _limited_get(api_url, params=params, headers=headers, timeout=config.get('TIMEOUT_THIRD_PARTY', 15))
+                r.raise_for_status()
+                query = r.json().get("query", {})
+            except Exception as e:
+                logging.error(f"Error retrieving Wikipedia extracts ({lang}, {len(batch)} titles): {e}")
+                continue
+            # Angefragte Titel über Normalisierung und Weiterleitung auf die Seitentitel abbilden
+            normalized = {n.get("from"): n.get("to") for n in query.get("normalized", [])}
+            redirects = {rd.get("from"): rd.get("to") for rd in query.get("redirects", [])}
+            pages_by_title = {page.get("title"): page for page in query.get("pages", {}).values()}
+            for title_plain in batch:
+                title = normalized.get(title_plain, title_plain)
+                page = pages_by_title.get(redirects.get(title, title), {})
+                extract_text = page.get("extract", "")
+                if not extract_text:
+                    continue
+                wikidata_id = page.get("pageprops", {}).get("wikibase_item")
+                for url, cache_path in by_title[title_plain]:
+                    results[url] = (extract_text, wikidata_id)
+                    if cache_path:
+                        save_cache(cache_path, {"extract": extract_text, "wikidata_id": wikidata_id})
+    logging.info(f"Wikipedia bulk extracts: {len(results)} found")
+    return results
+
 def get_wikipedia_categories(wikipedia_url, config=None):
     wikipedia_url = sanitize_wikipedia_url(wikipedia_url)
 
@@ -3,6 +3,11 @@ import json
 import hashlib
 import logging
 
+try:
+    import orjson  # optional: schnelleres Lesen/Schreiben der Cache-Dateien
+except ImportError:
+    orjson = None
+
 
 def get_cache_path(cache_dir, namespace, key, suffix=".json"):
     """
@@ -30,8 +35,9 @@ def load_cache(cache_path):
     """
     if os.path.exists(cache_path):
         try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(cache_path, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             logging.debug(f"Loaded cache from {cache_path}")
             return data
         except Exception as e:
@@ -44,8 +50,12 @@ def save_cache(cache_path, data):
     Save JSON-serializable data to cache_path.
     """
     try:
-        with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        if orjson is not None:
+            with open(cache_path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
         logging.debug(f"Saved cache to {cache_path}")
     except Exception as e:
         logging.warning(f"Failed to save cache {cache_path}: {e}")
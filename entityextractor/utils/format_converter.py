@@ -20,6 +20,7 @@ def convert_to_legacy_format(result):
     legacy_entities = []
     
     for entity in result["entities"]:
+        sources = {}
         legacy_entity = {
             "entity": entity.get("name", ""),
             "details": {
@@ -28,38 +29,38 @@ def convert_to_legacy_format(result):
                 "citation_start": 0,
                 "citation_end": len(result.get("text", ""))
             },
-            "sources": {}
+            "sources": sources
         }
         
         # Add Wikipedia source if available
         if "wikipedia_url" in entity:
-            legacy_entity["sources"]["wikipedia"] = {
-                "url": entity.get("wikipedia_url", "")
+            wp = sources["wikipedia"] = {
+                "url": entity["wikipedia_url"]
             }
             if "wikipedia_extract" in entity:
-                legacy_entity["sources"]["wikipedia"]["extract"] = entity.get("wikipedia_extract", "")
+                wp["extract"] = entity["wikipedia_extract"]
         
         # Add Wikidata source if available
         if "wikidata_id" in entity:
-            legacy_entity["sources"]["wikidata"] = {
-                "id": entity.get("wikidata_id", "")
+            wd = sources["wikidata"] = {
+                "id": entity["wikidata_id"]
             }
             if "wikidata_description" in entity:
-                legacy_entity["sources"]["wikidata"]["description"] = entity.get("wikidata_description", "")
+                wd["description"] = entity["wikidata_description"]
             if "wikidata_types" in entity:
-                legacy_entity["sources"]["wikidata"]["types"] = entity.get("wikidata_types", [])
+                wd["types"] = entity["wikidata_types"]
         
         # Add DBpedia source if available
         if "dbpedia_uri" in entity:
-            legacy_entity["sources"]["dbpedia"] = {
-                "resource_uri": entity.get("dbpedia_uri", "")
+            dbp = sources["dbpedia"] = {
+                "resource_uri": entity["dbpedia_uri"]
             }
             if "dbpedia_language" in entity:
-                legacy_entity["sources"]["dbpedia"]["language"] = entity.get("dbpedia_language", "")
+                dbp["language"] = entity["dbpedia_language"]
             if "dbpedia_abstract" in entity:
-                legacy_entity["sources"]["dbpedia"]["abstract"] = entity.get("dbpedia_abstract", "")
+                dbp["abstract"] = entity["dbpedia_abstract"]
             if "dbpedia_types" in entity:
-                legacy_entity["sources"]["dbpedia"]["types"] = entity.get("dbpedia_types", [])
+                dbp["types"] = entity["dbpedia_types"]
         
         legacy_entities.append(legacy_entity)
     
@@ -0,0 +1,51 @@
+"""
+HTTP utilities for the Entity Extractor.
+
+This module provides the shared HTTP session used by the service modules.
+"""
+
+import logging
+import threading
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@lru_cache(maxsize=1)
+def get_http_session():
+    """
+    Return the shared requests session for Wikipedia, Wikidata and DBpedia calls.
+
+    The session keeps connections alive (up to 20 per host, enough for the linking
+    and chunk thread pools), so repeated calls skip the TCP/TLS handshake.
+    Transient server errors (5xx) are retried with a short backoff; 429 responses
+    are left to the RateLimiter.
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504),
+                  allowed_methods=("GET",), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def warm_up_connections(hosts, timeout=5):
+    """
+    Open pooled connections to the given hosts in a background thread.
+
+    A HEAD request per host resolves DNS and completes the TCP/TLS handshake while
+    the caller prepares its first real request, which then reuses the pooled
+    connection. Failures are ignored; the real requests handle errors themselves.
+    """
+    def _warm():
+        session = get_http_session()
+        for host in hosts:
+            try:
+                session.head(f"https://{host}/", timeout=timeout)
+            except Exception as e:
+                logging.debug(f"Connection warm-up for {host} failed: {e}")
+
+    threading.Thread(target=_warm, name="http-warmup", daemon=True).start()
@@ -0,0 +1,28 @@
+"""
+Normalization of explicit/implicit markers for the Entity Extractor.
+
+LLM answers mark entities and relationships as explicit or implicit in German or English
+and in varying case; this module maps them to the canonical 'explicit' / 'implicit'.
+"""
+from typing import Any, Dict
+
+# Abbildung deutscher/englischer inferred-Werte auf die kanonische Form
+INFERRED_MAP = {
+    "explizit": "explicit",
+    "explicit": "explicit",
+    "implizit": "implicit",
+    "implicit": "implicit",
+}
+# Häufige Schreibweisen (Explicit, EXPLIZIT, ...) direkt auflösbar, ohne .lower()-Kopie
+INFERRED_MAP.update({variant(k): v for k, v in list(INFERRED_MAP.items())
+                     for variant in (str.capitalize, str.upper)})
+
+
+def normalize_inferred(d: Dict[str, Any], key: str, default: str = "implicit") -> None:
+    """Normalize d[key] in place to 'explicit' or 'implicit'; unknown or missing values become default."""
+    value = d.get(key, "")
+    # Bereits kanonische Werte (Regelfall) und gängige Schreibweisen ohne .lower()-Kopie nachschlagen
+    normalized = INFERRED_MAP.get(value)
+    if normalized is None:
+        normalized = INFERRED_MAP.get(value.lower() if isinstance(value, str) else "", default)
+    d[key] = normalized
@@ -8,6 +8,11 @@ throughout the application.
 import logging
 import urllib3
 
+# Zuletzt angewendete Einstellungen und installierter Handler; gleiche Einstellungen
+# bei erneutem Aufruf (z.B. in jedem Pipeline-Schritt) werden übersprungen
+_CONFIGURED_STATE = None
+_CONSOLE_HANDLER = None
+
 def configure_logging(config=None):
     """
     Configure logging based on configuration settings.
@@ -22,6 +27,13 @@ def configure_logging(config=None):
         
     # Default logging configuration
     logging_level = logging.INFO if config.get("SHOW_STATUS", True) else logging.ERROR
+    suppress_tls = config.get("SUPPRESS_TLS_WARNINGS", True)
+    
+    # Bereits mit denselben Einstellungen konfiguriert und Handler noch aktiv: nichts zu tun
+    global _CONFIGURED_STATE, _CONSOLE_HANDLER
+    state = (logging_level, suppress_tls)
+    if state == _CONFIGURED_STATE and logging.root.handlers == [_CONSOLE_HANDLER]:
+        return
     
     # Reset handlers to avoid duplications
     for handler in logging.root.handlers[:]:
@@ -39,10 +51,13 @@ def configure_logging(config=None):
     logging.root.addHandler(console_handler)
     
     # Suppress SSL warnings (if configured)
-    if config.get("SUPPRESS_TLS_WARNINGS", True):
+    if suppress_tls:
         logging.captureWarnings(True)
         urllib3.disable_warnings()
         
     # Suppress JSON parsing messages (limit to critical errors)
     logging.getLogger('json.decoder').setLevel(logging.CRITICAL)
     logging.getLogger('json.scanner').setLevel(logging.CRITICAL)
+    
+    _CONFIGURED_STATE = state
+    _CONSOLE_HANDLER = console_handler
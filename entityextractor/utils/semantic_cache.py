@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    A thread-safe in-memory LRU cache that matches entries by embedding similarity.
+
+    Entries are grouped by an exact scope key; within a scope the entry whose
+    embedding has the highest cosine similarity to the query is returned if it
+    reaches the threshold.
+    """
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (scope, id) -> (normalized embedding, value)
+        self.counter = 0
+
+    @staticmethod
+    def _normalize(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, scope, embedding, threshold):
+        """
+        Return (value, similarity) of the most similar entry in scope, or (None, best similarity).
+        """
+        query = self._normalize(embedding)
+        with self.lock:
+            keys = [key for key in self.entries if key[0] == scope]
+            if not keys:
+                return None, 0.0
+            # Kosinus-Ähnlichkeit aller Kandidaten in einem Matrixprodukt
+            similarities = np.stack([self.entries[key][0] for key in keys]) @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < threshold:
+                return None, similarity
+            self.entries.move_to_end(keys[best])
+            return self.entries[keys[best]][1], similarity
+
+    def set(self, scope, embedding, value):
+        with self.lock:
+            self.counter += 1
+            self.entries[(scope, self.counter)] = (self._normalize(embedding), value)
+            # Älteste (am längsten nicht getroffene) Einträge verdrängen
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
@@ -6,6 +6,13 @@ This module provides functions for processing and cleaning text data.
 
 import re
 
+# Control characters that are not allowed in JSON (allowed: \b, \t, \n, \f, \r)
+_INVALID_CONTROL_CHARS_RE = re.compile(r"[\x00-\x07\x0b\x0e-\x1f]")
+# Einmal beim Import kompiliert, da pro Entität aufgerufen
+_WIKIPEDIA_URL_RE = re.compile(r"^https?://[a-z]{2}\.wikipedia\.org/wiki/[\w\-%]+")
+_TRAILING_DOTS_RE = re.compile(r'[.]{3,}$')
+_TRAILING_ELLIPSIS_RE = re.compile(r'…$')
+
 def clean_json_from_markdown(raw_text):
     """
     Remove Markdown code block markers from LLM responses.
@@ -17,14 +24,11 @@ def clean_json_from_markdown(raw_text):
         Cleaned text with Markdown code block markers removed
     """
     raw_text = raw_text.strip()
+    # Fast path: plain JSON (no fence) skips the line handling entirely
     if raw_text.startswith("```"):
         lines = raw_text.splitlines()
-        # Skip first and last line if they contain Markdown markers
-        for i in range(len(lines)):
-            if lines[i].startswith("```"):
-                if i == 0:
-                    lines[i] = ""
-                    break
+        # Skip first line (opening Markdown marker)
+        lines[0] = ""
         # Go through lines from bottom to top to find the last Markdown marker
         for i in range(len(lines) - 1, -1, -1):
             if lines[i].startswith("```"):
@@ -33,24 +37,14 @@ def clean_json_from_markdown(raw_text):
                 
         raw_text = "\n".join([line for line in lines if line])
     
-    # Handle case where only the first line has ```json
-    lines = raw_text.splitlines()
-    if lines and lines[0].startswith("```"):
-        lines[0] = "```"
-        raw_text = "\n".join(lines)
-    
-    # Remove invalid control characters
-    # Allowed control characters in JSON: \b, \f, \n, \r, \t
-    clean_text = ""
-    for char in raw_text:
-        # Only keep printable characters and allowed control characters
-        if ord(char) >= 32 or char in '\b\f\n\r\t':
-            clean_text += char
-        else:
-            # Replace invalid control characters with spaces
-            clean_text += ' '
+        # Handle case where only the first line has ```json
+        lines = raw_text.splitlines()
+        if lines and lines[0].startswith("```"):
+            lines[0] = "```"
+            raw_text = "\n".join(lines)
     
-    return clean_text
+    # Replace invalid control characters with spaces (single precompiled regex pass)
+    return _INVALID_CONTROL_CHARS_RE.sub(" ", raw_text)
 
 # Alias for compatibility
 clean_json_response = clean_json_from_markdown
@@ -65,8 +59,7 @@ def is_valid_wikipedia_url(url):
     Returns:
         Boolean indicating if the URL is a valid Wikipedia URL
     """
-    pattern = re.compile(r"^https?://[a-z]{2}\.wikipedia\.org/wiki/[\w\-%]+")
-    return bool(pattern.match(url))
+    return bool(_WIKIPEDIA_URL_RE.match(url))
 
 def strip_trailing_ellipsis(text):
     """
@@ -80,8 +73,8 @@ def strip_trailing_ellipsis(text):
     """
     if text:
         # Remove trailing "..." or "…"
-        text = re.sub(r'[.]{3,}$', '', text)
-        text = re.sub(r'…$', '', text)
+        text = _TRAILING_DOTS_RE.sub('', text)
+        text = _TRAILING_ELLIPSIS_RE.sub('', text)
         return text.rstrip()
     return text
 
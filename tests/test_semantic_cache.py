@@ -0,0 +1,57 @@
+import json
+import unittest
+from unittest import mock
+
+from entityextractor.core import relationship_inference
+from entityextractor.utils.semantic_cache import SemanticCache
+
+ENTITIES = [
+    {"name": "Albert Einstein", "type": "Person"},
+    {"name": "Ulm", "type": "Ort"},
+    {"name": "Deutschland", "type": "Land"},
+]
+ANSWER = json.dumps([
+    {"subject": "Albert Einstein", "predicate": "geboren in", "object": "Ulm", "inferred": "explicit"},
+    {"subject": "Ulm", "predicate": "liegt in", "object": "Deutschland", "inferred": "implicit"},
+])
+
+
+class SemanticCacheTest(unittest.TestCase):
+    def setUp(self):
+        for patch in (
+            mock.patch.object(relationship_inference, "_SEMANTIC_CACHE", SemanticCache()),
+            mock.patch.object(relationship_inference, "get_text_embedding", return_value=[1.0, 0.0]),
+            mock.patch.object(relationship_inference, "cached_chat_completion", return_value=ANSWER),
+            mock.patch.object(relationship_inference, "get_openai_client", return_value=mock.Mock()),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _infer_twice(self, enable_inference):
+        config = {
+            "RELATION_EXTRACTION": True,
+            "ENABLE_RELATIONS_INFERENCE": enable_inference,
+            "SEMANTIC_CACHE_ENABLED": True,
+            "OPENAI_API_KEY": "test",
+            "CACHE_ENABLED": False,
+        }
+        first = relationship_inference.infer_entity_relationships("Einstein wurde in Ulm geboren.", ENTITIES, config)
+        calls = relationship_inference.cached_chat_completion.call_count
+        second = relationship_inference.infer_entity_relationships("Einstein wurde in Ulm geboren.", ENTITIES, config)
+        return first, second, calls
+
+    def test_explicit_only_result_is_cached(self):
+        first, second, calls = self._infer_twice(False)
+        self.assertTrue(first)
+        self.assertEqual(first, second)
+        self.assertEqual(relationship_inference.cached_chat_completion.call_count, calls)
+
+    def test_combined_result_is_cached(self):
+        first, second, calls = self._infer_twice(True)
+        self.assertTrue(first)
+        self.assertEqual(first, second)
+        self.assertEqual(relationship_inference.cached_chat_completion.call_count, calls)
+
+
+if __name__ == "__main__":
+    unittest.main()